@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+BOM Cache Benchmark - Times the workflow's validate/parse steps with a cold and a warm BOM cache
+Each step runs as its own process, the way deploy.yml invokes it
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from synthetic_bom import generate_bom
+
+SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+def pipeline_steps(bom_file: str, output_dir: str) -> Dict[str, List[str]]:
+    """The BOM steps of deploy.yml's validate-bom job"""
+    parse_bom = [sys.executable, os.path.join(SCRIPTS_DIR, 'parse-bom.py'), '--customer', 'bench', '--environment', 'dev']
+    return {
+        'validate-bom': [sys.executable, os.path.join(SCRIPTS_DIR, 'validate-bom.py'), '--bom-file', bom_file],
+        'check-only': parse_bom + ['--check-only'],
+        'compile-all': parse_bom + ['--compile-all', '--output-dir', output_dir]
+    }
+
+def run_step(command: List[str], work_dir: str, cache_dir: str) -> float:
+    """Run one step and return its wall time in seconds"""
+    env = dict(os.environ, BOM_CACHE_DIR=cache_dir)
+    start = time.perf_counter()
+    subprocess.run(command, cwd=work_dir, env=env, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark cold vs. warm BOM cache startup')
+    parser.add_argument('--rows', type=int, default=10_000, help='Number of rows in the synthetic BOM')
+    parser.add_argument('--iterations', type=int, default=5, help='Runs per step and cache state')
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        # parse-bom.py reads bom/customer-bom.csv relative to the working directory
+        bom_file = os.path.join(work_dir, 'bom', 'customer-bom.csv')
+        os.makedirs(os.path.dirname(bom_file))
+        generate_bom(bom_file, args.rows)
+
+        cache_dir = os.path.join(work_dir, '.bom-cache')
+        steps = pipeline_steps(bom_file, os.path.join(work_dir, 'compiled-params'))
+        timings = {name: {'cold': [], 'warm': []} for name in steps}
+
+        for _ in range(args.iterations):
+            for name, command in steps.items():
+                shutil.rmtree(cache_dir, ignore_errors=True)
+                timings[name]['cold'].append(run_step(command, work_dir, cache_dir))
+                timings[name]['warm'].append(run_step(command, work_dir, cache_dir))
+
+    print(f"Synthetic BOM: {args.rows} rows, {args.iterations} iterations\n")
+    print(f"{'step':<14} {'cold (ms)':>10} {'warm (ms)':>10} {'speedup':>8}")
+    cold_total = warm_total = 0.0
+    for name, values in timings.items():
+        cold = statistics.median(values['cold'])
+        warm = statistics.median(values['warm'])
+        cold_total += cold
+        warm_total += warm
+        print(f"{name:<14} {cold * 1000:>10.1f} {warm * 1000:>10.1f} {cold / warm:>7.2f}x")
+    print(f"{'total':<14} {cold_total * 1000:>10.1f} {warm_total * 1000:>10.1f} {cold_total / warm_total:>7.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+BOM Daemon Benchmark - Per-query latency of bomctl against a running `bomctl daemon`
+Compares cold-start `bomctl` invocations, the same invocations routed to the daemon by --socket,
+and the bare socket round trip, on a synthetic BOM; then times how long an edit takes to show up
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from synthetic_bom import generate_bom
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from bomctl.client import request
+
+BOMCTL = os.path.join(SCRIPTS_DIR, 'bomctl')
+
+def time_call(function: Callable[[], Any], iterations: int) -> float:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def run_bomctl(arguments: List[str], cwd: str, env: Dict[str, str]) -> None:
+    subprocess.run([sys.executable, BOMCTL] + arguments, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def wait_for(condition: Callable[[], bool], timeout: float) -> bool:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return False
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark bomctl queries against the resident BOM daemon')
+    parser.add_argument('--rows', type=int, default=1000, help='Rows in the synthetic BOM')
+    parser.add_argument('--iterations', type=int, default=10, help='Timed runs per measurement')
+    parser.add_argument('--poll-interval', type=float, default=0.1, help="Daemon's seconds between file checks")
+
+    args = parser.parse_args()
+    env = {key: value for key, value in os.environ.items() if key != 'BOMCTL_SOCKET'}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bom_file = os.path.join(tmp_dir, 'customer-bom.csv')
+        socket_path = os.path.join(tmp_dir, 'bomctl.sock')
+        generate_bom(bom_file, args.rows)
+
+        daemon = subprocess.Popen([sys.executable, BOMCTL, 'daemon', '--socket', socket_path, '--watch', bom_file,
+                                   '--poll-interval', str(args.poll_interval)], env=env, stdout=subprocess.DEVNULL)
+        try:
+            if not wait_for(lambda: request(socket_path, {'command': 'status'}) is not None, 30.0):
+                raise SystemExit('bomctl daemon did not start')
+
+            target = ['--bom-file', bom_file, '--customer', 'bench', '--environment', 'dev']
+            queries = [
+                ('validate', ['validate', '--bom-file', bom_file]),
+                ('check', ['check'] + target),
+                ('service-params', ['service-params'] + target + ['--service-name', 'compute-web-0', '--instance-id', '001'])
+            ]
+
+            print(f"Per-query latency, {args.rows:,}-row BOM (median of {args.iterations}):")
+            print(f"  {'query':<16} {'cold start':>12} {'via daemon':>12} {'socket only':>12}")
+            for name, arguments in queries:
+                cold = time_call(lambda: run_bomctl(arguments, tmp_dir, env), args.iterations)
+                routed = time_call(lambda: run_bomctl(arguments + ['--socket', socket_path], tmp_dir, env), args.iterations)
+                payload = {
+                    'command': name, 'bom_file': bom_file, 'schema_file': None, 'customer': 'bench', 'environment': 'dev',
+                    'service_name': 'compute-web-0', 'instance_id': '001', 'vpc_cidr': None, 'dialect': 'auto'
+                }
+                raw = time_call(lambda: request(socket_path, payload), args.iterations)
+                print(f"  {name:<16} {cold * 1000:>9.1f} ms {routed * 1000:>9.1f} ms {raw * 1000:>9.2f} ms "
+                      f"({cold / routed:.1f}x via daemon)")
+
+            interpreter = time_call(lambda: subprocess.run([sys.executable, '-c', 'pass']), args.iterations)
+            print(f"  {'(python -c pass)':<16} {interpreter * 1000:>9.1f} ms")
+
+            reloads = request(socket_path, {'command': 'status'})['result']['stats']['reloads']
+            start = time.perf_counter()
+            with open(bom_file, 'a', encoding='utf-8') as f:
+                f.write('service,compute-web-edit,1,compute-web.yml,network-foundation,,,,,,web,linux,t3,small,1,public,20,true,Edited\n')
+            picked_up = wait_for(lambda: request(socket_path, {'command': 'status'})['result']['stats']['reloads'] > reloads, 10.0)
+            if picked_up:
+                print(f"\nEdit re-parsed and re-validated {(time.perf_counter() - start) * 1000:.0f} ms after the write "
+                      f"(polling every {args.poll_interval:g}s)")
+            else:
+                print("\nEdit was not picked up within 10s")
+        finally:
+            request(socket_path, {'command': 'shutdown'})
+            daemon.wait(timeout=10)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+BOM Records Benchmark - Compares the slotted network/service records with csv.DictReader dicts
+Reports the memory each representation retains per row, and the time to generate every service's
+parameters and to validate every row from each, on a synthetic BOM
+"""
+
+import argparse
+import contextlib
+import csv
+import gc
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from synthetic_bom import generate_bom
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from bomctl.parser import BOMParser
+from bomctl.records import flag
+from bomctl.validator import BOMValidator
+
+def read_rows(bom_file: str) -> List[Dict[str, str]]:
+    with open(bom_file, 'r', newline='', encoding='utf-8') as file:
+        return list(csv.DictReader(file))
+
+def retained_bytes(load: Callable[[], Any]) -> Tuple[int, Any]:
+    """Bytes still allocated once a representation is built, and the representation"""
+    gc.collect()
+    tracemalloc.start()
+    value = load()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, value
+
+def dict_parameters(rows: List[Dict[str, str]], defaults: Dict[str, str]) -> int:
+    """Service parameters read from the dicts the way BOMParser used to, re-stripping every value"""
+    count = 0
+    for row in rows:
+        if row.get('resource_type', '').strip().lower() != 'service':
+            continue
+        instance_family = row.get('instance_family', defaults['instance_family']).strip()
+        instance_size = row.get('instance_size', defaults['instance_size']).strip()
+        params = {
+            'InstanceType': f"{instance_family}.{instance_size}",
+            'InstanceCount': int(row.get('instance_count', defaults['instance_count'])),
+            'RootVolumeSize': int(row.get('root_volume_size', defaults['root_volume_size'])),
+            'SubnetSelection': row.get('subnet_selection', defaults['subnet_selection']).strip(),
+            'EnableSSM': row.get('enable_ssm', defaults['enable_ssm']).lower()
+        }
+        count += row.get('service_type') == 'bastion' or len(params)
+    return count
+
+def record_parameters(records: List[Any]) -> int:
+    """Service parameters read from the records, as BOMParser does now"""
+    count = 0
+    for record in records:
+        if record is None or record.kind != 'service':
+            continue
+        params = {
+            'InstanceType': f"{record.instance_family}.{record.instance_size}",
+            'InstanceCount': int(record.instance_count),
+            'RootVolumeSize': int(record.root_volume_size),
+            'SubnetSelection': record.subnet_selection,
+            'EnableSSM': flag(record.enable_ssm)
+        }
+        count += record.service_type == 'bastion' or len(params)
+    return count
+
+def dict_validation(validator: BOMValidator, rows: List[Dict[str, str]]) -> None:
+    """Every row checked field by field from its dict"""
+    rules = validator.dialect.rules
+    read = validator.dialect.discriminator.read
+    for i, row in enumerate(rows, 1):
+        fields = rules.get(read(row))
+        if fields:
+            validator.validate_fields(row, i, fields)
+
+def record_validation(validator: BOMValidator, records: List[Any]) -> None:
+    for record in records:
+        if record is not None:
+            validator.validate_record(record)
+
+def time_call(function: Callable[[], Any], iterations: int) -> float:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark BOM records against csv.DictReader dicts')
+    parser.add_argument('--rows', type=int, default=100_000, help='Rows in the synthetic BOM')
+    parser.add_argument('--iterations', type=int, default=5, help='Timed runs per measurement')
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bom_file = os.path.join(tmp_dir, 'customer-bom.csv')
+        generate_bom(bom_file, args.rows)
+
+        builder = BOMParser(bom_file).record_builder()
+        dict_bytes, rows = retained_bytes(lambda: read_rows(bom_file))
+
+        def load_records() -> List[Any]:
+            loaded = read_rows(bom_file)
+            return [builder.build(row, i) for i, row in enumerate(loaded, 1)]
+        record_bytes, records = retained_bytes(load_records)
+
+        print(f"Memory retained for {len(rows):,} rows:")
+        print(f"  csv.DictReader dicts: {dict_bytes / len(rows):>8.0f} bytes/row")
+        print(f"  Slotted records:      {record_bytes / len(records):>8.0f} bytes/row "
+              f"({dict_bytes / record_bytes:.1f}x smaller)")
+
+        validator = BOMValidator(bom_file)
+        defaults = {field.name: field.default for field in validator.dialect.rules['service'] if field.default is not None}
+        dict_seconds = time_call(lambda: dict_parameters(rows, defaults), args.iterations)
+        record_seconds = time_call(lambda: record_parameters(records), args.iterations)
+        print("\nService parameters for every row:")
+        print(f"  From dicts:   {dict_seconds * 1000:>8.1f} ms")
+        print(f"  From records: {record_seconds * 1000:>8.1f} ms ({dict_seconds / record_seconds:.1f}x)")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            dict_seconds = time_call(lambda: dict_validation(validator, rows), args.iterations)
+            dict_findings = (list(validator.errors), list(validator.warnings))
+            validator.errors, validator.warnings = [], []
+            record_seconds = time_call(lambda: record_validation(validator, records), args.iterations)
+            record_findings = (list(validator.errors), list(validator.warnings))
+        print("\nField checks for every row:")
+        print(f"  From dicts:   {dict_seconds * 1000:>8.1f} ms")
+        print(f"  From records: {record_seconds * 1000:>8.1f} ms ({dict_seconds / record_seconds:.1f}x)")
+        print("Results identical" if dict_findings == record_findings else "Results DIFFER")
+
+if __name__ == '__main__':
+    main()
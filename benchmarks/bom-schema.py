@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+BOM Schema Benchmark - Measures what compiling bom/schema.json buys
+Times compiling the schema against loading its cached compiled form, and validating rows with the
+compiled field closures against interpreting the schema document for every value, for both dialects
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from synthetic_bom import generate_bom
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from bomctl.future_ready import FutureReadyBOMValidator
+from bomctl.schema import DEFAULT_SCHEMA_FILE, CompiledSchema, compile_schema, load_compiled
+from bomctl.validator import BOMValidator, boolean_error, check_vpc_cidr, numeric_error, option_error
+
+FUTURE_READY_BOM = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'config', 'future-ready-bom.csv')
+
+def interpret(spec: Dict[str, Any], name: str, value: str) -> Optional[str]:
+    """One field's message, read straight from the schema document on every call"""
+    if not value:
+        return spec.get('required')
+    if 'enum' in spec:
+        return None if value in spec['enum'] else option_error(value, spec.get('label', name), ', '.join(spec['enum']))
+    if 'range' in spec:
+        return numeric_error(value, name, *spec['range'])
+    if spec.get('boolean'):
+        return boolean_error(value, name)
+    if 'pattern' in spec:
+        import re
+        return None if re.fullmatch(spec['pattern'], value) else spec['message'].format(value=value)
+    if 'cidr' in spec:
+        return check_vpc_cidr(value, *spec['cidr'], spec.get('label', name))[1]
+    return None
+
+def interpret_rows(document: Dict[str, Any], dialect: str, rows: List[Dict[str, str]]) -> int:
+    """Errors found validating rows by interpreting the schema document"""
+    spec = document['dialects'][dialect]
+    type_column = spec['discriminator']['column']
+    lower = spec['discriminator'].get('lowercase')
+    errors = 0
+    for row in rows:
+        resource_type = row.get(type_column, '').strip()
+        resource_type = resource_type.lower() if lower else resource_type
+        fields = spec['types'].get(resource_type)
+        if fields is None:
+            errors += 1
+            continue
+        if spec.get('key_column'):
+            for column, field in spec.get('columns', {}).items():
+                errors += interpret(field, column, row.get(column, '').strip()) is not None
+            configuration = row.get(spec['key_column'], '').strip()
+            field = fields.get(configuration)
+            if field is not None:
+                errors += interpret(field, f"{resource_type}.{configuration}", row.get(spec['value_column'], '').strip()) is not None
+            continue
+        for column, field in fields.items():
+            value = row.get(column, '').strip()
+            errors += interpret(field, column, value.lower() if field.get('lowercase') else value) is not None
+    return errors
+
+def future_ready_bom(path: str, copies: int) -> None:
+    """The sample future-ready BOM repeated with renamed resources"""
+    with open(FUTURE_READY_BOM, 'r', encoding='utf-8') as file:
+        lines = file.read().split('\n')
+    rows = [line.split(',') for line in lines[1:] if line and not line.startswith('#')]
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(lines[0] + '\n')
+        for copy in range(copies):
+            for row in rows:
+                file.write(','.join([row[0], f"{row[1]}{copy}"] + row[2:]) + '\n')
+
+def time_call(function, iterations: int) -> float:
+    """Median seconds of a call with stdout silenced"""
+    timings = []
+    for _ in range(iterations):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the compiled BOM schema against interpreting it')
+    parser.add_argument('--rows', type=int, default=100_000, help='Rows in the synthetic customer BOM')
+    parser.add_argument('--copies', type=int, default=500, help='Copies of the sample future-ready BOM')
+    parser.add_argument('--iterations', type=int, default=5, help='Timed runs per measurement')
+
+    args = parser.parse_args()
+
+    with open(DEFAULT_SCHEMA_FILE, 'rb') as f:
+        data = f.read()
+    document = json.loads(data)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        load_compiled(DEFAULT_SCHEMA_FILE, tmp_dir)
+        compile_seconds = time_call(lambda: CompiledSchema(compile_schema(json.loads(data), 'bench')), args.iterations * 20)
+        cached_seconds = time_call(lambda: CompiledSchema(load_compiled(DEFAULT_SCHEMA_FILE, tmp_dir)), args.iterations * 20)
+
+        print(f"Schema: compile {compile_seconds * 1000:.2f} ms, from cached compiled form {cached_seconds * 1000:.2f} ms\n")
+        print(f"{'dialect':<13} {'rows':>8} {'interpreted/s':>14} {'compiled/s':>12} {'speedup':>8}")
+
+        customer_file = os.path.join(tmp_dir, 'customer-bom.csv')
+        generate_bom(customer_file, args.rows)
+        future_ready_file = os.path.join(tmp_dir, 'future-ready-bom.csv')
+        future_ready_bom(future_ready_file, args.copies)
+
+        for dialect, bom_file, engine_class in [('customer', customer_file, BOMValidator),
+                                                 ('future-ready', future_ready_file, FutureReadyBOMValidator)]:
+            validator = engine_class(bom_file)
+            with contextlib.redirect_stdout(io.StringIO()):
+                validator.load_bom()
+            rows = validator.bom_data
+
+            interpreted = time_call(lambda: interpret_rows(document, dialect, rows), args.iterations)
+            compiled = time_call(validator.validate_row_data, args.iterations)
+            print(f"{dialect:<13} {len(rows):>8} {len(rows) / interpreted:>14,.0f} {len(rows) / compiled:>12,.0f} "
+                  f"{interpreted / compiled:>7.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Changeset Preview Benchmark - Times the local changeset preview on synthetic fleets
+Compiles a synthetic BOM, resizes every other service, and previews every stack offline; the
+estimate for CloudFormation change sets assumes one create-change-set and its waiter per stack
+"""
+
+import argparse
+import csv
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from synthetic_bom import generate_bom
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+REPO_ROOT = os.path.join(SCRIPTS_DIR, '..')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from changeset_preview import ChangesetPreview, load_stacks
+
+def resize_services(bom_file: str, output_file: str) -> None:
+    """The BOM with every other service moved to m5.large"""
+    with open(bom_file, 'r', newline='', encoding='utf-8') as file:
+        rows = list(csv.DictReader(file))
+    for i, row in enumerate(rows):
+        if row['resource_type'] == 'service' and i % 2:
+            row['instance_family'], row['instance_size'] = 'm5', 'large'
+    with open(output_file, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+def compile_all(bom_file: str, output_dir: str) -> None:
+    subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, 'bomctl'), 'compile-all', '--bom-file', bom_file,
+                    '--customer', 'bench', '--environment', 'dev', '--output-dir', output_dir],
+                   check=True, stdout=subprocess.DEVNULL)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the local changeset preview')
+    parser.add_argument('--services', type=int, nargs='+', default=[10, 100, 1000], help='Service stacks per fleet')
+    parser.add_argument('--changeset-latency', type=float, default=15.0,
+                        help='Estimated seconds to create and describe one CloudFormation change set')
+
+    args = parser.parse_args()
+
+    print(f"{'stacks':>7} {'load s':>7} {'preview s':>10} {'ms/stack':>9} {'safe':>5} {'held':>5} {'change sets s':>14}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for services in args.services:
+            old_bom = os.path.join(tmp_dir, f"old-{services}.csv")
+            new_bom = os.path.join(tmp_dir, f"new-{services}.csv")
+            generate_bom(old_bom, services + 1)
+            resize_services(old_bom, new_bom)
+            old_dir = os.path.join(tmp_dir, f"old-{services}")
+            new_dir = os.path.join(tmp_dir, f"new-{services}")
+            compile_all(old_bom, old_dir)
+            compile_all(new_bom, new_dir)
+
+            start = time.perf_counter()
+            stacks = load_stacks(old_dir, new_dir, REPO_ROOT)
+            load_seconds = time.perf_counter() - start
+
+            preview = ChangesetPreview()
+            start = time.perf_counter()
+            preview.preview(stacks)
+            preview_seconds = time.perf_counter() - start
+
+            batches = preview.batches()
+            print(f"{len(stacks):>7} {load_seconds:>7.2f} {preview_seconds:>10.3f} "
+                  f"{preview_seconds / len(stacks) * 1000:>9.2f} {len(batches['safe']):>5} {len(batches['held']):>5} "
+                  f"{len(stacks) * args.changeset_latency:>14.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+CIDR Planner Benchmark - Times the prefix-tree interval index at fleet scale
+Carves VPCs and their per-AZ subnets until the requested number of allocations, then probes random
+ranges for overlaps; a linear ipaddress scan is timed on smaller fleets and must find the same conflicts
+"""
+
+import argparse
+import ipaddress
+import os
+import random
+import sys
+import time
+from typing import List, Tuple
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from cidr_planner import CidrPlanner, IntervalIndex, format_cidr, parse_cidr
+
+POOL = '10.0.0.0/8'
+
+def build_fleet(allocations: int, vpc_prefix: int) -> Tuple[CidrPlanner, float]:
+    """A planner holding VPCs carved into three-AZ public/private subnets, and seconds taken"""
+    planner = CidrPlanner()
+    start = time.perf_counter()
+    customer = allocated = 0
+    while allocated < allocations:
+        owner = f"customer{customer:05d}"
+        vpc_cidr = planner.allocate_vpc(vpc_prefix, owner, [POOL])
+        if vpc_cidr is None:
+            raise SystemExit(f"{POOL} is full after {customer} /{vpc_prefix} VPCs; use a longer --vpc-prefix")
+        allocated += 1 + len(planner.carve(vpc_cidr, owner, 3))
+        customer += 1
+    return planner, time.perf_counter() - start
+
+def random_probes(count: int, seed: int) -> List[Tuple[int, int]]:
+    """Random blocks inside the pool, from /12 down to /28"""
+    rng = random.Random(seed)
+    base, base_len = parse_cidr(POOL)
+    probes = []
+    for _ in range(count):
+        prefixlen = rng.randint(base_len + 4, 28)
+        address = base | (rng.getrandbits(prefixlen - base_len) << (32 - prefixlen))
+        probes.append((address, prefixlen))
+    return probes
+
+def indexed_conflicts(index: IntervalIndex, probes: List[Tuple[int, int]]) -> List[List[str]]:
+    return [sorted(cidr for cidr, _ in index.conflicts(address, prefixlen, limit=None)) for address, prefixlen in probes]
+
+def linear_conflicts(ranges: List[ipaddress.IPv4Network], probes: List[Tuple[int, int]]) -> List[List[str]]:
+    """What a list of allocated ranges does: compare every probe against every range"""
+    found = []
+    for address, prefixlen in probes:
+        probe = ipaddress.IPv4Network(format_cidr(address, prefixlen))
+        found.append(sorted(str(network) for network in ranges if network.overlaps(probe)))
+    return found
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the CIDR planner interval index')
+    parser.add_argument('--allocations', type=int, default=100_000, help='VPC and subnet ranges to allocate')
+    parser.add_argument('--vpc-prefix', type=int, default=22, help='Prefix length of the carved VPCs')
+    parser.add_argument('--probes', type=int, default=10_000, help='Random overlap checks against the fleet')
+    parser.add_argument('--linear-allocations', type=int, default=5_000, help='Fleet size for the linear scan comparison')
+    parser.add_argument('--linear-probes', type=int, default=200, help='Overlap checks for the linear scan comparison')
+    parser.add_argument('--seed', type=int, default=17, help='Random seed for the probes')
+
+    args = parser.parse_args()
+
+    print(f"{'allocations':>11} {'build s':>8} {'us/alloc':>9} {'probe us':>9}")
+    for allocations in sorted({max(args.allocations // 100, 1), max(args.allocations // 10, 1), args.allocations}):
+        planner, seconds = build_fleet(allocations, args.vpc_prefix)
+        total = len(planner.vpcs) + sum(len(index) for index in planner.subnets.values())
+        probes = random_probes(args.probes, args.seed)
+        start = time.perf_counter()
+        for address, prefixlen in probes:
+            planner.vpcs.conflicts(address, prefixlen)
+        probe_seconds = time.perf_counter() - start
+        print(f"{total:>11,} {seconds:>8.2f} {seconds / total * 1e6:>9.1f} {probe_seconds / len(probes) * 1e6:>9.1f}")
+
+    # The same VPC and subnet ranges in one index and in a plain list
+    planner, _ = build_fleet(args.linear_allocations, args.vpc_prefix)
+    index = IntervalIndex()
+    for vpc_cidr, owner in planner.vpcs:
+        for cidr, subnet_owner in planner.subnets[vpc_cidr]:
+            index.insert(*parse_cidr(cidr), subnet_owner)
+    ranges = [ipaddress.IPv4Network(cidr) for cidr, _ in index]
+    probes = random_probes(args.linear_probes, args.seed)
+
+    start = time.perf_counter()
+    indexed = indexed_conflicts(index, probes)
+    indexed_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    linear = linear_conflicts(ranges, probes)
+    linear_seconds = time.perf_counter() - start
+
+    print(f"\nOverlap checks against {len(ranges):,} subnets, {len(probes)} probes "
+          f"({sum(map(len, indexed)):,} conflicts):")
+    print(f"  Linear scan:    {linear_seconds / len(probes) * 1e6:>10.1f} us/probe")
+    print(f"  Interval index: {indexed_seconds / len(probes) * 1e6:>10.1f} us/probe ({linear_seconds / indexed_seconds:.0f}x)")
+    print("Results identical" if indexed == linear else "Results DIFFER")
+    if indexed != linear:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
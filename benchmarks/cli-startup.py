@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+CLI Startup Benchmark - Per-invocation wall time of the BOM commands
+Compares bomctl subcommands with the legacy script entry points, the bare interpreter,
+and the scripts/ directory of an earlier git ref (--baseline-ref, by default the repository's
+root commit, before the BOM scripts were consolidated). Every command runs in a scratch directory
+holding a copy of bom/customer-bom.csv, so files they write never land in the repository
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+def time_command(command: List[str], iterations: int, env: Dict[str, str], cwd: str) -> float:
+    """Median wall time in seconds, after one warm-up run that also writes .pyc files"""
+    subprocess.run(command, cwd=cwd, env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=cwd, env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def root_commit() -> str:
+    """The repository's first commit: the BOM scripts before this series of changes"""
+    return subprocess.run(['git', 'rev-list', '--max-parents=0', 'HEAD'], cwd=ROOT_DIR, check=True,
+                          capture_output=True, text=True).stdout.split()[-1]
+
+def commands(scripts_dir: str) -> Dict[str, Dict[str, List[str]]]:
+    """The same three operations through each entry point"""
+    target = ['--customer', 'bench', '--environment', 'dev']
+    return {
+        'validate': {
+            'legacy': [sys.executable, os.path.join(scripts_dir, 'validate-bom.py')],
+            'bomctl': [sys.executable, os.path.join(scripts_dir, 'bomctl'), 'validate']
+        },
+        'check': {
+            'legacy': [sys.executable, os.path.join(scripts_dir, 'parse-bom.py')] + target + ['--check-only'],
+            'bomctl': [sys.executable, os.path.join(scripts_dir, 'bomctl'), 'check'] + target
+        },
+        'service-params': {
+            'legacy': [sys.executable, os.path.join(scripts_dir, 'parse-bom.py')] + target
+                      + ['--generate-service-params', '--service-name', 'compute-web', '--instance-id', '001'],
+            'bomctl': [sys.executable, os.path.join(scripts_dir, 'bomctl'), 'service-params'] + target
+                      + ['--service-name', 'compute-web', '--instance-id', '001']
+        }
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-invocation startup of the BOM CLI')
+    parser.add_argument('--iterations', type=int, default=20, help='Timed runs per command')
+    parser.add_argument('--baseline-ref', help='Also time scripts/ as of this git ref (default: the root commit)')
+
+    args = parser.parse_args()
+    baseline_ref = args.baseline_ref or root_commit()
+
+    # Time what CI sees: Python's default of caching bytecode for imported modules
+    env = {key: value for key, value in os.environ.items() if key not in ('PYTHONDONTWRITEBYTECODE', 'BOM_CACHE_DIR')}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        work_dir = os.path.join(tmp_dir, 'work')
+        os.makedirs(os.path.join(work_dir, 'bom'))
+        shutil.copy(os.path.join(ROOT_DIR, 'bom', 'customer-bom.csv'), os.path.join(work_dir, 'bom', 'customer-bom.csv'))
+
+        current = commands(os.path.join(ROOT_DIR, 'scripts'))
+        baseline_dir = os.path.join(tmp_dir, 'baseline')
+        os.makedirs(baseline_dir)
+        archive = subprocess.run(['git', 'archive', baseline_ref, 'scripts'], cwd=ROOT_DIR, check=True, capture_output=True).stdout
+        subprocess.run(['tar', '-x', '-C', baseline_dir], input=archive, check=True)
+        baseline = commands(os.path.join(baseline_dir, 'scripts'))
+
+        floor = time_command([sys.executable, '-c', 'pass'], args.iterations, env, work_dir)
+        print(f"Interpreter floor (python -c pass): {floor * 1000:.1f} ms\n")
+
+        print(f"{'command':<16} {'legacy (ms)':>12} {'bomctl (ms)':>12} {baseline_ref[:12] + ' (ms)':>18} {'vs baseline':>12}")
+        for name, entry_points in current.items():
+            legacy = time_command(entry_points['legacy'], args.iterations, env, work_dir)
+            bomctl = time_command(entry_points['bomctl'], args.iterations, env, work_dir)
+            before = time_command(baseline[name]['legacy'], args.iterations, env, work_dir)
+            print(f"{name:<16} {legacy * 1000:>12.1f} {bomctl * 1000:>12.1f} {before * 1000:>18.1f} "
+                  f"{(before - bomctl) / before * 100:>11.0f}%")
+
+if __name__ == '__main__':
+    main()
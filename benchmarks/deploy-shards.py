@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Deploy Shards Benchmark - Simulates the deploy-services makespan for synthetic fleets
+Compares the one-job-per-service matrix with LPT-packed shards and with shards filled round-robin,
+using per-template deploy durations with run-to-run variance
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from deploy_shards import list_schedule, shard_seconds, simulate
+
+# Typical p50 stack.deploy seconds per template
+TEMPLATE_SECONDS = {
+    'compute-web.yml': 420.0,
+    'compute-database.yml': 900.0,
+    'compute-bastion.yml': 200.0,
+    'compute-app.yml': 540.0
+}
+
+def synthetic_services(count: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    templates = list(TEMPLATE_SECONDS)
+    services = []
+    for i in range(count):
+        template = rng.choice(templates)
+        services.append({
+            'name': template[:-4],
+            'instance_id': f"{i:04d}",
+            'template': template,
+            'estimate': round(TEMPLATE_SECONDS[template] * rng.uniform(0.7, 1.3), 1)
+        })
+    return services
+
+def round_robin_makespan(services: List[Dict[str, Any]], shards: int, setup: float, max_runners: int, concurrency: int) -> float:
+    """Shards filled in BOM order, ignoring durations"""
+    bins = [services[index::shards] for index in range(min(shards, len(services)))]
+    jobs = sorted((setup + shard_seconds(sorted(shard, key=lambda service: -service['estimate']), concurrency)
+                   for shard in bins), reverse=True)
+    return list_schedule(jobs, max_runners)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark sharded deploy jobs against one job per service')
+    parser.add_argument('--services', type=int, nargs='+', default=[50, 200, 1000], help='Services per fleet')
+    parser.add_argument('--shards', type=int, nargs='+', default=[2, 4, 8, 16, 32], help='Shard counts to compare')
+    parser.add_argument('--setup', type=float, default=60.0, help='Setup seconds per deploy job')
+    parser.add_argument('--max-runners', type=int, default=20, help='Deploy jobs running at once')
+    parser.add_argument('--concurrency', type=int, default=8, help='Stacks a shard job deploys at once')
+    parser.add_argument('--seed', type=int, default=20, help='Random seed for the fleet')
+
+    args = parser.parse_args()
+
+    for count in args.services:
+        services = synthetic_services(count, args.seed)
+        start = time.perf_counter()
+        rows = simulate(services, args.shards, args.setup, args.max_runners, args.concurrency)
+        seconds = time.perf_counter() - start
+
+        print(f"\n{count} services ({seconds * 1000:.1f} ms to pack and simulate {len(args.shards)} shard counts)")
+        print(f"{'layout':<12} {'jobs':>5} {'makespan':>10} {'round-robin':>12} {'runner min':>11}")
+        for row in rows:
+            shards = row['jobs'] if row['layout'] != 'per-service' else None
+            naive = f"{round_robin_makespan(services, shards, args.setup, args.max_runners, args.concurrency) / 60:>11.1f}m" if shards else f"{'-':>12}"
+            print(f"{row['layout']:<12} {row['jobs']:>5} {row['makespan'] / 60:>9.1f}m {naive} {row['runner_seconds'] / 60:>11.1f}")
+
+        best = min(rows[1:], key=lambda row: row['makespan'])
+        print(f"Best: {best['layout']}, {rows[0]['makespan'] / best['makespan']:.1f}x shorter than one job per service")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Future-Ready Parser Benchmark - Compares scripts/parse-future-ready-csv.sh with
+scripts/future_ready_bom.py on the same BOM
+Checks the generated files are byte-identical and reports per-run wall time
+"""
+
+import argparse
+import filecmp
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+def run_parser(command: List[str], work_dir: str) -> float:
+    """Run a parser in work_dir and return its wall time in seconds"""
+    start = time.perf_counter()
+    subprocess.run(command, cwd=work_dir, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the shell and Python future-ready BOM parsers')
+    parser.add_argument('--bom-file', default=os.path.join(ROOT_DIR, 'config/future-ready-bom.csv'), help='Future-ready BOM CSV file')
+    parser.add_argument('--environment', default='dev', help='Environment (dev/prod)')
+    parser.add_argument('--iterations', type=int, default=10, help='Runs per parser')
+
+    args = parser.parse_args()
+    bom_file = os.path.abspath(args.bom_file)
+
+    parsers = {
+        'shell': ['bash', os.path.join(ROOT_DIR, 'scripts/parse-future-ready-csv.sh'), bom_file, args.environment],
+        'python': [sys.executable, os.path.join(ROOT_DIR, 'scripts/future_ready_bom.py'), bom_file, args.environment]
+    }
+
+    timings = {name: [] for name in parsers}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        work_dirs = {name: os.path.join(tmp_dir, name) for name in parsers}
+        for work_dir in work_dirs.values():
+            os.makedirs(work_dir)
+
+        for _ in range(args.iterations):
+            for name, command in parsers.items():
+                timings[name].append(run_parser(command, work_dirs[name]))
+
+        shell_dir = os.path.join(work_dirs['shell'], 'generated-params')
+        python_dir = os.path.join(work_dirs['python'], 'generated-params')
+        files = sorted(os.listdir(shell_dir))
+        match, mismatch, errors = filecmp.cmpfiles(shell_dir, python_dir, files, shallow=False)
+
+    print(f"BOM: {bom_file} ({args.environment}), {args.iterations} iterations")
+    print(f"\n{'parser':<8} {'median (ms)':>12} {'min (ms)':>10} {'max (ms)':>10}")
+    for name, values in timings.items():
+        print(f"{name:<8} {statistics.median(values) * 1000:>12.1f} {min(values) * 1000:>10.1f} {max(values) * 1000:>10.1f}")
+
+    print(f"\nSpeedup: {statistics.median(timings['shell']) / statistics.median(timings['python']):.1f}x")
+    print(f"Byte-identical files: {len(match)}/{len(files)}")
+
+    if mismatch or errors:
+        print(f"ERROR: Output differs for: {', '.join(mismatch + errors)}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
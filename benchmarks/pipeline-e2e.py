@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Pipeline End-to-End Benchmark - Runs BOM -> validate -> params -> plan -> deploy for synthetic fleets
+The deploy phase follows deploy.yml against the fake CloudFormation backend: the network stack is
+deployed and watched, then the service shards deploy concurrently with a batched existence check.
+Wall time per phase and CloudFormation API calls are appended to a history file and compared with
+the previous run of the same fleet size
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from synthetic_bom import generate_bom
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+REPO_ROOT = os.path.abspath(os.path.join(SCRIPTS_DIR, '..'))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from bomctl.parser import BOMParser
+from bomctl.validator import BOMValidator
+from deploy_shards import ShardDeployer, estimate_services, load_services, pack_shards
+from fake_cloudformation import FakeCloudFormation, FakeEventSource, FakeOutputsBackend, FakeStackError
+from param_contract import load_parameter_file
+from stack_outputs import StackOutputResolver
+from stack_watcher import StackWatcher
+
+CUSTOMER = 'bench'
+ENVIRONMENT = 'dev'
+CAPABILITIES = ['CAPABILITY_IAM', 'CAPABILITY_NAMED_IAM']
+DEFAULT_HISTORY = os.path.join(REPO_ROOT, '.benchmark-history', 'pipeline-e2e.jsonl')
+
+class FakeShardDeployer(ShardDeployer):
+    """A shard job's deploy step, with `stack_watcher.py -- aws cloudformation deploy` run in process"""
+
+    def __init__(self, cloudformation: FakeCloudFormation, params_dir: str, concurrency: int):
+        super().__init__(CUSTOMER, ENVIRONMENT, cloudformation.region, params_dir, concurrency)
+        self.cloudformation = cloudformation
+        self.resolver = StackOutputResolver(f"{CUSTOMER}-{ENVIRONMENT}", FakeOutputsBackend(cloudformation))
+        self.event_source = FakeEventSource(cloudformation)
+
+    def deploy_one(self, service: Dict[str, str]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        stack_name = self.stack_name(service)
+        params_file = os.path.join(self.params_dir, f"service-params-{service['name']}-{service['instance_id']}.json")
+        try:
+            self.cloudformation.deploy(os.path.join(REPO_ROOT, 'services', service['template']), stack_name,
+                                       load_parameter_file(params_file), CAPABILITIES)
+            results = asyncio.run(watch([stack_name], self.event_source, self.cloudformation.time_scale))
+            status = 'deployed' if results[stack_name]['outcome'] == 'succeeded' else 'failed'
+            output = f"{stack_name}: {results[stack_name]['status']}"
+        except FakeStackError as e:
+            status, output = 'failed', str(e)
+        return {'stack_name': stack_name, 'status': status, 'seconds': time.perf_counter() - start, 'output': output}
+
+async def watch(stack_names: List[str], source: FakeEventSource, time_scale: float) -> Dict[str, Dict[str, Any]]:
+    # The watcher's poll intervals are real seconds; scale them with the simulated clock
+    watcher = StackWatcher(source, 2.0 * time_scale, 15.0 * time_scale)
+    return await watcher.watch_all(stack_names)
+
+def run_pipeline(services: int, work_dir: str, shards: int, concurrency: int, cloudformation: FakeCloudFormation) -> Dict[str, Any]:
+    """Wall seconds per phase, the API calls made and the stacks deployed for one fleet"""
+    bom_file = os.path.join(work_dir, 'customer-bom.csv')
+    params_dir = os.path.join(work_dir, 'compiled-params')
+    generate_bom(bom_file, services + 1)
+    phases: Dict[str, float] = {}
+
+    def phase(name: str, function):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = function()
+        phases[name] = time.perf_counter() - start
+        return result
+
+    valid = phase('validate', lambda: BOMValidator(bom_file).validate())
+    if not valid:
+        raise SystemExit(f"Synthetic BOM with {services} services failed validation")
+
+    def compile_params() -> None:
+        bom_parser = BOMParser(bom_file)
+        bom_parser.load_bom()
+        bom_parser.parse_bom(CUSTOMER, ENVIRONMENT)
+        bom_parser.compile_all(CUSTOMER, ENVIRONMENT, params_dir)
+    phase('params', compile_params)
+
+    packed = phase('plan', lambda: pack_shards(estimate_services(load_services(params_dir), {}), shards))
+
+    event_source = FakeEventSource(cloudformation)
+
+    def deploy_network() -> str:
+        stack_name = f"{CUSTOMER}-{ENVIRONMENT}-network-foundation"
+        cloudformation.deploy(os.path.join(REPO_ROOT, 'network', 'network-foundation.yml'), stack_name,
+                              load_parameter_file(os.path.join(params_dir, 'network-params.json')), CAPABILITIES)
+        return asyncio.run(watch([stack_name], event_source, cloudformation.time_scale))[stack_name]['outcome']
+    if phase('deploy-network', deploy_network) != 'succeeded':
+        raise SystemExit('Network stack failed to deploy')
+
+    deployers = [FakeShardDeployer(cloudformation, params_dir, concurrency) for _ in packed]
+
+    def deploy_services() -> List[bool]:
+        with ThreadPoolExecutor(max_workers=len(packed)) as executor:
+            return list(executor.map(lambda pair: pair[0].run(pair[1]), zip(deployers, packed)))
+    shard_results = phase('deploy-services', deploy_services)
+
+    api_calls = dict(cloudformation.api_calls)
+    # With time_scale 0 every deploy starts at once, so only a scaled run has a meaningful makespan
+    stacks = list(cloudformation.stacks.values())
+    simulated = max(stack['finish'] for stack in stacks) - min(stack['created'] for stack in stacks)
+    return {
+        'services': services,
+        'shards': len(packed),
+        'failed_shards': shard_results.count(False),
+        'phases': {name: round(seconds, 4) for name, seconds in phases.items()},
+        'wall_seconds': round(sum(phases.values()), 4),
+        'api_calls': api_calls,
+        'total_api_calls': sum(api_calls.values()),
+        'simulated_deploy_seconds': round(simulated, 1)
+    }
+
+def git_revision() -> Optional[str]:
+    result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, cwd=REPO_ROOT)
+    return result.stdout.strip() or None
+
+def previous_run(history_file: str, services: int, shards: int) -> Optional[Dict[str, Any]]:
+    """The latest recorded run of the same fleet size and shard count"""
+    if not os.path.isfile(history_file):
+        return None
+    previous = None
+    with open(history_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('services') == services and record.get('shards_requested') == shards:
+                previous = record
+    return previous
+
+def change(current: float, previous: Optional[float]) -> str:
+    if not previous:
+        return ''
+    return f" ({(current - previous) / previous * 100:+.0f}%)"
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the BOM-to-deploy pipeline against the fake CloudFormation backend')
+    parser.add_argument('--services', type=int, nargs='+', default=[10, 100, 1000], help='Service stacks per fleet')
+    parser.add_argument('--shards', type=int, default=4, help='Deploy jobs the services are packed into')
+    parser.add_argument('--concurrency', type=int, default=8, help='Stacks a shard job deploys at once')
+    parser.add_argument('--time-scale', type=float, default=0.0, help='Real seconds per simulated CloudFormation second')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='Chance that a resource operation fails')
+    parser.add_argument('--history-file', default=DEFAULT_HISTORY, help='JSON lines file of past results')
+    parser.add_argument('--no-record', action='store_true', help='Do not append this run to the history file')
+
+    args = parser.parse_args()
+    revision = git_revision()
+
+    for services in args.services:
+        cloudformation = FakeCloudFormation(time_scale=args.time_scale, failure_rate=args.failure_rate, seed=services)
+        with tempfile.TemporaryDirectory() as work_dir:
+            result = run_pipeline(services, work_dir, args.shards, args.concurrency, cloudformation)
+        result.update(timestamp=int(time.time()), revision=revision, shards_requested=args.shards,
+                      time_scale=args.time_scale, failure_rate=args.failure_rate)
+        previous = previous_run(args.history_file, services, args.shards)
+
+        against = f" (vs {previous.get('revision')})" if previous else ''
+        print(f"\n{services} services in {result['shards']} shards{against}:")
+        for name, seconds in result['phases'].items():
+            before = previous['phases'].get(name) if previous else None
+            print(f"  {name:<16} {seconds * 1000:>10.1f} ms{change(seconds, before)}")
+        print(f"  {'total':<16} {result['wall_seconds'] * 1000:>10.1f} ms"
+              f"{change(result['wall_seconds'], previous['wall_seconds'] if previous else None)}")
+        calls = ', '.join(f"{operation} {count}" for operation, count in sorted(result['api_calls'].items()))
+        print(f"  API calls: {result['total_api_calls']}"
+              f"{change(result['total_api_calls'], previous['total_api_calls'] if previous else None)} ({calls})")
+        if args.time_scale:
+            print(f"  Simulated CloudFormation time: {result['simulated_deploy_seconds'] / 60:.1f} min")
+        print(f"  Failed shards: {result['failed_shards']}")
+
+        if not args.no_record:
+            os.makedirs(os.path.dirname(args.history_file) or '.', exist_ok=True)
+            with open(args.history_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(result, separators=(',', ':')) + '\n')
+
+    if not args.no_record:
+        print(f"\nResults appended to {args.history_file}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Stack Manifest Benchmark - Compares the indexed stack manifest with per-stack parameter files
+Times writing every stack's parameters for a synthetic BOM both ways, and what a deploy job pays
+to read the parameters of one stack and of one shard's stacks from each
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, List
+
+from synthetic_bom import generate_bom
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+REPO_ROOT = os.path.abspath(os.path.join(SCRIPTS_DIR, '..'))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from bomctl.manifest import StackManifest, load_overlay, merge_stacks, write_manifest
+from bomctl.parser import BOMParser
+from cfn_templates import TemplateCache
+from param_contract import load_parameter_file
+
+CUSTOMER = 'bench'
+ENVIRONMENT = 'dev'
+
+def time_call(function: Callable[[], Any], iterations: int) -> float:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def read_every_line(path: str) -> int:
+    """The manifest parsed line by line, as a reader without the index would"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return sum(len(json.loads(line)) for line in f)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the stack manifest against per-stack parameter files')
+    parser.add_argument('--stacks', type=int, default=1000, help='Stacks in the synthetic BOM (one network, the rest services)')
+    parser.add_argument('--shard-size', type=int, default=250, help='Stacks one deploy job reads')
+    parser.add_argument('--iterations', type=int, default=5, help='Timed runs per measurement')
+
+    args = parser.parse_args()
+    overlay = load_overlay(os.path.join(REPO_ROOT, 'config', f"{ENVIRONMENT}.json"), ENVIRONMENT)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bom_file = os.path.join(tmp_dir, 'customer-bom.csv')
+        params_dir = os.path.join(tmp_dir, 'compiled-params')
+        manifest_file = os.path.join(tmp_dir, 'stack-manifest.jsonl')
+        generate_bom(bom_file, args.stacks)
+
+        bom_parser = BOMParser(bom_file)
+        with contextlib.redirect_stdout(io.StringIO()):
+            bom_parser.load_bom()
+            bom_parser.parse_bom(CUSTOMER, ENVIRONMENT)
+        templates = TemplateCache()
+
+        def write_single() -> None:
+            stacks, _ = merge_stacks(bom_parser, CUSTOMER, ENVIRONMENT, overlay, REPO_ROOT, templates)
+            write_manifest(manifest_file, {'customer': CUSTOMER, 'environment': ENVIRONMENT}, stacks)
+
+        files_seconds = time_call(lambda: bom_parser.compile_all(CUSTOMER, ENVIRONMENT, params_dir), args.iterations)
+        manifest_seconds = time_call(write_single, args.iterations)
+        files = [name for name in os.listdir(params_dir) if name.endswith('.json')]
+        files_bytes = sum(os.path.getsize(os.path.join(params_dir, name)) for name in files)
+
+        print(f"Writing {args.stacks:,} stacks:")
+        print(f"  Parameter files (compile-all): {files_seconds * 1000:>8.1f} ms, {len(files):,} files, {files_bytes / 1024:,.0f} KiB")
+        print(f"  Stack manifest (with overlay): {manifest_seconds * 1000:>8.1f} ms, 1 file, "
+              f"{os.path.getsize(manifest_file) / 1024:,.0f} KiB")
+
+        with StackManifest(manifest_file) as manifest:
+            service_stacks = [name for name in manifest if manifest.stack(name)['kind'] == 'service']
+        shard = service_stacks[-args.shard_size:]
+        prefix = f"{CUSTOMER}-{ENVIRONMENT}-"
+
+        def files_for(stack_names: List[str]) -> int:
+            return sum(len(load_parameter_file(os.path.join(params_dir, f"service-params-{name[len(prefix):]}.json")))
+                       for name in stack_names)
+
+        def manifest_for(stack_names: List[str]) -> int:
+            with StackManifest(manifest_file) as manifest:
+                return sum(len(manifest.parameters(name)) for name in stack_names)
+
+        rows = [
+            ('One stack', shard[-1:]),
+            (f"One shard ({len(shard)} stacks)", shard),
+            (f"All {len(service_stacks):,} service stacks", service_stacks)
+        ]
+        print("\nReading parameters (manifest times include opening and indexing the file):")
+        for label, stack_names in rows:
+            file_seconds = time_call(lambda: files_for(stack_names), args.iterations)
+            mapped_seconds = time_call(lambda: manifest_for(stack_names), args.iterations)
+            print(f"  {label:<28} files {file_seconds * 1000:>8.2f} ms   manifest {mapped_seconds * 1000:>8.2f} ms "
+                  f"({file_seconds / mapped_seconds:.2f}x)")
+
+        full_seconds = time_call(lambda: read_every_line(manifest_file), args.iterations)
+        print(f"\nParsing every manifest line without the index: {full_seconds * 1000:.2f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Stack Outputs Benchmark - Replays the output lookups and existence checks of deploy-enhanced.yml's
+deploy job against the stub describe-stacks backend
+Compares one describe-stacks call per value (the workflow's former approach) with the batched,
+per-run cached resolver, in API requests, CLI processes and estimated wall time
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List, Tuple
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from stack_outputs import StackOutputResolver, StubOutputsBackend
+
+CORE_STACKS = ['vpc', 'subnets', 'igw', 'nat', 'security-groups', 'ec2']
+
+# (step, operation, stack, output key) in workflow order; 'deploy' changes the stack's outputs
+WORKFLOW: List[Tuple[str, str, str, str]] = [
+    ('windows-ec2', 'get', 'vpc', 'VPCId'),
+    ('windows-ec2', 'get', 'subnets', 'PublicSubnet1Id'),
+    ('windows-ec2', 'get', 'security-groups', 'WebSecurityGroupId'),
+    ('windows-ec2', 'deploy', 'windows-ec2', 'WindowsInstancePublicIP'),
+    ('alb', 'exists', 'vpc', ''),
+    ('alb', 'exists', 'subnets', ''),
+    ('alb', 'exists', 'security-groups', ''),
+    ('alb', 'deploy', 'alb', 'LoadBalancerDNSName'),
+    ('rds', 'exists', 'vpc', ''),
+    ('rds', 'exists', 'subnets', ''),
+    ('rds', 'exists', 'security-groups', ''),
+    ('rds', 'deploy', 'rds', 'DatabaseEndpoint'),
+] + [('core', 'deploy', name, 'Id') for name in CORE_STACKS] + [
+    ('summary', 'get', 'alb', 'LoadBalancerDNSName'),
+    ('summary', 'get', 'rds', 'DatabaseEndpoint'),
+    ('summary', 'get', 'windows-ec2', 'WindowsInstancePublicIP'),
+]
+
+def make_backend(environment: str, other_stacks: int) -> StubOutputsBackend:
+    """An account with the environment's core stacks plus other environments' and customers' stacks"""
+    stacks: Dict[str, Dict[str, str]] = {
+        f"{environment}-vpc": {'VPCId': 'vpc-0abc'},
+        f"{environment}-subnets": {'PublicSubnet1Id': 'subnet-0abc'},
+        f"{environment}-security-groups": {'WebSecurityGroupId': 'sg-0abc'}
+    }
+    for i in range(other_stacks):
+        stacks[f"other{i:04d}-stack"] = {'Output': str(i)}
+    return StubOutputsBackend(stacks)
+
+def per_value(environment: str, other_stacks: int) -> Tuple[int, int]:
+    """One describe-stacks --stack-name process per lookup; returns (API requests, processes)"""
+    backend = make_backend(environment, other_stacks)
+    processes = 0
+    for _, operation, name, output_key in WORKFLOW:
+        stack_name = f"{environment}-{name}"
+        if operation == 'deploy':
+            backend.update_stack(stack_name, {output_key: f"{name}-value"})
+            continue
+        processes += 1
+        backend.describe_stacks(f"{environment}-", stack_name)
+    return backend.api_calls, processes
+
+def resolved(environment: str, other_stacks: int) -> Tuple[int, int, float]:
+    """The resolver, one process per workflow step; returns (API requests, processes, seconds in the resolver)"""
+    backend = make_backend(environment, other_stacks)
+    resolver = StackOutputResolver(environment, backend)
+    processes = 0
+    elapsed = 0.0
+
+    steps: Dict[str, List[Tuple[str, str, str]]] = {}
+    for step, operation, name, output_key in WORKFLOW:
+        steps.setdefault(step, []).append((operation, name, output_key))
+
+    for operations in steps.values():
+        start = time.perf_counter()
+        fetches = resolver.stats['batch_fetches'] + resolver.stats['stack_fetches']
+        lookups = [(name, output_key) for operation, name, output_key in operations if operation == 'get']
+        checks = [name for operation, name, _ in operations if operation == 'exists']
+        if lookups:
+            resolver.get_many(lookups)
+        if checks:
+            resolver.prefetch(checks)
+            all(resolver.exists(name) for name in checks)
+        processes += resolver.stats['batch_fetches'] + resolver.stats['stack_fetches'] - fetches
+        elapsed += time.perf_counter() - start
+
+        for operation, name, output_key in operations:
+            if operation == 'deploy':
+                backend.update_stack(f"{environment}-{name}", {output_key: f"{name}-value"})
+                resolver.invalidate(name)
+
+    return backend.api_calls, processes, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-value describe-stacks calls against the batched output resolver')
+    parser.add_argument('--environment', default='dev', help='Environment whose stacks are resolved')
+    parser.add_argument('--other-stacks', type=int, nargs='+', default=[0, 250, 1000], help='Stacks of other environments in the account')
+    parser.add_argument('--process-latency', type=float, default=0.8, help='Estimated seconds per aws CLI process (startup + request)')
+    parser.add_argument('--page-latency', type=float, default=0.15, help='Estimated seconds per additional describe-stacks page')
+
+    args = parser.parse_args()
+
+    lookups = sum(1 for _, operation, _, _ in WORKFLOW if operation != 'deploy')
+    print(f"Workflow lookups: {lookups}, estimates: {args.process_latency}s per process, {args.page_latency}s per extra page\n")
+    print(f"{'other stacks':>12} {'approach':<10} {'requests':>9} {'processes':>10} {'est. (s)':>9}")
+
+    for other_stacks in args.other_stacks:
+        before_requests, before_processes = per_value(args.environment, other_stacks)
+        after_requests, after_processes, elapsed = resolved(args.environment, other_stacks)
+        for label, requests, processes in (('per-value', before_requests, before_processes), ('resolver', after_requests, after_processes)):
+            estimate = processes * args.process_latency + (requests - processes) * args.page_latency
+            print(f"{other_stacks:>12} {label:<10} {requests:>9} {processes:>10} {estimate:>9.1f}")
+        print(f"{'':>12} resolver overhead {elapsed * 1000:.2f} ms, "
+              f"{before_processes - after_processes} CLI processes saved\n")
+
+if __name__ == '__main__':
+    main()
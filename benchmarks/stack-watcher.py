@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Stack Watcher Benchmark - Measures how long after a resource fails the failure is detected
+Compares `aws cloudformation wait`-style fixed-interval status polling, one stack after another,
+with the asyncio watcher following every stack's events from one loop
+Runs against simulated event timelines in scaled time, so minutes of CloudFormation take seconds
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+from typing import Dict, List, Tuple
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from stack_watcher import FAILURE_STATUSES, STACK_RESOURCE_TYPE, SUCCESS_STATUSES, SimulatedEventSource, StackGone, StackWatcher, is_stack_event
+
+# (logical id, resource type, typical create seconds) - NAT gateways and RDS dominate
+RESOURCES = [
+    ('VPC', 'AWS::EC2::VPC', 15),
+    ('PublicSubnet1', 'AWS::EC2::Subnet', 8),
+    ('InternetGateway', 'AWS::EC2::InternetGateway', 20),
+    ('NatGateway', 'AWS::EC2::NatGateway', 120),
+    ('WebSecurityGroup', 'AWS::EC2::SecurityGroup', 10),
+    ('Database', 'AWS::RDS::DBInstance', 420),
+]
+
+def stack_timeline(stack_name: str, rng: random.Random, fail_at: float = 0.0,
+                   rollback_seconds: float = 0.0) -> List[Tuple[float, str, str, str, str]]:
+    """Create events for a stack; with fail_at a resource fails then and the stack rolls back"""
+    events = [(0.0, stack_name, STACK_RESOURCE_TYPE, 'CREATE_IN_PROGRESS', 'User Initiated')]
+    resources = rng.sample(RESOURCES, 3)
+    finished = 0.0
+    for i, (logical_id, resource_type, seconds) in enumerate(resources):
+        start = 1.0 + i
+        end = start + seconds * rng.uniform(0.7, 1.3)
+        events.append((start, logical_id, resource_type, 'CREATE_IN_PROGRESS', ''))
+        if fail_at and i == 0:
+            events.append((fail_at, logical_id, resource_type, 'CREATE_FAILED', 'Simulated resource failure'))
+        elif fail_at and end > fail_at:
+            events.append((fail_at + 1, logical_id, resource_type, 'CREATE_FAILED', 'Resource creation cancelled'))
+        else:
+            events.append((end, logical_id, resource_type, 'CREATE_COMPLETE', ''))
+            finished = max(finished, end)
+
+    if fail_at:
+        events.append((fail_at + 2, stack_name, STACK_RESOURCE_TYPE, 'ROLLBACK_IN_PROGRESS', 'The following resource(s) failed to create'))
+        events.append((fail_at + rollback_seconds, stack_name, STACK_RESOURCE_TYPE, 'ROLLBACK_COMPLETE', ''))
+    else:
+        events.append((finished + 2, stack_name, STACK_RESOURCE_TYPE, 'CREATE_COMPLETE', ''))
+    return events
+
+def scenario(stacks: int, rng: random.Random, rollback_seconds: float) -> Tuple[Dict[str, List], str, float]:
+    """Timelines for concurrently deploying stacks, one of which fails"""
+    names = [f"bench-stack{i:02d}" for i in range(stacks)]
+    failing = rng.choice(names)
+    fail_at = rng.uniform(20, 200)
+    timelines = {
+        name: stack_timeline(name, rng, fail_at if name == failing else 0.0, rollback_seconds)
+        for name in names
+    }
+    return timelines, failing, fail_at
+
+async def fixed_interval_waiters(source: SimulatedEventSource, names: List[str], delay: float) -> float:
+    """Wait on each stack in turn, polling its status every delay seconds like the CLI waiters"""
+    source.start()
+    for name in names:
+        while True:
+            try:
+                events = await source.stack_events(name)
+            except StackGone:
+                events = []
+            status = next((event['ResourceStatus'] for event in events if is_stack_event(event, name)), '')
+            if status in FAILURE_STATUSES:
+                return source.elapsed()
+            if status in SUCCESS_STATUSES:
+                break
+            await asyncio.sleep(delay * source.time_scale)
+    return source.elapsed()
+
+async def event_watcher(source: SimulatedEventSource, names: List[str], min_interval: float, max_interval: float) -> float:
+    source.start()
+    watcher = StackWatcher(source, min_interval * source.time_scale, max_interval * source.time_scale, on_event=None)
+    await watcher.watch_all(names, since=source.started_at)
+    return source.elapsed()
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark failure detection latency of fixed-interval waiters vs. the event watcher')
+    parser.add_argument('--stacks', type=int, default=6, help='Stacks deploying at once')
+    parser.add_argument('--trials', type=int, default=5, help='Scenarios with random failure times')
+    parser.add_argument('--waiter-delay', type=float, default=30.0, help='Waiter polling delay in seconds (CLI default: 30)')
+    parser.add_argument('--min-interval', type=float, default=2.0, help='Watcher minimum poll interval in seconds')
+    parser.add_argument('--max-interval', type=float, default=15.0, help='Watcher maximum poll interval in seconds')
+    parser.add_argument('--rollback-seconds', type=float, default=300.0, help='Time from the failure to ROLLBACK_COMPLETE')
+    parser.add_argument('--api-latency', type=float, default=0.3, help='Simulated describe call latency in seconds')
+    parser.add_argument('--time-scale', type=float, default=0.005, help='Real seconds per simulated second')
+    parser.add_argument('--seed', type=int, default=7, help='Random seed')
+
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    latencies: Dict[str, List[float]] = {'waiter': [], 'watcher': []}
+    calls: Dict[str, List[int]] = {'waiter': [], 'watcher': []}
+
+    for _ in range(args.trials):
+        timelines, failing, fail_at = scenario(args.stacks, rng, args.rollback_seconds)
+        names = sorted(timelines)
+        for label in latencies:
+            source = SimulatedEventSource(timelines, args.api_latency * args.time_scale, args.time_scale)
+            if label == 'waiter':
+                detected = asyncio.run(fixed_interval_waiters(source, names, args.waiter_delay))
+            else:
+                detected = asyncio.run(event_watcher(source, names, args.min_interval, args.max_interval))
+            latencies[label].append(detected - fail_at)
+            calls[label].append(source.calls)
+
+    print(f"{args.stacks} stacks, {args.trials} trials, rollback {args.rollback_seconds:.0f}s, "
+          f"waiter delay {args.waiter_delay:.0f}s, watcher {args.min_interval:.0f}-{args.max_interval:.0f}s\n")
+    print(f"{'approach':<10} {'p50 detect (s)':>15} {'max detect (s)':>15} {'describe calls':>15}")
+    for label, values in latencies.items():
+        print(f"{label:<10} {statistics.median(values):>15.1f} {max(values):>15.1f} {statistics.mean(calls[label]):>15.1f}")
+    speedup = statistics.median(latencies['waiter']) / max(statistics.median(latencies['watcher']), 1e-9)
+    print(f"\nFailure detected {speedup:.0f}x sooner (median)")
+
+if __name__ == '__main__':
+    main()
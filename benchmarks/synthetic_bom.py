@@ -0,0 +1,24 @@
+"""
+Synthetic BOM generator shared by the benchmarks
+"""
+
+import csv
+
+COLUMNS = [
+    'resource_type', 'service_name', 'instance_id', 'template', 'dependency', 'vpc_cidr', 'az_count',
+    'create_public_subnets', 'create_private_subnets', 'nat_gateway_type', 'service_type', 'os_type',
+    'instance_family', 'instance_size', 'instance_count', 'subnet_selection', 'root_volume_size',
+    'enable_ssm', 'description'
+]
+
+def generate_bom(path: str, rows: int) -> None:
+    """Write a synthetic BOM with one network row followed by service rows"""
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(COLUMNS)
+        writer.writerow(['network', 'network-foundation', '001', 'network-foundation.yml', '', '10.1.0.0/16', '2',
+                         'true', 'true', 'single', 'network', 'linux', '', '', '', '', '', '', 'Network foundation'])
+        for i in range(rows - 1):
+            writer.writerow(['service', f"compute-web-{i // 1000}", f"{i % 1000:03d}", 'compute-web.yml',
+                             'network-foundation', '', '', '', '', '', 'web', 'linux', 't3', 'small', '1',
+                             'public', '20', 'true', 'Synthetic web server'])
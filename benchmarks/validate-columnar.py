@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Columnar Validation Benchmark - Compares BOMValidator with ColumnarBOMValidator on a synthetic BOM
+Invalid values are injected into a share of the rows; both engines must report exactly the same
+errors and warnings, in the same order
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from synthetic_bom import COLUMNS, generate_bom
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from bomctl.columnar import ColumnarBOMValidator
+from bomctl.validator import BOMValidator
+
+# Values that trip each rule, plus near-misses that must pass (case, whitespace)
+INVALID_VALUES = {
+    'resource_type': ['', 'netwrk', ' Service '],
+    'service_name': ['', '  '],
+    'instance_id': ['', '1', 'abc', '001', '0001'],
+    'template': ['', 'compute-web.yaml', ' compute-web.yml '],
+    'dependency': ['', 'database', 'network-foundation '],
+    'service_type': ['cache', 'WEB'],
+    'os_type': ['solaris', ' Linux'],
+    'instance_family': ['z9', 'T3'],
+    'instance_size': ['huge', 'Small'],
+    'instance_count': ['0', '11', 'two', ' 5 '],
+    'subnet_selection': ['dmz', 'PUBLIC'],
+    'root_volume_size': ['7', '2000', '1.5'],
+    'enable_ssm': ['yes', 'TRUE', '']
+}
+
+def inject_errors(bom_file: str, rate: float, seed: int) -> int:
+    """Overwrite one field in roughly rate of the service rows; returns rows changed"""
+    rng = random.Random(seed)
+    with open(bom_file, 'r', newline='', encoding='utf-8') as file:
+        rows = list(csv.reader(file))
+
+    columns = list(INVALID_VALUES)
+    changed = 0
+    for row in rows[2:]:
+        if rng.random() < rate:
+            column = rng.choice(columns)
+            row[COLUMNS.index(column)] = rng.choice(INVALID_VALUES[column])
+            changed += 1
+
+    with open(bom_file, 'w', newline='', encoding='utf-8') as file:
+        csv.writer(file).writerows(rows)
+    return changed
+
+def run_engine(engine_class, bom_file: str):
+    """Validate once with the output silenced; returns (validator, valid, seconds)"""
+    validator = engine_class(bom_file)
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        valid = validator.validate()
+        elapsed = time.perf_counter() - start
+    return validator, valid, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark columnar vs. row-by-row BOM validation')
+    parser.add_argument('--rows', type=int, default=200_000, help='Number of rows in the synthetic BOM')
+    parser.add_argument('--error-rate', type=float, default=0.01, help='Share of service rows given an invalid value')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for error injection')
+    parser.add_argument('--iterations', type=int, default=3, help='Timed runs per engine')
+    parser.add_argument('--bom-file', help='Use an existing BOM instead of generating one')
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bom_file = args.bom_file
+        if not bom_file:
+            bom_file = os.path.join(tmp_dir, 'synthetic-bom.csv')
+            generate_bom(bom_file, args.rows)
+            changed = inject_errors(bom_file, args.error_rate, args.seed)
+            print(f"Synthetic BOM: {args.rows} rows, {changed} with injected values")
+
+        results = {}
+        for name, engine_class in [('rows', BOMValidator), ('columnar', ColumnarBOMValidator)]:
+            timings = []
+            for _ in range(args.iterations):
+                validator, valid, elapsed = run_engine(engine_class, bom_file)
+                timings.append(elapsed)
+            results[name] = (validator, valid, statistics.median(timings))
+
+    rows, columnar = results['rows'], results['columnar']
+    row_count = columnar[0].row_count
+
+    print(f"\n{'engine':<10} {'valid':<6} {'errors':>7} {'warnings':>9} {'seconds':>9} {'rows/sec':>12}")
+    for name, (validator, valid, seconds) in results.items():
+        print(f"{name:<10} {str(valid).lower():<6} {len(validator.errors):>7} {len(validator.warnings):>9} "
+              f"{seconds:>9.3f} {row_count / seconds:>12,.0f}")
+
+    if (rows[1], rows[0].errors, rows[0].warnings) != (columnar[1], columnar[0].errors, columnar[0].warnings):
+        print("\nERROR: Engines disagree on validation results")
+        sys.exit(1)
+
+    print(f"\nResults identical; speedup: {rows[2] / columnar[2]:.2f}x")
+
+if __name__ == '__main__':
+    main()
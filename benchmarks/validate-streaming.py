@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Streaming Validation Benchmark - Compares BOMValidator.validate() with
+BOMValidator.validate_streaming() on a synthetic BOM
+Reports peak RSS and rows/sec for each engine, each measured in its own process
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from synthetic_bom import generate_bom
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+def run_worker(engine: str, bom_file: str) -> None:
+    """Validate the BOM with one engine and print a JSON result line"""
+    from bomctl.validator import BOMValidator
+    validator = BOMValidator(bom_file)
+
+    # Silence the validator's own progress output so only the result is printed
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    start = time.perf_counter()
+    valid = validator.validate_streaming() if engine == 'streaming' else validator.validate()
+    elapsed = time.perf_counter() - start
+    sys.stdout = stdout
+
+    print(json.dumps({
+        'engine': engine,
+        'valid': valid,
+        'errors': len(validator.errors),
+        'warnings': len(validator.warnings),
+        'seconds': elapsed,
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark streaming vs. list-based BOM validation')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Number of rows in the synthetic BOM')
+    parser.add_argument('--bom-file', help='Use an existing BOM instead of generating one')
+    parser.add_argument('--worker', choices=['current', 'streaming'], help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.bom_file)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bom_file = args.bom_file
+        if not bom_file:
+            bom_file = os.path.join(tmp_dir, 'synthetic-bom.csv')
+            print(f"Generating synthetic BOM with {args.rows} rows...")
+            generate_bom(bom_file, args.rows)
+
+        with open(bom_file, 'r', newline='', encoding='utf-8') as file:
+            row_count = sum(1 for _ in file) - 1
+
+        results = []
+        for engine in ['current', 'streaming']:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--worker', engine, '--bom-file', bom_file],
+                check=True, capture_output=True, text=True
+            ).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"\n{'engine':<10} {'valid':<6} {'errors':>7} {'warnings':>9} {'seconds':>9} {'rows/sec':>12} {'peak RSS (MB)':>14}")
+    for result in results:
+        print(f"{result['engine']:<10} {str(result['valid']).lower():<6} {result['errors']:>7} {result['warnings']:>9} "
+              f"{result['seconds']:>9.2f} {row_count / result['seconds']:>12,.0f} {result['peak_rss_kb'] / 1024:>14.1f}")
+
+    current, streaming = results
+    if (current['valid'], current['errors'], current['warnings']) != (streaming['valid'], streaming['errors'], streaming['warnings']):
+        print("\nERROR: Engines disagree on validation results")
+        sys.exit(1)
+
+    print(f"\nPeak RSS reduction: {current['peak_rss_kb'] / streaming['peak_rss_kb']:.1f}x")
+    print(f"Throughput speedup: {current['seconds'] / streaming['seconds']:.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Batch Parameter Compiler - Runs the bomctl compile-all flow for many customers and environments
+Each customer BOM in a directory is compiled for each environment on a process pool,
+writing a namespaced output tree per customer/environment; an environment given as an overlay
+file (config/<env>.json) also has its Tags and Parameters merged in, as `bomctl stack-manifest` does
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional
+
+from bomctl.parser import BOMParser
+
+def load_environment(spec: str) -> Dict[str, Any]:
+    """Resolve an environment given as an overlay file (config/dev.json) or a bare name"""
+    if spec.endswith('.json'):
+        with open(spec, 'r', encoding='utf-8') as f:
+            overlay = json.load(f)
+        return {'name': overlay['Environment'], 'overlay': spec}
+    return {'name': spec, 'overlay': None}
+
+def discover_boms(bom_dir: str) -> Dict[str, str]:
+    """Map customer name (file stem) to BOM path for every CSV in a directory"""
+    boms = {}
+    for filename in sorted(os.listdir(bom_dir)):
+        if filename.endswith('.csv'):
+            boms[os.path.splitext(filename)[0]] = os.path.join(bom_dir, filename)
+    return boms
+
+def apply_overlay(bom_parser: BOMParser, customer: str, environment: str, overlay_file: str, output_dir: str,
+                  manifest: Dict[str, Any], template_root: str, vpc_cidr: Optional[str] = None) -> None:
+    """Rewrite the compiled parameter files with the overlay merged in and write the stack manifest with its tags"""
+    from bomctl.manifest import STACK_MANIFEST_FILE, load_overlay, merge_stacks, write_manifest
+    from cfn_templates import TemplateCache, default_cache_dir
+
+    overlay = load_overlay(overlay_file, environment)
+    stacks, unused = merge_stacks(bom_parser, customer, environment, overlay, template_root,
+                                  TemplateCache(default_cache_dir()), vpc_cidr)
+
+    files = {('network', None, None): manifest['network']['parameters']} if manifest['network'] else {}
+    for service in manifest['services']:
+        files[('service', service['name'], service['instance_id'])] = service['parameters']
+    for stack in stacks:
+        filename = files[(stack['kind'], stack.get('name'), stack.get('instance_id'))]
+        with open(os.path.join(output_dir, filename), 'w') as f:
+            json.dump(stack['parameters'], f, indent=2)
+
+    header = {'customer': customer, 'environment': environment, 'bom_file': bom_parser.bom_file, 'overlay': overlay_file}
+    write_manifest(os.path.join(output_dir, STACK_MANIFEST_FILE), header, stacks)
+    for key in unused:
+        print(f"WARNING: Overlay parameter {key} is not declared by any stack's template")
+
+def compile_job(customer: str, bom_file: str, environment: str, output_dir: str, overlay_file: Optional[str] = None,
+                template_root: str = '.', vpc_cidr: Optional[str] = None) -> Dict[str, Any]:
+    """Compile one customer/environment; runs inside a pool worker"""
+    result = {'customer': customer, 'environment': environment, 'bom_file': bom_file, 'output_dir': output_dir}
+    timings = {}
+    log = io.StringIO()
+    start = time.perf_counter()
+
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+
+        # BOMParser reports problems on stdout and exits; keep that per job instead
+        with contextlib.redirect_stdout(log):
+            phase_start = time.perf_counter()
+            bom_parser = BOMParser(bom_file)
+            bom_parser.load_bom()
+            timings['load'] = time.perf_counter() - phase_start
+
+            phase_start = time.perf_counter()
+            bom_parser.parse_bom(customer, environment)
+            timings['parse'] = time.perf_counter() - phase_start
+
+            phase_start = time.perf_counter()
+            manifest = bom_parser.compile_all(customer, environment, output_dir, vpc_cidr)
+            timings['compile'] = time.perf_counter() - phase_start
+
+            if overlay_file:
+                phase_start = time.perf_counter()
+                apply_overlay(bom_parser, customer, environment, overlay_file, output_dir, manifest, template_root, vpc_cidr)
+                timings['overlay'] = time.perf_counter() - phase_start
+
+        result['status'] = 'success'
+        result['services'] = len(manifest['services'])
+    except SystemExit:
+        result['status'] = 'failed'
+        result['error'] = log.getvalue().strip().splitlines()[-1] if log.getvalue().strip() else 'parser exited'
+    except Exception as e:
+        result['status'] = 'failed'
+        result['error'] = str(e)
+
+    result['timings'] = timings
+    result['seconds'] = time.perf_counter() - start
+
+    if os.path.isdir(output_dir):
+        with open(os.path.join(output_dir, 'compile.log'), 'w') as f:
+            f.write(log.getvalue())
+
+    return result
+
+def run_batch(boms: Dict[str, str], environments: List[Dict[str, Any]], output_root: str, workers: Optional[int] = None,
+              template_root: str = '.') -> Dict[str, Any]:
+    """Compile every customer/environment pair on a process pool"""
+    jobs = [
+        (customer, bom_file, environment['name'], os.path.join(output_root, customer, environment['name']),
+         environment['overlay'], template_root)
+        for customer, bom_file in boms.items()
+        for environment in environments
+    ]
+
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(compile_job, *job) for job in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if result['status'] == 'success':
+                print(f"✅ {result['customer']}/{result['environment']}: {result['services']} services ({result['seconds'] * 1000:.0f} ms)")
+            else:
+                print(f"❌ {result['customer']}/{result['environment']}: {result['error']}")
+    wall_clock = time.perf_counter() - start
+
+    results.sort(key=lambda r: (r['customer'], r['environment']))
+    return {
+        'jobs': results,
+        'wall_clock_seconds': wall_clock,
+        'cpu_seconds': sum(r['seconds'] for r in results),
+        'jobs_per_second': len(results) / wall_clock if wall_clock > 0 else 0.0,
+        'services_per_second': sum(r.get('services', 0) for r in results) / wall_clock if wall_clock > 0 else 0.0,
+        'success': all(r['status'] == 'success' for r in results)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile parameters for many customer BOMs and environments in parallel')
+    parser.add_argument('--bom-dir', required=True, help='Directory of customer BOM CSV files (customer name = file name)')
+    parser.add_argument('--environments', nargs='+', default=['config/dev.json', 'config/prod.json'],
+                        help='Environment overlay files (config/dev.json) or environment names')
+    parser.add_argument('--output-dir', default='compiled-params', help='Root of the <customer>/<environment> output trees')
+    parser.add_argument('--workers', type=int, help='Process pool size (default: CPU count)')
+    parser.add_argument('--template-root', default='.', help='Directory holding network/ and services/ (for overlay parameters)')
+
+    args = parser.parse_args()
+
+    try:
+        boms = discover_boms(args.bom_dir)
+        environments = [load_environment(spec) for spec in args.environments]
+    except (OSError, ValueError, KeyError) as e:
+        print(f"ERROR: Failed to load batch inputs: {e}")
+        sys.exit(1)
+
+    if not boms:
+        print(f"ERROR: No BOM CSV files found in {args.bom_dir}")
+        sys.exit(1)
+
+    print(f"Compiling {len(boms)} customers x {len(environments)} environments")
+    summary = run_batch(boms, environments, args.output_dir, args.workers, args.template_root)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    with open(os.path.join(args.output_dir, 'batch-summary.json'), 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"\n{'customer':<24} {'env':<8} {'status':<8} {'load':>8} {'parse':>8} {'compile':>8} {'overlay':>8} {'total':>8}")
+    for job in summary['jobs']:
+        timings = job['timings']
+        print(f"{job['customer']:<24} {job['environment']:<8} {job['status']:<8} "
+              + ' '.join(f"{timings.get(phase, 0.0) * 1000:>6.1f}ms" for phase in ('load', 'parse', 'compile', 'overlay'))
+              + f" {job['seconds'] * 1000:>6.1f}ms")
+
+    print(f"\nJobs: {len(summary['jobs'])} in {summary['wall_clock_seconds']:.2f}s "
+          f"({summary['jobs_per_second']:.1f} jobs/sec, {summary['services_per_second']:.0f} services/sec)")
+    print(f"Summed job time: {summary['cpu_seconds']:.2f}s")
+
+    if not summary['success']:
+        print("ERROR: One or more jobs failed")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Incremental BOM Processor - Diffs the BOM against the last successfully deployed snapshot
+Only added or changed service rows are validated and get new parameter files (every service
+depending on network-foundation is re-checked when the network row changes); removed services
+are flagged for stack deletion. A run stages the new snapshot next to the old one, and `--commit`
+promotes it once the deploy has succeeded, so a failed deploy is retried by the next run.
+
+Standalone: deploy.yml does not call it. `services-to-deploy` is a list of {name, instance_id,
+template} as `deploy_shards.py deploy --services-json` takes; `services-to-delete` is a report for
+whoever deletes stacks by hand, since deploy.yml treats service stacks as append-only
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List, Any, Optional
+
+from bomctl.parser import BOMParser, to_cf_parameters
+from bomctl.validator import BOMValidator
+
+def service_key(row: Dict[str, str]) -> str:
+    """Snapshot key for a service row, matching BOMValidator's duplicate check"""
+    return f"{row.get('service_name', '').strip()}-{row.get('instance_id', '').strip()}"
+
+def load_snapshot(snapshot_file: str) -> Dict[str, Any]:
+    """Load the last processed snapshot; a missing file means everything is new"""
+    try:
+        with open(snapshot_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'network': None, 'services': {}}
+
+def pending_file(snapshot_file: str) -> str:
+    """Where a run stages the snapshot until --commit"""
+    return f"{snapshot_file}.pending"
+
+def save_snapshot(snapshot_file: str, snapshot: Dict[str, Any]) -> None:
+    """Atomically write the snapshot"""
+    snapshot_dir = os.path.dirname(snapshot_file)
+    if snapshot_dir:
+        os.makedirs(snapshot_dir, exist_ok=True)
+    tmp_file = f"{snapshot_file}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, indent=2, sort_keys=True)
+    os.replace(tmp_file, snapshot_file)
+
+def diff_services(old: Dict[str, Dict[str, str]], new: Dict[str, Dict[str, str]]) -> Dict[str, List[str]]:
+    """Classify service keys as added, changed, removed or unchanged"""
+    return {
+        'added': [key for key in new if key not in old],
+        'changed': [key for key in new if key in old and new[key] != old[key]],
+        'removed': [key for key in old if key not in new],
+        'unchanged': [key for key in new if key in old and new[key] == old[key]]
+    }
+
+class IncrementalBOMProcessor:
+    def __init__(self, bom_file: str, snapshot_file: str, customer: str, environment: str, output_dir: str = '.'):
+        self.bom_file = bom_file
+        self.snapshot_file = snapshot_file
+        self.customer = customer
+        self.environment = environment
+        self.output_dir = output_dir
+
+        self.bom_parser = BOMParser(bom_file)
+        self.validator = BOMValidator(bom_file)
+
+    def stack_name(self, key: str) -> str:
+        """Service stack name as created by deploy.yml"""
+        return f"{self.customer}-{self.environment}-{key}"
+
+    def run(self, stage_snapshot: bool = True) -> Optional[Dict[str, Any]]:
+        """Process the BOM incrementally; returns the diff result, or None if validation failed
+
+        The new snapshot is only staged; commit_snapshot makes it the baseline after the deploy.
+        """
+        self.bom_parser.load_bom()
+        self.bom_parser.parse_bom(self.customer, self.environment)
+
+        snapshot = load_snapshot(self.snapshot_file)
+
+        # Keep the first row per key, like BOMParser; later duplicates are validation errors.
+        # The snapshot holds the raw rows, so any edit to a row counts as a change
+        network = None
+        services: Dict[str, Dict[str, str]] = {}
+        row_numbers: Dict[str, int] = {}
+        network_row_num = None
+        for i, row in enumerate(self.bom_parser.bom_data, 1):
+            if None in row:
+                # Cells past the header, which csv.DictReader files under None
+                row = {column: value for column, value in row.items() if column is not None}
+            resource_type = row.get('resource_type', '').strip().lower()
+            if resource_type == 'network':
+                if network_row_num is None:
+                    network = row
+                    network_row_num = i
+            elif resource_type == 'service':
+                key = service_key(row)
+                if key in services:
+                    self.validator.errors.append(f"Row {i}: Duplicate service name and instance ID combination: {key}")
+                else:
+                    services[key] = row
+                    row_numbers[key] = i
+            else:
+                # Missing or unknown resource_type: reported the same way as a full validation
+                self.validator.validate_row(row, i)
+
+        diff = diff_services(snapshot.get('services', {}), services)
+        network_changed = network != snapshot.get('network')
+
+        # Only rows that changed since the snapshot need validating again; a changed or removed
+        # network row affects every service that depends on it
+        if network_changed and network is not None:
+            self.validator.validate_network_row(network, network_row_num)
+        recheck = diff['added'] + diff['changed']
+        if network_changed:
+            recheck += [
+                key for key in diff['unchanged']
+                if services[key].get('dependency', '').strip() == 'network-foundation'
+            ]
+        for key in recheck:
+            row = services[key]
+            self.validator.validate_service_row(row, row_numbers[key])
+            if row.get('dependency', '').strip() == 'network-foundation' and network is None:
+                self.validator.errors.append(f"Row {row_numbers[key]}: Service depends on network-foundation but no network configuration found")
+
+        if self.validator.errors:
+            return None
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        deployable = {
+            (service['name'], service['instance_id']): service
+            for service in self.bom_parser.get_services_to_deploy()
+        }
+
+        services_to_deploy = []
+        for key in diff['added'] + diff['changed']:
+            row = services[key]
+            name = row.get('service_name', '').strip()
+            instance_id = row.get('instance_id', '').strip()
+            service = deployable.get((name, instance_id))
+            if not service:
+                continue
+
+            params = self.bom_parser.generate_service_parameters(self.customer, self.environment, name, instance_id)
+            filename = f"service-params-{name}-{instance_id}.json"
+            with open(os.path.join(self.output_dir, filename), 'w') as f:
+                json.dump(to_cf_parameters(params), f, indent=2)
+            services_to_deploy.append(dict(service, change='added' if key in diff['added'] else 'changed'))
+
+        result = {
+            'network_changed': network_changed,
+            'network_removed': network_changed and network is None,
+            'services_to_deploy': services_to_deploy,
+            'services_to_delete': [
+                {'key': key, 'stack_name': self.stack_name(key)} for key in diff['removed']
+            ],
+            'unchanged': len(diff['unchanged'])
+        }
+
+        if stage_snapshot:
+            save_snapshot(pending_file(self.snapshot_file), {
+                'customer': self.customer,
+                'environment': self.environment,
+                'network': network,
+                'services': services
+            })
+
+        return result
+
+def commit_snapshot(snapshot_file: str) -> bool:
+    """Make the staged snapshot the baseline for the next run; False if nothing is staged"""
+    try:
+        os.replace(pending_file(snapshot_file), snapshot_file)
+    except FileNotFoundError:
+        return False
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate and regenerate only the BOM rows changed since the last run')
+    parser.add_argument('--customer', required=True, help='Customer name')
+    parser.add_argument('--environment', required=True, help='Environment (dev/staging/prod)')
+    parser.add_argument('--bom-file', default='bom/customer-bom.csv', help='Path to the BOM CSV file')
+    parser.add_argument('--snapshot-file', help='Snapshot of the last processed BOM (default: .bom-state/<customer>-<environment>.json)')
+    parser.add_argument('--output-dir', default='.', help='Output directory for regenerated service parameters')
+    parser.add_argument('--dry-run', action='store_true', help='Report the diff without staging a snapshot')
+    parser.add_argument('--commit', action='store_true', help='After a successful deploy: make the staged snapshot the baseline')
+
+    args = parser.parse_args()
+    snapshot_file = args.snapshot_file or os.path.join('.bom-state', f"{args.customer}-{args.environment}.json")
+
+    if args.commit:
+        if not commit_snapshot(snapshot_file):
+            print(f"ERROR: No staged snapshot at {pending_file(snapshot_file)}; run without --commit first")
+            sys.exit(1)
+        print(f"✅ Snapshot committed: {snapshot_file}")
+        return
+
+    processor = IncrementalBOMProcessor(args.bom_file, snapshot_file, args.customer, args.environment, args.output_dir)
+    result = processor.run(stage_snapshot=not args.dry_run)
+
+    if result is None:
+        processor.validator.print_results()
+        sys.exit(1)
+
+    if processor.validator.warnings:
+        processor.validator.print_results()
+
+    matrix = [
+        {key: service[key] for key in ('name', 'instance_id', 'template')}
+        for service in result['services_to_deploy']
+    ]
+
+    # Output for GitHub Actions, in the same shape as bomctl check
+    network_needed = result['network_changed'] and not result['network_removed']
+    print(f"::set-output name=network-needed::{str(network_needed).lower()}")
+    print(f"::set-output name=network-removed::{str(result['network_removed']).lower()}")
+    print(f"::set-output name=services-to-deploy::{json.dumps(matrix)}")
+    print(f"::set-output name=services-to-delete::{json.dumps(result['services_to_delete'])}")
+
+    print(f"Network changed: {result['network_changed']}{' (removed)' if result['network_removed'] else ''}")
+    print(f"Unchanged services: {result['unchanged']}")
+    print(f"Services to deploy: {len(result['services_to_deploy'])}")
+    for service in result['services_to_deploy']:
+        print(f"  - {service['name']}-{service['instance_id']} ({service['change']})")
+    print(f"Services to delete: {len(result['services_to_delete'])}")
+    for service in result['services_to_delete']:
+        print(f"  - {service['stack_name']}")
+    if not args.dry_run:
+        print("Snapshot staged; run with --commit once the deploy succeeds")
+
+if __name__ == '__main__':
+    main()
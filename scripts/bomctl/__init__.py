@@ -0,0 +1,4 @@
+"""
+bomctl - BOM validation and parameter generation
+Submodules are imported on demand by bomctl.cli; keep this file free of imports
+"""
@@ -0,0 +1,10 @@
+import os
+import sys
+
+if __package__ in (None, ''):
+    # Run as `python scripts/bomctl`: make the package importable from its parent directory
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bomctl.cli import main
+
+main()
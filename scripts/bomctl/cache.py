@@ -0,0 +1,155 @@
+"""
+BOM Cache - On-disk cache of parsed BOM rows and validation results
+Entries are keyed by the BOM's path and checked against its size, mtime and content hash,
+so repeated bomctl runs on an unchanged file skip the CSV parse and validation
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Dict, List, Any, Optional
+
+CACHE_FORMAT = 1
+
+# Files modified this close to when they were cached may change again within the same
+# mtime tick, so their content hash is always re-checked
+RACY_WINDOW_NS = 2_000_000_000
+
+DEFAULT_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+def file_sha256(path: str) -> str:
+    """Hash a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class BOMCache:
+    def __init__(self, cache_dir: str, max_age_seconds: int = DEFAULT_MAX_AGE_SECONDS):
+        self.cache_dir = cache_dir
+        self.max_age_seconds = max_age_seconds
+
+    def _entry_path(self, bom_file: str) -> str:
+        """Cache file for a BOM path"""
+        key = hashlib.sha256(os.path.abspath(bom_file).encode('utf-8')).hexdigest()[:24]
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read_entry(self, bom_file: str) -> Optional[Dict[str, Any]]:
+        """Return the entry for a BOM if it still matches the file on disk, else None"""
+        entry_path = self._entry_path(bom_file)
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            stat = os.stat(bom_file)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get('format') != CACHE_FORMAT or entry.get('path') != os.path.abspath(bom_file):
+            return None
+
+        stat_matches = entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns
+        racy = entry['cached_at_ns'] - entry['mtime_ns'] < RACY_WINDOW_NS
+        if stat_matches and not racy:
+            return entry
+
+        # Size or mtime changed (e.g. a fresh checkout): the content hash decides
+        if entry['size'] == stat.st_size and entry['sha256'] == file_sha256(bom_file):
+            now_ns = time.time_ns()
+            if not stat_matches or now_ns - stat.st_mtime_ns >= RACY_WINDOW_NS:
+                entry['mtime_ns'] = stat.st_mtime_ns
+                entry['cached_at_ns'] = now_ns
+                self._write_entry(entry_path, entry)
+            return entry
+
+        self._remove(entry_path)
+        return None
+
+    def _write_entry(self, entry_path: str, entry: Dict[str, Any]) -> None:
+        """Atomically write an entry"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, separators=(',', ':'))
+        os.replace(tmp_path, entry_path)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def load_rows(self, bom_file: str) -> Optional[List[Dict[str, str]]]:
+        """Cached csv.DictReader rows for a BOM, or None on a miss"""
+        entry = self._read_entry(bom_file)
+        if not entry or 'rows' not in entry:
+            return None
+        columns = entry['columns']
+        return [dict(zip(columns, row)) for row in entry['rows']]
+
+    def load_validation(self, bom_file: str) -> Optional[Dict[str, Any]]:
+        """Cached validation result ({valid, errors, warnings}) for a BOM, or None on a miss"""
+        entry = self._read_entry(bom_file)
+        if not entry:
+            return None
+        return entry.get('validation')
+
+    def store(self, bom_file: str, rows: Optional[List[Dict[str, str]]] = None, validation: Optional[Dict[str, Any]] = None) -> None:
+        """Cache rows and/or validation results for a BOM, merging with a still-valid entry"""
+        entry_path = self._entry_path(bom_file)
+        try:
+            stat = os.stat(bom_file)
+            sha256 = file_sha256(bom_file)
+        except OSError:
+            return
+
+        entry = self._read_entry(bom_file)
+        if not entry or entry['sha256'] != sha256:
+            entry = {'format': CACHE_FORMAT, 'path': os.path.abspath(bom_file), 'sha256': sha256}
+        entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns, cached_at_ns=time.time_ns())
+
+        if rows is not None:
+            columns = list(rows[0].keys()) if rows else []
+            # Rows with extra fields carry a None key that cannot be stored column-wise
+            if None not in columns and all(list(row.keys()) == columns for row in rows):
+                entry['columns'] = columns
+                entry['rows'] = [list(row.values()) for row in rows]
+
+        if validation is not None:
+            entry['validation'] = validation
+
+        self._write_entry(entry_path, entry)
+        self.evict_stale()
+
+    def evict_stale(self) -> int:
+        """Remove entries whose BOM is gone, has changed size, or has not been cached recently"""
+        removed = 0
+        now_ns = time.time_ns()
+        try:
+            filenames = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return 0
+
+        for filename in filenames:
+            if not filename.endswith('.json'):
+                continue
+            entry_path = os.path.join(self.cache_dir, filename)
+            try:
+                with open(entry_path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+                stale = (
+                    entry.get('format') != CACHE_FORMAT
+                    or not os.path.isfile(entry['path'])
+                    or os.path.getsize(entry['path']) != entry['size']
+                    or now_ns - entry['cached_at_ns'] > self.max_age_seconds * 1_000_000_000
+                )
+            except (OSError, ValueError, KeyError):
+                stale = True
+
+            if stale:
+                self._remove(entry_path)
+                removed += 1
+
+        return removed
@@ -0,0 +1,424 @@
+"""
+BOM CLI - Single entry point for BOM validation and parameter generation
+Each subcommand imports only the modules it needs, so per-invocation startup stays small
+
+Usage: python scripts/bomctl <subcommand> [options]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+# Annotations are not evaluated (PEP 563), so only type checkers import typing. Nothing else on
+# the validate/check path imports it; `from typing import TYPE_CHECKING` raised the median
+# `bomctl validate` from 42 to 47 ms (benchmarks/cli-startup.py measures the same path)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, List, Any, Optional, Tuple
+
+_CLI_IMPORTED = time.perf_counter()
+
+# Deploy telemetry phase per profile mark; the other marks are imports and argument parsing
+TELEMETRY_PHASES = {
+    'load BOM': 'bom.load',
+    'parse BOM': 'bom.parse',
+    'validate': 'bom.validate',
+    'check': 'bom.check',
+    'write parameters': 'params.generate',
+    'daemon query': 'bom.query'
+}
+
+# Subcommands a running `bomctl daemon` can answer from its in-memory BOMs
+DAEMON_COMMANDS = ('validate', 'check', 'network-params', 'service-params')
+DEFAULT_SOCKET = '.bomctl.sock'
+
+class StartupProfile:
+    """Collects import and phase timings for --profile-startup and deploy telemetry"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.phases = []
+        self.telemetry = None
+        self.command = None
+        self._phase_start = _CLI_IMPORTED
+
+    def mark(self, name: str) -> None:
+        """Record the time since the previous mark under this phase name"""
+        now = time.perf_counter()
+        self.phases.append((name, now - self._phase_start))
+        if self.telemetry:
+            # perf_counter has no epoch; anchor it to the wall clock now
+            offset = time.time() - now
+            self.telemetry.record(TELEMETRY_PHASES.get(name, 'bom.startup'), self._phase_start + offset, now + offset,
+                                  command=self.command, step=name)
+        self._phase_start = now
+
+    def report(self) -> None:
+        """Print timings to stderr so GitHub Actions output on stdout stays clean"""
+        if not self.enabled:
+            return
+        print("\nStartup profile (ms):", file=sys.stderr)
+        for name, seconds in self.phases:
+            print(f"  {name:<30} {seconds * 1000:>8.2f}", file=sys.stderr)
+        print(f"  {'total since cli import':<30} {(time.perf_counter() - _CLI_IMPORTED) * 1000:>8.2f}", file=sys.stderr)
+
+def make_cache(args, profile: StartupProfile):
+    """BOM cache for --cache-dir / $BOM_CACHE_DIR, or None"""
+    if not args.cache_dir:
+        return None
+    from bomctl.cache import BOMCache
+    profile.mark('import bomctl.cache')
+    return BOMCache(args.cache_dir)
+
+def load_parser(args, profile: StartupProfile):
+    """Load and parse the BOM for the parameter subcommands"""
+    from bomctl.parser import BOMParser
+    profile.mark('import bomctl.parser')
+
+    bom_parser = BOMParser(args.bom_file, make_cache(args, profile), args.schema_file)
+    bom_parser.load_bom()
+    profile.mark('load BOM')
+    bom_parser.parse_bom(args.customer, args.environment)
+    profile.mark('parse BOM')
+    return bom_parser
+
+def validator_class(dialect: str, columnar: bool = False):
+    """Validator for a schema dialect name"""
+    if dialect == 'future-ready':
+        from bomctl.future_ready import FutureReadyBOMValidator
+        return FutureReadyBOMValidator
+    if columnar:
+        from bomctl.columnar import ColumnarBOMValidator
+        return ColumnarBOMValidator
+    from bomctl.validator import BOMValidator
+    return BOMValidator
+
+def check_result(bom_parser) -> Dict[str, Any]:
+    """What the check subcommand reports for a parsed BOM"""
+    return {
+        'network_needed': bom_parser.network_config is not None,
+        'services_to_deploy': bom_parser.get_services_to_deploy(),
+        'dependencies_ok': bom_parser.check_dependencies()
+    }
+
+def print_check(result: Dict[str, Any]) -> int:
+    import json
+
+    if not result['dependencies_ok']:
+        print("ERROR: Dependency check failed")
+        return 1
+
+    # Output for GitHub Actions
+    print(f"::set-output name=network-needed::{str(result['network_needed']).lower()}")
+    print(f"::set-output name=services-to-deploy::{json.dumps(result['services_to_deploy'])}")
+
+    print(f"Network deployment needed: {result['network_needed']}")
+    print(f"Services to deploy: {len(result['services_to_deploy'])}")
+    for service in result['services_to_deploy']:
+        print(f"  - {service['name']}-{service['instance_id']} ({service['template']})")
+    return 0
+
+def write_parameters(label: str, filename: str, params: Dict[str, Any], profile: StartupProfile) -> None:
+    """Write to file in CloudFormation parameter format and echo the parameters"""
+    import json
+    from bomctl.parser import to_cf_parameters
+
+    with open(filename, 'w') as f:
+        json.dump(to_cf_parameters(params), f, indent=2)
+    profile.mark('write parameters')
+
+    print(f"{label} parameters generated: {filename}")
+    print(json.dumps(params, indent=2))
+
+def cmd_validate(args, profile: StartupProfile) -> int:
+    from bomctl.schema import load_schema
+    profile.mark('import bomctl.schema')
+
+    cache = make_cache(args, profile)
+    try:
+        schema = load_schema(args.schema_file, args.cache_dir)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: Failed to load BOM schema: {e}")
+        return 1
+    profile.mark('load schema')
+
+    dialect = args.dialect if args.dialect != 'auto' else schema.detect(args.bom_file).name
+    BOMValidator = validator_class(dialect, args.columnar)
+    profile.mark('import bomctl.validator')
+
+    validator = BOMValidator(args.bom_file, cache, args.schema_file)
+    valid = validator.validate_streaming() if args.streaming else validator.validate()
+    profile.mark('validate')
+
+    validator.print_results()
+    return 0 if valid else 1
+
+def cmd_check(args, profile: StartupProfile) -> int:
+    bom_parser = load_parser(args, profile)
+
+    # Check what needs to be deployed
+    result = check_result(bom_parser)
+    profile.mark('check')
+    return print_check(result)
+
+def cmd_network_params(args, profile: StartupProfile) -> int:
+    bom_parser = load_parser(args, profile)
+    params = bom_parser.generate_network_parameters(args.customer, args.environment, args.vpc_cidr)
+    write_parameters('Network', 'network-params.json', params, profile)
+    return 0
+
+def cmd_service_params(args, profile: StartupProfile) -> int:
+    bom_parser = load_parser(args, profile)
+    params = bom_parser.generate_service_parameters(args.customer, args.environment, args.service_name, args.instance_id)
+    write_parameters('Service', f"service-params-{args.service_name}-{args.instance_id}.json", params, profile)
+    return 0
+
+def query_daemon(args, profile: StartupProfile) -> Optional[int]:
+    """Answer a subcommand from the daemon on --socket; None when none is running, to run it here instead"""
+    from bomctl.client import request
+
+    payload = {key: value for key, value in vars(args).items() if key not in ('handler', 'profile_startup', 'socket', 'cache_dir')}
+    # The daemon has its own working directory
+    payload['bom_file'] = os.path.abspath(args.bom_file)
+    payload['schema_file'] = os.path.abspath(args.schema_file) if args.schema_file else None
+    response = request(args.socket, payload)
+    profile.mark('daemon query')
+    if response is None or response.get('unsupported'):
+        return None
+
+    sys.stdout.write(response['output'])
+    result = response.get('result')
+    if response['exit_code'] != 0 or result is None:
+        return response['exit_code']
+    if args.command == 'check':
+        return print_check(result)
+    if args.command == 'network-params':
+        write_parameters('Network', 'network-params.json', result, profile)
+    else:
+        write_parameters('Service', f"service-params-{args.service_name}-{args.instance_id}.json", result, profile)
+    return 0
+
+
+def cmd_compile_all(args, profile: StartupProfile) -> int:
+    from bomctl.parser import MANIFEST_FILE
+
+    bom_parser = load_parser(args, profile)
+
+    # Generate every parameter file from a single load/parse of the BOM
+    manifest = bom_parser.compile_all(args.customer, args.environment, args.output_dir, args.vpc_cidr)
+    profile.mark('write parameters')
+
+    if manifest['network']:
+        print(f"Network parameters generated: {manifest['network']['parameters']}")
+    for service in manifest['services']:
+        print(f"Service parameters generated: {service['parameters']}")
+    print(f"Manifest written: {os.path.join(args.output_dir, MANIFEST_FILE)}")
+    return 0
+
+def cmd_stack_manifest(args, profile: StartupProfile) -> int:
+    from bomctl.manifest import STACK_MANIFEST_FILE, load_overlay, merge_stacks, write_manifest
+    from cfn_templates import TemplateCache, default_cache_dir
+    profile.mark('import bomctl.manifest')
+
+    try:
+        overlay = load_overlay(args.overlay, args.environment) if args.overlay else {}
+    except (OSError, ValueError) as e:
+        print(f"ERROR: Failed to load environment overlay: {e}")
+        return 1
+
+    bom_parser = load_parser(args, profile)
+
+    # Parameters and tags of every stack, merged in one pass and written to a single file
+    try:
+        stacks, unused = merge_stacks(bom_parser, args.customer, args.environment, overlay, args.template_root,
+                                      TemplateCache(default_cache_dir()), args.vpc_cidr)
+    except OSError as e:
+        print(f"ERROR: Failed to read template: {e}")
+        return 1
+    output = args.output or os.path.join(args.output_dir, STACK_MANIFEST_FILE)
+    header = {'customer': args.customer, 'environment': args.environment, 'bom_file': args.bom_file, 'overlay': args.overlay}
+    size = write_manifest(output, header, stacks)
+    profile.mark('write parameters')
+
+    for key in unused:
+        print(f"WARNING: Overlay parameter {key} is not declared by any stack's template")
+    print(f"Stack manifest written: {output} ({len(stacks)} stacks, {size / 1024:.1f} KiB)")
+    return 0
+
+def cmd_daemon(args, profile: StartupProfile) -> int:
+    from bomctl.daemon import run_daemon
+    profile.mark('import bomctl.daemon')
+    return run_daemon(args)
+
+def command_options(command: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """A subcommand's options as (flag, add_argument keyword arguments); defaults read the environment now"""
+    common = [
+        ('--bom-file', {'default': 'bom/customer-bom.csv', 'help': 'Path to the BOM CSV file'}),
+        ('--cache-dir', {'default': os.environ.get('BOM_CACHE_DIR'), 'help': 'Cache parsed BOM data in this directory (default: $BOM_CACHE_DIR)'}),
+        ('--schema-file', {'default': os.environ.get('BOM_SCHEMA_FILE'), 'help': 'BOM schema (default: $BOM_SCHEMA_FILE or bom/schema.json)'}),
+        ('--profile-startup', {'action': 'store_true', 'help': 'Print import and phase timings to stderr'}),
+        ('--socket', {'default': os.environ.get('BOMCTL_SOCKET'), 'help': 'Ask the bomctl daemon on this Unix socket first (default: $BOMCTL_SOCKET)'})
+    ]
+    target = common + [
+        ('--customer', {'required': True, 'help': 'Customer name'}),
+        ('--environment', {'required': True, 'help': 'Environment (dev/staging/prod)'})
+    ]
+    vpc_cidr = ('--vpc-cidr', {'help': 'Override VPC CIDR from BOM'})
+    output_dir = ('--output-dir', {'default': '.', 'help': 'Output directory'})
+
+    return {
+        'validate': common + [
+            ('--dialect', {'choices': ['auto', 'customer', 'future-ready'], 'default': 'auto', 'help': 'BOM format (default: detected from the header)'}),
+            ('--streaming', {'action': 'store_true', 'help': 'Validate in a single bounded-memory pass (for very large customer BOMs)'}),
+            ('--columnar', {'action': 'store_true', 'help': 'Validate column by column (fastest for large customer BOMs)'})
+        ],
+        'check': target,
+        'network-params': target + [vpc_cidr],
+        'service-params': target + [
+            ('--service-name', {'required': True, 'help': 'Service name for parameter generation'}),
+            ('--instance-id', {'required': True, 'help': 'Instance ID for parameter generation'})
+        ],
+        'compile-all': target + [output_dir, vpc_cidr],
+        'stack-manifest': target + [
+            ('--overlay', {'help': 'Environment overlay with Tags and Parameters (config/<environment>.json)'}),
+            output_dir,
+            ('--output', {'help': 'Manifest path (default: <output-dir>/stack-manifest.jsonl)'}),
+            ('--template-root', {'default': '.', 'help': 'Directory holding network/ and services/'}),
+            vpc_cidr
+        ],
+        'daemon': [
+            ('--socket', {'default': os.environ.get('BOMCTL_SOCKET', DEFAULT_SOCKET), 'help': 'Unix socket to listen on (default: $BOMCTL_SOCKET or .bomctl.sock)'}),
+            ('--watch', {'nargs': '+', 'default': ['bom/*.csv', 'config/*.csv'], 'help': 'Glob patterns of BOM files to keep loaded'}),
+            ('--schema-file', {'default': os.environ.get('BOM_SCHEMA_FILE'), 'help': 'BOM schema (default: $BOM_SCHEMA_FILE or bom/schema.json)'}),
+            ('--poll-interval', {'type': float, 'default': 1.0, 'help': 'Seconds between checks of the watched files for changes'}),
+            ('--stop', {'action': 'store_true', 'help': 'Stop the daemon listening on --socket'})
+        ]
+    }[command]
+
+# Subcommand -> (help, handler, defaults its options do not set)
+SUBCOMMANDS = {
+    'validate': ('Validate the BOM', cmd_validate, {}),
+    'check': ('Check what needs to be deployed', cmd_check, {}),
+    'network-params': ('Generate network parameters', cmd_network_params, {}),
+    'service-params': ('Generate service parameters', cmd_service_params, {}),
+    'compile-all': ('Generate network and all service parameters plus a manifest', cmd_compile_all, {}),
+    'stack-manifest': ('Merge the BOM with an environment overlay into one indexed manifest', cmd_stack_manifest, {}),
+    'daemon': ('Keep the BOMs parsed and validated in memory and answer the other subcommands over a Unix socket',
+               cmd_daemon, {'profile_startup': False})
+}
+
+# Options of which at most one may be given
+EXCLUSIVE_OPTIONS = {'validate': ('--streaming', '--columnar')}
+
+def parse_simple(argv: List[str]):
+    """Arguments of `<subcommand> --option value ...`, or None when argparse has to parse argv
+
+    argparse, and the gettext and locale lookups it makes, cost a third of a validate run. It is
+    only imported for --help, mistakes it should report, and syntax beyond full option names
+    (abbreviations, list options, values starting with '-').
+    """
+    if not argv or argv[0] not in SUBCOMMANDS:
+        return None
+    command = argv[0]
+    _, handler, defaults = SUBCOMMANDS[command]
+    options = command_options(command)
+    specs = dict(options)
+
+    given = {}
+    rest = iter(argv[1:])
+    for arg in rest:
+        flag, explicit, value = arg.partition('=')
+        spec = specs.get(flag)
+        if spec is None or 'nargs' in spec:
+            return None
+        if spec.get('action') == 'store_true':
+            if explicit:
+                return None
+            given[flag] = True
+            continue
+        if not explicit:
+            value = next(rest, None)
+            if value is None or value.startswith('-'):
+                return None
+        if value not in spec.get('choices', (value,)):
+            return None
+        try:
+            given[flag] = spec['type'](value) if 'type' in spec else value
+        except ValueError:
+            return None
+
+    if any(spec.get('required') and flag not in given for flag, spec in options):
+        return None
+    if sum(flag in given for flag in EXCLUSIVE_OPTIONS.get(command, ())) > 1:
+        return None
+
+    from types import SimpleNamespace
+
+    values = {flag[2:].replace('-', '_'): given.get(flag, spec.get('default', False if spec.get('action') == 'store_true' else None))
+              for flag, spec in options}
+    return SimpleNamespace(command=command, handler=handler, **dict(defaults, **values))
+
+def terminal_columns() -> int:
+    """shutil.get_terminal_size().columns without importing shutil (and bz2 and lzma with it)"""
+    try:
+        columns = int(os.environ.get('COLUMNS', 0))
+    except ValueError:
+        columns = 0
+    if columns <= 0:
+        try:
+            columns = os.get_terminal_size(sys.__stdout__.fileno()).columns
+        except (AttributeError, ValueError, OSError):
+            columns = 0
+    return columns or 80
+
+def build_parser(command: Optional[str] = None):
+    """Argument parser with one subcommand per BOM operation
+
+    Given the subcommand being run, only its parser is built: each ArgumentParser and option
+    costs argparse a formatter and gettext lookups. Without one (--help, a typo) all are built.
+    """
+    import argparse
+
+    class HelpFormatter(argparse.HelpFormatter):
+        def __init__(self, prog: str, indent_increment: int = 2, max_help_position: int = 24, width: Optional[int] = None):
+            # argparse.HelpFormatter imports shutil for the width; one is built per add_argument
+            super().__init__(prog, indent_increment, max_help_position, width or terminal_columns() - 2)
+
+    parser = argparse.ArgumentParser(prog='bomctl', description='Validate the customer BOM and generate deployment parameters',
+                                     formatter_class=HelpFormatter)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for name, (help, handler, defaults) in SUBCOMMANDS.items():
+        if command in SUBCOMMANDS and command != name:
+            continue
+        subparser = subparsers.add_parser(name, help=help, formatter_class=HelpFormatter)
+        exclusive = EXCLUSIVE_OPTIONS.get(name, ())
+        group = subparser.add_mutually_exclusive_group() if exclusive else None
+        for flag, kwargs in command_options(name):
+            (group if flag in exclusive else subparser).add_argument(flag, **kwargs)
+        subparser.set_defaults(handler=handler, **defaults)
+
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> None:
+    profile = StartupProfile()
+    if argv is None:
+        argv = sys.argv[1:]
+
+    args = parse_simple(argv)
+    if args is None:
+        args = build_parser(argv[0] if argv else None).parse_args(argv)
+    profile.enabled = args.profile_startup
+    if os.environ.get('DEPLOY_TELEMETRY_FILE'):
+        from deploy_telemetry import telemetry_from_env
+        profile.telemetry = telemetry_from_env()
+        profile.command = args.command
+    profile.mark('parse arguments')
+
+    exit_code = query_daemon(args, profile) if args.socket and args.command in DAEMON_COMMANDS else None
+    if exit_code is None:
+        exit_code = args.handler(args, profile)
+    profile.report()
+    sys.exit(exit_code)
@@ -0,0 +1,39 @@
+"""
+BOM Daemon Client - Sends one bomctl query to a running `bomctl daemon` over its Unix socket
+Imports only socket and json so a routed CLI invocation skips loading the parser and validator
+"""
+
+import json
+import socket
+from typing import Dict, Any, Optional
+
+# Requests and responses are one JSON document per line
+TIMEOUT_SECONDS = 30.0
+
+def request(socket_path: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The daemon's response, or None when no daemon is listening on the socket"""
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connection.settimeout(TIMEOUT_SECONDS)
+    try:
+        connection.connect(socket_path)
+    except OSError:
+        connection.close()
+        return None
+
+    chunks = []
+    with connection:
+        try:
+            connection.sendall(json.dumps(payload, separators=(',', ':')).encode('utf-8') + b'\n')
+            while True:
+                chunk = connection.recv(1 << 16)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                if chunk.endswith(b'\n'):
+                    break
+        except OSError:
+            return None
+    try:
+        return json.loads(b''.join(chunks)) if chunks else None
+    except ValueError:
+        return None
@@ -0,0 +1,227 @@
+"""
+Columnar BOM Validator - Applies each validation rule to a whole BOM column at once
+Every rule checks each distinct value of its column once and only builds messages for
+the rows holding a failing value. Errors and warnings match BOMValidator exactly
+"""
+
+import gc
+from itertools import compress
+from operator import methodcaller
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple
+
+from bomctl.validator import BOMValidator
+
+if TYPE_CHECKING:
+    from bomctl.schema import Field
+
+# (row index, rule order within the row, message); sorting restores BOMValidator's order
+Finding = Tuple[int, int, str]
+Check = Callable[[str], Optional[str]]
+
+Table = Tuple[Optional[List[str]], List[Sequence[str]], int]
+
+def split_columns(text: str) -> Optional[Table]:
+    """Header, columns and row count of a BOM without quoting, split with str methods
+
+    Returns None when the text needs the csv module: quoted fields, bare carriage
+    returns, NUL characters, or rows with a different number of fields than the header.
+    """
+    if '"' in text or '\0' in text:
+        return None
+    if '\r' in text:
+        text = text.replace('\r\n', '\n')
+        if '\r' in text:
+            return None
+    if not text:
+        return None, [], 0
+
+    lines = text.split('\n')
+    header = lines[0].split(',') if lines[0] else []
+    # csv.DictReader skips blank lines; do the same so row numbers match
+    rows = list(filter(None, lines[1:]))
+    width = len(header)
+    if not rows or not width:
+        return header, [], len(rows)
+
+    if set(map(methodcaller('count', ','), rows)) != {width - 1}:
+        return None
+
+    # One split over all rows, then every width-th field is a column
+    fields = ','.join(rows).split(',')
+    return header, [fields[i::width] for i in range(width)], len(rows)
+
+def csv_columns(bom_file: str) -> Table:
+    """Header, columns and row count read with the csv module"""
+    import csv
+
+    with open(bom_file, 'r', newline='', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        rows = [row for row in reader if row]
+
+    if header is None or not rows or not header:
+        return header, [], len(rows)
+
+    # Short rows read as empty fields; zip() would otherwise truncate every column
+    width = len(header)
+    if min(map(len, rows)) < width:
+        rows = [row + [''] * (width - len(row)) for row in rows]
+    return header, list(zip(*rows)), len(rows)
+
+class ColumnarBOMValidator(BOMValidator):
+    def __init__(self, bom_file: str = 'bom/customer-bom.csv', cache=None, schema_file: Optional[str] = None):
+        super().__init__(bom_file, cache, schema_file)
+        self.columns: Dict[str, Sequence[str]] = {}
+        self.row_count = 0
+        self.row_types: Tuple[str, ...] = ()
+
+    def load_bom(self) -> bool:
+        """Load the BOM CSV into one sequence of raw values per column"""
+        # Columns hold only strings, so cyclic GC passes during the load are pure overhead
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            try:
+                with open(self.bom_file, 'r', newline='', encoding='utf-8') as file:
+                    table = split_columns(file.read())
+            except UnicodeDecodeError:
+                # Let the csv path report the error exactly as BOMValidator does
+                table = None
+            header, values, row_count = table or csv_columns(self.bom_file)
+        except FileNotFoundError:
+            self.errors.append(f"BOM file not found: {self.bom_file}")
+            return False
+        except Exception as e:
+            self.errors.append(f"Failed to load BOM file: {e}")
+            return False
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        if header is None or not row_count:
+            self.errors.append("BOM file is empty")
+            return False
+
+        # Later duplicate header names win, as in csv.DictReader
+        self.columns = {name: values[i] for i, name in enumerate(header)} if values else {}
+        self.row_count = row_count
+
+        # Normalise resource_type once per distinct value, then map every row through it
+        resource_types = self.column('resource_type')
+        normalized = {value: value.strip().lower() for value in set(resource_types)}
+        self.row_types = tuple(map(normalized.__getitem__, resource_types))
+
+        print(f"Loaded {self.row_count} rows from BOM")
+        return True
+
+    def validate_columns(self) -> bool:
+        """Validate that all required columns are present"""
+        if not self.row_count:
+            return False
+
+        missing_columns = self.required_columns - set(self.columns)
+
+        if missing_columns:
+            self.errors.append(f"Missing required columns: {', '.join(missing_columns)}")
+            return False
+
+        return True
+
+    def column(self, name: str) -> Sequence[str]:
+        """Raw values of a column; an absent column reads as empty in every row"""
+        column = self.columns.get(name)
+        return column if column is not None else ('',) * self.row_count
+
+    def rows_of(self, resource_type: str) -> List[int]:
+        """Indexes of the rows with this resource_type"""
+        return list(compress(range(self.row_count), map(resource_type.__eq__, self.row_types)))
+
+    def scan(self, name: str, lower: bool, resource_type: Optional[str], check: Check, order: int,
+             findings: List[Finding]) -> None:
+        """Check each distinct value of a column once; add a finding per failing row of resource_type"""
+        column = self.column(name)
+        failing = {}
+        for raw in set(column):
+            value = raw.strip().lower() if lower else raw.strip()
+            message = check(value)
+            if message:
+                failing[raw] = message
+
+        if not failing:
+            return
+
+        row_types = self.row_types
+        for row in compress(range(self.row_count), map(failing.__contains__, column)):
+            if resource_type is None or row_types[row] == resource_type:
+                findings.append((row, order, f"Row {row + 1}: {failing[column[row]]}"))
+
+    def scan_rows(self, field: 'Field', resource_type: str, order: int, findings: List[Finding]) -> None:
+        """Check a field row by row for findings without a row number, collecting its warnings (VPC CIDR)"""
+        column = self.column(field.column)
+        for row in self.rows_of(resource_type):
+            value = column[row].strip()
+            if field.lower:
+                value = value.lower()
+            if field.warn and value:
+                self.warnings.extend(field.warn(value))
+            message = field.check(value)
+            if message:
+                findings.append((row, order, message))
+
+    def validate_row_data(self) -> bool:
+        """Validate each column's data"""
+        findings: List[Finding] = []
+
+        # Rows with a missing or unknown resource_type get no further checks
+        discriminator = self.dialect.discriminator
+        self.scan(discriminator.column, discriminator.lower, None, discriminator.check, 0, findings)
+
+        # Fields in the order validate_fields applies them to each resource type's rows
+        for resource_type, fields in self.dialect.rules.items():
+            if resource_type not in self.row_types:
+                continue
+            for order, field in enumerate(fields, 1):
+                if field.numbered:
+                    self.scan(field.column, field.lower, resource_type, field.check, order, findings)
+                else:
+                    self.scan_rows(field, resource_type, order, findings)
+
+        findings.sort()
+        self.errors.extend(message for _, _, message in findings)
+        return not findings
+
+    def validate_dependencies(self) -> bool:
+        """Validate service dependencies"""
+        network_exists = 'network' in self.row_types
+        service_rows = self.rows_of('service')
+        findings: List[Finding] = []
+        warnings: List[Finding] = []
+
+        # Check for duplicate service names + instance IDs
+        names = map(str.strip, map(self.column('service_name').__getitem__, service_rows))
+        instance_ids = map(str.strip, map(self.column('instance_id').__getitem__, service_rows))
+        keys = list(map('{}-{}'.format, names, instance_ids))
+        if len(set(keys)) != len(keys):
+            seen = set()
+            for row, key in zip(service_rows, keys):
+                if key in seen:
+                    findings.append((row, 0, f"Row {row + 1}: Duplicate service name and instance ID combination: {key}"))
+                else:
+                    seen.add(key)
+
+        # Check dependency
+        if not network_exists:
+            self.scan('dependency', False, 'service',
+                      lambda value: "Service depends on network-foundation but no network configuration found"
+                      if value == 'network-foundation' else None,
+                      1, findings)
+        self.scan('dependency', False, 'service',
+                  lambda value: f"Unsupported dependency '{value}'. Only 'network-foundation' is supported"
+                  if value and value != 'network-foundation' else None,
+                  0, warnings)
+
+        findings.sort()
+        warnings.sort()
+        self.errors.extend(message for _, _, message in findings)
+        self.warnings.extend(message for _, _, message in warnings)
+        return not findings
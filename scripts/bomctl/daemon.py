@@ -0,0 +1,261 @@
+"""
+BOM Daemon - Keeps parsed BOMs and their validation results in memory and answers bomctl queries
+Watched files are polled for size/mtime changes and only the changed ones are re-parsed and
+re-validated; queries arrive as JSON lines on a Unix socket from bomctl.client
+"""
+
+import contextlib
+import glob
+import io
+import json
+import os
+import signal
+import socketserver
+import threading
+import time
+from typing import Callable, Dict, List, Any, Optional, Set, Tuple
+
+from bomctl.cli import check_result, validator_class
+from bomctl.client import request as send_request
+from bomctl.parser import BOMParser
+from bomctl.schema import DEFAULT_SCHEMA_FILE, SCHEMA_ENV, load_schema
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+def file_key(path: str) -> Optional[Tuple[int, int]]:
+    """Size and mtime of a file, or None if it is missing"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+def captured(function: Callable[[], Any]) -> Tuple[Any, int, str]:
+    """Return value, exit code and stdout of a call that reports problems by printing and exiting"""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        try:
+            return function(), 0, output.getvalue()
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 1
+        except Exception as e:
+            print(f"ERROR: {e}")
+            code = 1
+    return None, code, output.getvalue()
+
+class BOMState:
+    """One watched BOM: its parsed rows and the output of each validation run on it"""
+
+    def __init__(self, path: str, key: Optional[Tuple[int, int]]):
+        self.path = path
+        self.key = key
+        self.parser: Optional[BOMParser] = None
+        self.load_output = ''
+        self.load_exit = 0
+        # Dialect name (or 'auto') -> (exit code, output)
+        self.validations: Dict[str, Tuple[int, str]] = {}
+        self.loaded_at = time.time()
+
+class BOMDaemon:
+    def __init__(self, patterns: List[str], schema_file: Optional[str] = None, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.patterns = patterns
+        self.schema_file = os.path.abspath(schema_file) if schema_file else None
+        self.poll_interval = poll_interval
+        self.states: Dict[str, BOMState] = {}
+        # Files asked about that no pattern matches; watched from then on
+        self.tracked: Set[str] = set()
+        self.schema_key: Optional[Tuple[int, int]] = None
+        self.stats = {'queries': 0, 'reloads': 0, 'validations': 0}
+        # Queries and reloads redirect the process's stdout, so they run one at a time
+        self.lock = threading.RLock()
+        self.stopped = threading.Event()
+
+    @property
+    def schema_path(self) -> str:
+        return os.path.abspath(self.schema_file or os.environ.get(SCHEMA_ENV) or DEFAULT_SCHEMA_FILE)
+
+    def watched(self) -> List[str]:
+        paths = {os.path.abspath(path) for pattern in self.patterns for path in glob.glob(pattern)}
+        return sorted(paths | self.tracked)
+
+    def scan(self) -> List[str]:
+        """Reload every watched file that changed since the last scan; returns their paths"""
+        with self.lock:
+            schema_key = file_key(self.schema_path)
+            if schema_key != self.schema_key:
+                # Every validation depends on the schema
+                self.schema_key = schema_key
+                self.states.clear()
+
+            changed = []
+            watched = self.watched()
+            for path in watched:
+                state = self.states.get(path)
+                if state is None or state.key != file_key(path):
+                    self.refresh(path)
+                    changed.append(path)
+            for path in set(self.states) - set(watched):
+                del self.states[path]
+                changed.append(path)
+            return changed
+
+    def refresh(self, path: str) -> BOMState:
+        """State of a file, re-parsed and re-validated only if it changed"""
+        key = file_key(path)
+        state = self.states.get(path)
+        if state is not None and state.key == key:
+            return state
+
+        state = BOMState(path, key)
+        bom_parser = BOMParser(path, None, self.schema_file)
+
+        def parse() -> None:
+            bom_parser.load_bom()
+            # Records do not depend on the customer or environment, which only enter the parameters
+            bom_parser.parse_bom('', '')
+        _, state.load_exit, state.load_output = captured(parse)
+        if state.load_exit == 0:
+            state.parser = bom_parser
+
+        # Validated up front so the first query after an edit is answered from memory
+        self.validation(state, 'auto')
+        self.states[path] = state
+        self.stats['reloads'] += 1
+        return state
+
+    def validation(self, state: BOMState, dialect: str) -> Tuple[int, str]:
+        if dialect not in state.validations:
+            def validate() -> int:
+                name = dialect if dialect != 'auto' else load_schema(self.schema_file).detect(state.path).name
+                validator = validator_class(name)(state.path, None, self.schema_file)
+                valid = validator.validate()
+                validator.print_results()
+                return 0 if valid else 1
+            value, code, output = captured(validate)
+            state.validations[dialect] = (value if code == 0 else code, output)
+            self.stats['validations'] += 1
+        return state.validations[dialect]
+
+    def status(self) -> Dict[str, Any]:
+        files = {}
+        for path, state in sorted(self.states.items()):
+            exit_code, _ = state.validations.get('auto', (None, ''))
+            files[path] = {'loaded_at': state.loaded_at, 'parsed': state.load_exit == 0, 'valid': exit_code == 0}
+        return {'files': files, 'stats': dict(self.stats), 'schema_file': self.schema_path}
+
+    def handle(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        """Response to one bomctl query: exit code, stdout so far and the result the client prints"""
+        command = query.get('command')
+        if command == 'status':
+            with self.lock:
+                return {'exit_code': 0, 'output': '', 'result': self.status()}
+        if command == 'shutdown':
+            self.stopped.set()
+            return {'exit_code': 0, 'output': '', 'result': None}
+
+        # Validation results are only valid for the daemon's schema
+        if os.path.abspath(query.get('schema_file') or DEFAULT_SCHEMA_FILE) != self.schema_path or 'bom_file' not in query:
+            return {'unsupported': True}
+
+        with self.lock:
+            self.stats['queries'] += 1
+            path = query['bom_file']
+            if path not in self.states:
+                self.tracked.add(path)
+            state = self.refresh(path)
+
+            if command == 'validate':
+                exit_code, output = self.validation(state, query.get('dialect', 'auto'))
+                return {'exit_code': exit_code, 'output': output, 'result': None}
+            if state.load_exit:
+                return {'exit_code': state.load_exit, 'output': state.load_output, 'result': None}
+
+            bom_parser = state.parser
+            if command == 'check':
+                value, code, output = captured(lambda: check_result(bom_parser))
+            elif command == 'network-params':
+                value, code, output = captured(lambda: bom_parser.generate_network_parameters(
+                    query['customer'], query['environment'], query.get('vpc_cidr')))
+            elif command == 'service-params':
+                value, code, output = captured(lambda: bom_parser.generate_service_parameters(
+                    query['customer'], query['environment'], query['service_name'], query['instance_id']))
+            else:
+                return {'unsupported': True}
+            return {'exit_code': code, 'output': state.load_output + output, 'result': value if code == 0 else None}
+
+    def poll(self) -> None:
+        while not self.stopped.wait(self.poll_interval):
+            with self.lock:
+                start = time.perf_counter()
+                changed = self.scan()
+                if changed:
+                    print(f"🔄 Reloaded {len(changed)} changed file(s) in {(time.perf_counter() - start) * 1000:.1f} ms: "
+                          + ', '.join(os.path.relpath(path) for path in changed), flush=True)
+
+    def serve(self, socket_path: str) -> None:
+        """Answer queries on the socket until a shutdown query or SIGTERM"""
+        daemon = self
+
+        class QueryHandler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                try:
+                    query = json.loads(self.rfile.readline())
+                    response = daemon.handle(query)
+                except (ValueError, KeyError) as e:
+                    response = {'exit_code': 1, 'output': f"ERROR: Malformed bomctl query: {e}\n", 'result': None}
+                self.wfile.write(json.dumps(response, separators=(',', ':')).encode('utf-8') + b'\n')
+
+        server = socketserver.ThreadingUnixStreamServer(socket_path, QueryHandler)
+        server.daemon_threads = True
+        signal.signal(signal.SIGTERM, lambda *_: self.stopped.set())
+        poller = threading.Thread(target=self.poll, daemon=True)
+        poller.start()
+
+        def stop_when_asked() -> None:
+            self.stopped.wait()
+            server.shutdown()
+        threading.Thread(target=stop_when_asked, daemon=True).start()
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stopped.set()
+            server.server_close()
+            with contextlib.suppress(OSError):
+                os.unlink(socket_path)
+
+def claim_socket(socket_path: str) -> None:
+    """Remove a socket left behind by a daemon that is no longer running"""
+    if os.path.exists(socket_path):
+        if send_request(socket_path, {'command': 'status'}) is not None:
+            raise RuntimeError(f"A bomctl daemon is already listening on {socket_path}")
+        os.unlink(socket_path)
+
+def run_daemon(args) -> int:
+    if args.stop:
+        if send_request(args.socket, {'command': 'shutdown'}) is None:
+            print(f"ERROR: No bomctl daemon is listening on {args.socket}")
+            return 1
+        print(f"Stopped the bomctl daemon on {args.socket}")
+        return 0
+
+    try:
+        claim_socket(args.socket)
+    except RuntimeError as e:
+        print(f"ERROR: {e}")
+        return 1
+
+    daemon = BOMDaemon(args.watch, args.schema_file, args.poll_interval)
+    start = time.perf_counter()
+    daemon.scan()
+    status = daemon.status()
+    print(f"✅ Loaded and validated {len(status['files'])} BOM files in {(time.perf_counter() - start) * 1000:.0f} ms")
+    for path, state in status['files'].items():
+        print(f"  - {os.path.relpath(path)}: {'valid' if state['valid'] else 'INVALID'}")
+    print(f"Listening on {args.socket} (polling every {args.poll_interval:g}s)", flush=True)
+
+    daemon.serve(args.socket)
+    print("Daemon stopped")
+    return 0
@@ -0,0 +1,122 @@
+"""
+Future-Ready BOM Validator - Validates the ResourceType,ResourceName,Action,Configuration,Value,
+Dependencies,Environment BOM format with the compiled schema's 'future-ready' dialect
+Each row's Value is checked by the field of its ResourceType and Configuration, through the
+same compiled checks as the customer BOM's columns
+"""
+
+from typing import Dict, List, Set, Tuple
+
+from bomctl.validator import BOMValidator
+
+class FutureReadyBOMValidator(BOMValidator):
+    dialect_name = 'future-ready'
+
+    def __init__(self, bom_file: str = 'config/future-ready-bom.csv', cache=None, schema_file=None):
+        super().__init__(bom_file, cache, schema_file)
+        self.row_numbers: List[int] = []
+
+    def load_bom(self) -> bool:
+        """Load the BOM as future_ready_bom.py reads it: fields split on bare commas, no quoting
+
+        Blank and comment lines are skipped; rows are numbered by line, the header being row 0.
+        """
+        try:
+            with open(self.bom_file, 'r', newline='', encoding='utf-8') as file:
+                lines = file.read().split('\n')
+        except FileNotFoundError:
+            self.errors.append(f"BOM file not found: {self.bom_file}")
+            return False
+        except Exception as e:
+            self.errors.append(f"Failed to load BOM file: {e}")
+            return False
+
+        header = lines[0].split(',')
+        comment_prefix = self.dialect.comment_prefix
+        self.bom_data = []
+        self.row_numbers = []
+        carriage_returns = False
+        for row_num, line in enumerate(lines[1:], 1):
+            if not line.strip() or (comment_prefix and line.startswith(comment_prefix)):
+                continue
+            carriage_returns = carriage_returns or line.endswith('\r')
+            fields = line.split(',')
+            fields += [''] * (len(header) - len(fields))
+            self.bom_data.append(dict(zip(header, fields)))
+            self.row_numbers.append(row_num)
+
+        if not self.bom_data:
+            self.errors.append("BOM file is empty")
+            return False
+
+        # The parser keeps the '\r', so no row would match its environment
+        if carriage_returns:
+            self.errors.append("BOM has CRLF line endings; convert it to LF line endings")
+
+        print(f"Loaded {len(self.bom_data)} rows from BOM")
+        return True
+
+    def validate_row(self, row: Dict[str, str], row_num: int) -> bool:
+        """Validate a row's columns, then its Value against its ResourceType's Configuration"""
+        dialect = self.dialect
+        discriminator = dialect.discriminator
+        resource_type = discriminator.read(row)
+
+        message = discriminator.check(resource_type)
+        if message:
+            self.errors.append(f"Row {row_num}: {message}")
+            return False
+
+        valid = self.validate_fields(row, row_num, dialect.columns)
+
+        configuration = row.get(dialect.key_column, '').strip()
+        field = dialect.fields[resource_type].get(configuration)
+        if field is None:
+            if configuration:
+                self.warnings.append(f"Row {row_num}: Unknown configuration '{configuration}' for {resource_type}; "
+                                     f"the parameter generator ignores it")
+            return valid
+
+        return self.validate_fields(row, row_num, (field,)) and valid
+
+    def validate_row_data(self) -> bool:
+        """Validate each row's data"""
+        valid = True
+
+        for row_num, row in zip(self.row_numbers, self.bom_data):
+            if not self.validate_row(row, row_num):
+                valid = False
+
+        return valid
+
+    def validate_dependencies(self) -> bool:
+        """Warn about dependencies on unknown resources and settings the parser would ignore"""
+        known: Set[str] = set()
+        for row in self.bom_data:
+            known.add(row.get('ResourceType', '').strip())
+            known.add(row.get('ResourceName', '').strip())
+
+        seen: Set[Tuple[str, str, str, str]] = set()
+        for row_num, row in zip(self.row_numbers, self.bom_data):
+            resource_type = row.get('ResourceType', '').strip()
+            resource_name = row.get('ResourceName', '').strip()
+            configuration = row.get('Configuration', '').strip()
+
+            for dependency in row.get('Dependencies', '').split(';'):
+                dependency = dependency.strip()
+                if dependency and dependency not in known:
+                    self.warnings.append(f"Row {row_num}: Unknown dependency '{dependency}' of {resource_name}")
+
+            # The parser keeps the first value per resource, configuration and environment
+            key = (resource_type, resource_name, configuration, row.get('Environment', '').strip())
+            field = self.dialect.fields.get(resource_type, {}).get(configuration)
+            if key in seen and not (field and field.repeated):
+                self.warnings.append(f"Row {row_num}: Duplicate {configuration} for {resource_type} {resource_name}; "
+                                     f"only the first value is used")
+            seen.add(key)
+
+        return True
+
+    def validate_streaming(self) -> bool:
+        """Future-ready BOMs are small; the single-pass mode only applies to the customer BOM"""
+        return self.validate()
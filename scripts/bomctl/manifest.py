@@ -0,0 +1,140 @@
+"""
+Stack Manifest - Merges the BOM with an environment overlay (config/<env>.json) into one indexed file
+Every stack's parameters and tags are written as one JSON line; the last line indexes each stack
+name to its byte range, so readers memory-map the file and parse only the stacks they deploy
+"""
+
+import json
+import mmap
+import os
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+
+MANIFEST_FORMAT = 1
+STACK_MANIFEST_FILE = 'stack-manifest.jsonl'
+NETWORK_TEMPLATE = 'network/network-foundation.yml'
+SERVICE_TEMPLATE_DIR = 'services'
+
+def load_overlay(overlay_file: str, environment: str) -> Dict[str, Any]:
+    """Tags and Parameters of an environment overlay, checked against the target environment"""
+    with open(overlay_file, 'r', encoding='utf-8') as f:
+        overlay = json.load(f)
+
+    if overlay.get('Environment', environment) != environment:
+        raise ValueError(f"{overlay_file} is for environment '{overlay['Environment']}', not '{environment}'")
+    for section in ('Tags', 'Parameters'):
+        if not isinstance(overlay.get(section, {}), dict):
+            raise ValueError(f"{overlay_file}: {section} must be an object")
+    return overlay
+
+def merge_stacks(bom_parser, customer: str, environment: str, overlay: Dict[str, Any], template_root: str = '.',
+                 cache=None, vpc_cidr_override: Optional[str] = None) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Stack records for a parsed BOM with the overlay applied, and the overlay parameters no template declares
+
+    Overlay parameters are only given to stacks whose template declares them, since CloudFormation
+    rejects unknown keys; BOM-derived values win over the overlay's.
+    """
+    from cfn_templates import TemplateCache
+    from param_contract import parameter_string
+
+    cache = cache or TemplateCache()
+    overlay_params = overlay.get('Parameters', {})
+    tags = [{'Key': key, 'Value': parameter_string(value)} for key, value in overlay.get('Tags', {}).items()]
+    used = set()
+
+    def record(kind: str, stack_name: str, template: str, params: Dict[str, Any], **fields) -> Dict[str, Any]:
+        declared = cache.summary(os.path.join(template_root, template))['parameters']
+        merged = {key: value for key, value in overlay_params.items() if key in declared}
+        used.update(merged)
+        merged.update(params)
+        return dict({'stack_name': stack_name, 'kind': kind, 'template': template}, **fields,
+                    parameters=[{'ParameterKey': key, 'ParameterValue': parameter_string(value)} for key, value in merged.items()],
+                    tags=tags)
+
+    stacks = []
+    if bom_parser.network_config:
+        params = bom_parser.generate_network_parameters(customer, environment, vpc_cidr_override)
+        stacks.append(record('network', f"{customer}-{environment}-network-foundation", NETWORK_TEMPLATE, params))
+
+    seen = set()
+    for service in bom_parser.get_services_to_deploy():
+        key = (service['name'], service['instance_id'])
+        if key in seen:
+            continue
+        seen.add(key)
+        params = bom_parser.generate_service_parameters(customer, environment, *key)
+        stacks.append(record('service', f"{customer}-{environment}-{service['name']}-{service['instance_id']}",
+                             f"{SERVICE_TEMPLATE_DIR}/{service['template']}", params,
+                             name=service['name'], instance_id=service['instance_id']))
+
+    return stacks, sorted(set(overlay_params) - used)
+
+def write_manifest(path: str, header: Dict[str, Any], stacks: List[Dict[str, Any]]) -> int:
+    """Atomically write the header line, one line per stack and the index line; returns the file size"""
+    lines = [json.dumps(dict(header, format=MANIFEST_FORMAT, stacks=len(stacks)), separators=(',', ':')).encode('utf-8') + b'\n']
+    offset = len(lines[0])
+    index = {}
+    for stack in stacks:
+        line = json.dumps(stack, separators=(',', ':')).encode('utf-8') + b'\n'
+        index[stack['stack_name']] = [offset, len(line) - 1]
+        offset += len(line)
+        lines.append(line)
+    lines.append(json.dumps({'index': index}, separators=(',', ':')).encode('utf-8') + b'\n')
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.writelines(lines)
+    os.replace(tmp_path, path)
+    return offset + len(lines[-1])
+
+class StackManifest:
+    """Read-only, memory-mapped view of a stack manifest; stacks are parsed on first access"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            header_end = self._data.find(b'\n')
+            index_start = self._data.rfind(b'\n', 0, len(self._data) - 1) + 1
+            self.header = json.loads(self._data[:header_end])
+            self._index = json.loads(self._data[index_start:])['index']
+        except (ValueError, KeyError) as e:
+            self._data.close()
+            raise ValueError(f"{path} is not a stack manifest: {e}")
+        if self.header.get('format') != MANIFEST_FORMAT:
+            self._data.close()
+            raise ValueError(f"{path} has manifest format {self.header.get('format')}, expected {MANIFEST_FORMAT}")
+        self._stacks: Dict[str, Dict[str, Any]] = {}
+
+    def stack(self, stack_name: str) -> Dict[str, Any]:
+        """One stack's record; KeyError if the manifest does not hold it"""
+        stack = self._stacks.get(stack_name)
+        if stack is None:
+            offset, length = self._index[stack_name]
+            stack = self._stacks[stack_name] = json.loads(self._data[offset:offset + length])
+        return stack
+
+    def parameters(self, stack_name: str) -> Dict[str, str]:
+        return {param['ParameterKey']: param['ParameterValue'] for param in self.stack(stack_name)['parameters']}
+
+    def tags(self, stack_name: str) -> Dict[str, str]:
+        return {tag['Key']: tag['Value'] for tag in self.stack(stack_name)['tags']}
+
+    def __contains__(self, stack_name: str) -> bool:
+        return stack_name in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def close(self) -> None:
+        self._data.close()
+
+    def __enter__(self) -> 'StackManifest':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,231 @@
+"""
+BOM Parser - Reads and processes the customer BOM CSV file
+Generates CloudFormation parameters and determines deployment requirements
+"""
+
+from __future__ import annotations
+
+import sys
+import os
+import time
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, List, Any, Optional, Tuple
+
+    from bomctl.cache import BOMCache
+    from bomctl.records import NetworkRecord, RecordBuilder, ServiceRecord
+
+MANIFEST_FILE = 'bom-manifest.json'
+
+def to_cf_parameters(params: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Convert a parameter dict to CloudFormation parameter format"""
+    return [{'ParameterKey': key, 'ParameterValue': str(value)} for key, value in params.items()]
+
+class BOMParser:
+    def __init__(self, bom_file: str = 'bom/customer-bom.csv', cache: Optional['BOMCache'] = None,
+                 schema_file: Optional[str] = None):
+        self.bom_file = bom_file
+        self.cache = cache
+        self.schema_file = schema_file
+        self.bom_data = []
+        self.network_config: Optional['NetworkRecord'] = None
+        self.services: List['ServiceRecord'] = []
+        self.service_index: Dict[Tuple[str, str], 'ServiceRecord'] = {}
+        
+    def load_bom(self) -> None:
+        """Load BOM CSV file"""
+        start = time.perf_counter()
+        cached_rows = self.cache.load_rows(self.bom_file) if self.cache else None
+        
+        try:
+            if cached_rows is not None:
+                self.bom_data = cached_rows
+            else:
+                import csv
+                
+                with open(self.bom_file, 'r', newline='', encoding='utf-8') as file:
+                    reader = csv.DictReader(file)
+                    self.bom_data = list(reader)
+                
+            if not self.bom_data:
+                raise ValueError("BOM file is empty")
+            
+            if self.cache and cached_rows is None:
+                self.cache.store(self.bom_file, rows=self.bom_data)
+            
+            if self.cache:
+                cache_state = 'cache hit' if cached_rows is not None else 'cache miss'
+                print(f"Loaded {len(self.bom_data)} rows from BOM ({cache_state}, {(time.perf_counter() - start) * 1000:.1f} ms)")
+            else:
+                print(f"Loaded {len(self.bom_data)} rows from BOM")
+            
+        except FileNotFoundError:
+            print(f"ERROR: BOM file not found: {self.bom_file}")
+            sys.exit(1)
+        except Exception as e:
+            print(f"ERROR: Failed to load BOM file: {e}")
+            sys.exit(1)
+    
+    def record_builder(self) -> 'RecordBuilder':
+        """Row normalizer for the BOM schema's customer dialect"""
+        from bomctl.records import RecordBuilder
+        from bomctl.schema import load_schema
+        
+        schema = load_schema(self.schema_file, self.cache.cache_dir if self.cache else None)
+        return RecordBuilder(schema.dialect('customer'))
+    
+    def parse_bom(self, customer: str, environment: str) -> None:
+        """Parse BOM data into network and service records"""
+        self.network_config = None
+        self.services = []
+        self.service_index = {}
+        builder = self.record_builder()
+        
+        for row_num, row in enumerate(self.bom_data, 1):
+            record = builder.build(row, row_num)
+            
+            if record is None:
+                print(f"WARNING: Unknown resource type '{builder.resource_type(row)}' in row: {row}")
+                
+            elif record.kind == 'network':
+                if self.network_config is None:
+                    self.network_config = record
+                else:
+                    print("WARNING: Multiple network configurations found, using first one")
+                    
+            else:
+                if not record.service_name or not record.instance_id:
+                    print(f"WARNING: Skipping service row with missing name or instance_id: {row}")
+                    continue
+                    
+                self.services.append(record)
+                # First row wins for duplicate keys, matching the original linear scan
+                self.service_index.setdefault((record.service_name, record.instance_id), record)
+    
+    def generate_network_parameters(self, customer: str, environment: str, vpc_cidr_override: Optional[str] = None) -> Dict[str, Any]:
+        """Generate CloudFormation parameters for network deployment"""
+        if not self.network_config:
+            print("ERROR: No network configuration found in BOM")
+            sys.exit(1)
+        
+        from bomctl.records import flag
+        
+        network = self.network_config
+        params = {
+            'Customer': customer,
+            'Environment': environment,
+            'VpcCidr': vpc_cidr_override or network.vpc_cidr,
+            'AvailabilityZoneCount': int(network.az_count),
+            'CreatePublicSubnets': flag(network.create_public_subnets),
+            'CreatePrivateSubnets': flag(network.create_private_subnets),
+            'NatGatewayType': network.nat_gateway_type
+        }
+        
+        # Subnets are planned here so the same per-AZ layout can be checked across every BOM
+        from cidr_planner import subnet_cidrs
+        try:
+            params['SubnetCidrs'] = subnet_cidrs(params['VpcCidr'], params['AvailabilityZoneCount'],
+                                                 params['CreatePublicSubnets'] == 'true', params['CreatePrivateSubnets'] == 'true')
+        except ValueError as e:
+            print(f"ERROR: Cannot plan subnets for VPC CIDR '{params['VpcCidr']}': {e}")
+            sys.exit(1)
+        
+        return params
+    
+    def generate_service_parameters(self, customer: str, environment: str, service_name: str, instance_id: str) -> Dict[str, Any]:
+        """Generate CloudFormation parameters for service deployment"""
+        from bomctl.records import flag
+        
+        service = self.service_index.get((service_name, instance_id))
+        
+        if not service:
+            print(f"ERROR: Service configuration not found for {service_name}-{instance_id}")
+            sys.exit(1)
+        
+        params = {
+            'Customer': customer,
+            'Environment': environment,
+            'InstanceId': instance_id,
+            'InstanceType': f"{service.instance_family}.{service.instance_size}",
+            'InstanceCount': int(service.instance_count),
+            'RootVolumeSize': int(service.root_volume_size),
+            'SubnetSelection': service.subnet_selection,
+            'EnableSSM': flag(service.enable_ssm)
+        }
+        
+        # Add service-specific parameters
+        if service.service_type == 'bastion':
+            params['AllowedCidr'] = '0.0.0.0/0'  # Default, should be restricted in production
+        
+        return params
+    
+    def get_services_to_deploy(self) -> List[Dict[str, str]]:
+        """Get list of services that need to be deployed"""
+        services_to_deploy = []
+        
+        for service in self.services:
+            if service.template:
+                services_to_deploy.append({
+                    'name': service.service_name,
+                    'instance_id': service.instance_id,
+                    'template': service.template
+                })
+        
+        return services_to_deploy
+    
+    def check_dependencies(self) -> bool:
+        """Check if all service dependencies are satisfied"""
+        dependencies_ok = True
+        
+        for service in self.services:
+            dependency = service.dependency
+            if dependency and dependency != 'network-foundation':
+                print(f"WARNING: Service {service.service_name}-{service.instance_id} has unsupported dependency: {dependency}")
+                dependencies_ok = False
+        
+        return dependencies_ok
+    
+    def compile_all(self, customer: str, environment: str, output_dir: str = '.', vpc_cidr_override: Optional[str] = None) -> Dict[str, Any]:
+        """Write network and all service parameter files plus a manifest in a single pass"""
+        import json
+        
+        os.makedirs(output_dir, exist_ok=True)
+        
+        manifest = {
+            'customer': customer,
+            'environment': environment,
+            'bom_file': self.bom_file,
+            'network': None,
+            'services': []
+        }
+        
+        if self.network_config:
+            params = self.generate_network_parameters(customer, environment, vpc_cidr_override)
+            self._write_parameters(os.path.join(output_dir, 'network-params.json'), params)
+            manifest['network'] = {'parameters': 'network-params.json'}
+        
+        written = set()
+        for service in self.get_services_to_deploy():
+            key = (service['name'], service['instance_id'])
+            if key in written:
+                continue
+            written.add(key)
+            
+            params = self.generate_service_parameters(customer, environment, service['name'], service['instance_id'])
+            filename = f"service-params-{service['name']}-{service['instance_id']}.json"
+            self._write_parameters(os.path.join(output_dir, filename), params)
+            manifest['services'].append(dict(service, parameters=filename))
+        
+        with open(os.path.join(output_dir, MANIFEST_FILE), 'w') as f:
+            json.dump(manifest, f, indent=2)
+        
+        return manifest
+    
+    @staticmethod
+    def _write_parameters(path: str, params: Dict[str, Any]) -> None:
+        """Write parameters to file in CloudFormation parameter format"""
+        import json
+        
+        with open(path, 'w') as f:
+            json.dump(to_cf_parameters(params), f, indent=2)
@@ -0,0 +1,114 @@
+"""
+BOM Records - Slotted records for the customer BOM's network and service rows
+Each row is normalized once, by the compiled schema's fields: values are stripped, enum values
+interned, valid numbers and booleans parsed and empty values replaced by their defaults. The
+parser and validator read these attributes instead of re-reading the csv.DictReader dicts
+"""
+
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Dict, List, Any, Optional, Tuple, Union
+
+    from bomctl.schema import Dialect
+
+    # A checked value is parsed once its check passes; an invalid one stays the string the check reports
+    Number = Union[int, str]
+    Flag = Union[bool, str]
+    Record = Union['NetworkRecord', 'ServiceRecord']
+
+# Plain __slots__ classes rather than dataclasses: importing dataclasses (and inspect with it)
+# costs more than parsing a typical BOM. __slots__ lists the attributes in constructor order
+
+class BaseRecord:
+    __slots__ = ()
+    kind = ''
+
+    def __repr__(self) -> str:
+        values = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({values})"
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+class NetworkRecord(BaseRecord):
+    __slots__ = ('row_num', 'vpc_cidr', 'az_count', 'create_public_subnets', 'create_private_subnets', 'nat_gateway_type')
+    kind = 'network'
+
+    def __init__(self, row_num: int, vpc_cidr: str, az_count: Number, create_public_subnets: Flag,
+                 create_private_subnets: Flag, nat_gateway_type: str):
+        self.row_num = row_num
+        self.vpc_cidr = vpc_cidr
+        self.az_count = az_count
+        self.create_public_subnets = create_public_subnets
+        self.create_private_subnets = create_private_subnets
+        self.nat_gateway_type = nat_gateway_type
+
+class ServiceRecord(BaseRecord):
+    __slots__ = ('row_num', 'service_name', 'instance_id', 'template', 'dependency', 'service_type', 'os_type',
+                 'instance_family', 'instance_size', 'instance_count', 'root_volume_size', 'subnet_selection', 'enable_ssm')
+    kind = 'service'
+
+    def __init__(self, row_num: int, service_name: str, instance_id: str, template: str, dependency: str,
+                 service_type: str, os_type: str, instance_family: str, instance_size: str, instance_count: Number,
+                 root_volume_size: Number, subnet_selection: str, enable_ssm: Flag):
+        self.row_num = row_num
+        self.service_name = service_name
+        self.instance_id = instance_id
+        self.template = template
+        self.dependency = dependency
+        self.service_type = service_type
+        self.os_type = os_type
+        self.instance_family = instance_family
+        self.instance_size = instance_size
+        self.instance_count = instance_count
+        self.root_volume_size = root_volume_size
+        self.subnet_selection = subnet_selection
+        self.enable_ssm = enable_ssm
+
+RECORD_CLASSES = (NetworkRecord, ServiceRecord)
+
+def flag(value: Flag) -> str:
+    """A boolean as CloudFormation parameters spell it"""
+    return str(value).lower()
+
+class RecordBuilder:
+    """Builds records from customer BOM rows with a dialect's compiled fields"""
+
+    def __init__(self, dialect: 'Dialect'):
+        from bomctl.schema import SchemaError
+
+        self.discriminator = dialect.discriminator
+        self.readers: Dict[str, Tuple[type, List[Callable[[Dict[str, str]], Any]]]] = {}
+
+        for record_class in RECORD_CLASSES:
+            schema_fields = dialect.fields.get(record_class.kind, {})
+            attributes = record_class.__slots__[1:]
+
+            # The validator reads every schema field off the record
+            missing = set(schema_fields) - set(attributes)
+            if missing:
+                raise SchemaError(f"{dialect.name}: {record_class.kind} records have no {', '.join(sorted(missing))}")
+
+            self.readers[record_class.kind] = (record_class, [
+                schema_fields[name].normalize if name in schema_fields else self.column_reader(name)
+                for name in attributes
+            ])
+
+    @staticmethod
+    def column_reader(column: str) -> Callable[[Dict[str, str]], str]:
+        return lambda row: row.get(column, '').strip()
+
+    def resource_type(self, row: Dict[str, str]) -> str:
+        return self.discriminator.read(row)
+
+    def build(self, row: Dict[str, str], row_num: int) -> Optional[Record]:
+        """The row's record, or None for a resource type without one"""
+        entry = self.readers.get(self.discriminator.read(row))
+        if entry is None:
+            return None
+        record_class, readers = entry
+        return record_class(row_num, *[read(row) for read in readers])
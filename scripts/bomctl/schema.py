@@ -0,0 +1,403 @@
+"""
+BOM Schema - Compiles bom/schema.json into the field checks of both BOM dialects
+Compiling validates the schema, interns enum values, renders option strings and builds one
+anchored regex per field. The compiled form is cached by the schema's hash, with an index of
+each schema file's size and mtime, so later runs neither hash nor re-parse the schema and only
+turn its compiled form into closures
+"""
+
+from __future__ import annotations
+
+import marshal
+import os
+import re
+import sys
+from functools import lru_cache
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Dict, List, Any, Optional, Tuple
+
+    Check = Callable[[str], Optional[str]]
+
+from bomctl.validator import BOOLEAN_VALUES, boolean_error, check_vpc_cidr, numeric_error, option_error
+
+SCHEMA_FORMAT = 1
+
+SCHEMA_ENV = 'BOM_SCHEMA_FILE'
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+DEFAULT_SCHEMA_FILE = os.path.join(REPO_ROOT, 'bom', 'schema.json')
+# Compiled schemas are cached in the repository (not the working directory) unless
+# --cache-dir / $BOM_CACHE_DIR names another directory
+DEFAULT_CACHE_DIR = os.path.join(REPO_ROOT, '.bom-cache')
+
+# A field has at most one of these; required, label, lowercase etc. refine it
+VALUE_KINDS = ('enum', 'range', 'boolean', 'pattern', 'cidr')
+FIELD_KEYS = frozenset(VALUE_KINDS) | {'required', 'label', 'lowercase', 'default', 'message', 'row_numbers', 'repeated'}
+
+
+class SchemaError(ValueError):
+    """The schema file is not a valid BOM schema"""
+
+def compile_field(field: str, column: str, name: str, spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Serializable form of one field: what it reads, how messages name it, and its accepted values"""
+    if not isinstance(spec, dict):
+        raise SchemaError(f"{name}: expected an object")
+    unknown = set(spec) - FIELD_KEYS
+    if unknown:
+        raise SchemaError(f"{name}: unknown keys {', '.join(sorted(unknown))}")
+    kinds = [kind for kind in VALUE_KINDS if spec.get(kind)]
+    if len(kinds) > 1:
+        raise SchemaError(f"{name}: {' and '.join(kinds)} cannot be combined")
+
+    compiled = {
+        'field': field,
+        'column': column,
+        'name': name,
+        'kind': kinds[0] if kinds else None,
+        'lower': bool(spec.get('lowercase')),
+        'required': spec.get('required'),
+        'numbered': spec.get('row_numbers', True),
+        'repeated': bool(spec.get('repeated')),
+        'default': spec.get('default'),
+        'accept': None
+    }
+
+    kind = compiled['kind']
+    if kind == 'enum':
+        values = spec['enum']
+        if not all(isinstance(value, str) and value for value in values):
+            raise SchemaError(f"{name}: enum values must be non-empty strings")
+        compiled.update(values=values, label=spec.get('label', name), options=', '.join(values),
+                        accept='|'.join(map(re.escape, values)))
+    elif kind == 'range':
+        bounds = spec['range']
+        if len(bounds) != 2 or not all(isinstance(bound, int) and bound >= 0 for bound in bounds) or bounds[0] > bounds[1]:
+            raise SchemaError(f"{name}: range must be [min, max] non-negative integers")
+        compiled.update(min=bounds[0], max=bounds[1], accept=f"[0-9]{{1,{len(str(bounds[1]))}}}")
+    elif kind == 'boolean':
+        compiled['accept'] = 'true|false'
+    elif kind == 'pattern':
+        if 'message' not in spec:
+            raise SchemaError(f"{name}: a pattern needs a message")
+        compiled.update(message=spec['message'], accept=spec['pattern'])
+    elif kind == 'cidr':
+        bounds = spec['cidr']
+        if len(bounds) != 2 or not 0 <= bounds[0] <= bounds[1] <= 32:
+            raise SchemaError(f"{name}: cidr must be [min prefix, max prefix]")
+        # No accept regex: every CIDR is parsed, since a valid one may still warn
+        compiled.update(min=bounds[0], max=bounds[1], label=spec.get('label', name))
+
+    if compiled['accept'] is not None:
+        try:
+            re.compile(compiled['accept'])
+        except re.error as e:
+            raise SchemaError(f"{name}: invalid pattern: {e}")
+    return compiled
+
+def compile_dialect(name: str, spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Serializable form of one dialect"""
+    try:
+        discriminator = spec['discriminator']
+        type_column = discriminator['column']
+        types = spec['types']
+        required_columns = spec['required_columns']
+    except (KeyError, TypeError) as e:
+        raise SchemaError(f"{name}: missing {e}")
+
+    key_column = spec.get('key_column')
+    value_column = spec.get('value_column')
+    if bool(key_column) != bool(value_column):
+        raise SchemaError(f"{name}: key_column and value_column go together")
+
+    fields = {}
+    for resource_type, type_fields in types.items():
+        if key_column:
+            # Keyed dialect: the row's Configuration picks the field, which checks its Value
+            fields[resource_type] = [
+                compile_field(field, value_column, f"{resource_type}.{field}", field_spec)
+                for field, field_spec in type_fields.items()
+            ]
+        else:
+            fields[resource_type] = [
+                compile_field(field, field, field, field_spec)
+                for field, field_spec in type_fields.items()
+            ]
+
+    discriminator_spec = {
+        'enum': list(types),
+        'lowercase': discriminator.get('lowercase', False),
+        'required': discriminator.get('required')
+    }
+    return {
+        'required_columns': required_columns,
+        'comment_prefix': spec.get('comment_prefix'),
+        'key_column': key_column,
+        'value_column': value_column,
+        'discriminator': compile_field(type_column, type_column, type_column, discriminator_spec),
+        'columns': [compile_field(field, field, field, field_spec) for field, field_spec in spec.get('columns', {}).items()],
+        'fields': fields
+    }
+
+def compile_schema(document: Dict[str, Any], sha256: str) -> Dict[str, Any]:
+    """Validate a schema document and compile every dialect into its serializable form"""
+    if not isinstance(document, dict) or document.get('version') != 1 or not isinstance(document.get('dialects'), dict):
+        raise SchemaError("expected a version 1 schema with dialects")
+    return {
+        'format': SCHEMA_FORMAT,
+        'schema_sha256': sha256,
+        'dialects': {name: compile_dialect(name, spec) for name, spec in document['dialects'].items()}
+    }
+
+def plain_number(max_val: int) -> Callable[[str], bool]:
+    """Same test as a range's accept regex, [0-9]{1,digits of max}, without compiling it"""
+    width = len(str(max_val))
+    return lambda value: len(value) <= width and value.isascii() and value.isdigit()
+
+def build_check(compiled: Dict[str, Any]) -> Tuple[Check, Optional[Callable[[str], List[str]]]]:
+    """Closure returning a field's error message (or None), plus one returning its warnings for CIDR fields"""
+    required = compiled['required']
+    kind = compiled['kind']
+    name = compiled['name']
+
+    if kind == 'cidr':
+        min_prefix, max_prefix, label = compiled['min'], compiled['max'], compiled['label']
+
+        # One parse per distinct CIDR serves both the warnings and the error
+        @lru_cache(maxsize=1024)
+        def cidr_result(value: str) -> Tuple[Tuple[str, ...], Optional[str]]:
+            warnings, error = check_vpc_cidr(value, min_prefix, max_prefix, label)
+            return tuple(warnings), error
+
+        return (lambda value: cidr_result(value)[1] if value else required), \
+               (lambda value: list(cidr_result(value)[0]))
+
+    if kind == 'enum':
+        # Values from the BOM are compared against interned strings, hashed once each
+        valid = frozenset(map(sys.intern, compiled['values']))
+        label, options = compiled['label'], compiled['options']
+
+        def check(value: str) -> Optional[str]:
+            if not value:
+                return required
+            return None if value in valid else option_error(value, label, options)
+        return check, None
+
+    if kind == 'range':
+        accept = plain_number(compiled['max'])
+        min_val, max_val = compiled['min'], compiled['max']
+
+        def check(value: str) -> Optional[str]:
+            if not value:
+                return required
+            if accept(value) and min_val <= int(value) <= max_val:
+                return None
+            # Signs, spaces and out-of-range numbers get int()'s exact verdict and message
+            return numeric_error(value, name, min_val, max_val)
+    elif kind == 'boolean':
+        def check(value: str) -> Optional[str]:
+            if not value:
+                return required
+            return None if value in ('true', 'false') else boolean_error(value, name)
+    elif kind == 'pattern':
+        accept = re.compile(compiled['accept']).fullmatch
+        message = compiled['message']
+
+        def check(value: str) -> Optional[str]:
+            if not value:
+                return required
+            return None if accept(value) else message.format(value=value)
+    else:
+        def check(value: str) -> Optional[str]:
+            return None if value else required
+    return check, None
+
+def build_parse(compiled: Dict[str, Any]) -> Callable[[str], Any]:
+    """Closure turning a non-empty value into what a record holds: the int, bool or interned
+    string it stands for when its check passes, else the string itself for the check to report"""
+    kind = compiled['kind']
+
+    if kind == 'enum':
+        interned = {value: value for value in map(sys.intern, compiled['values'])}
+        return lambda value: interned.get(value, value)
+
+    if kind == 'range':
+        accept = plain_number(compiled['max'])
+        min_val, max_val = compiled['min'], compiled['max']
+
+        def parse(value: str) -> Any:
+            if accept(value) and min_val <= int(value) <= max_val:
+                return int(value)
+            return value
+        return parse
+
+    if kind == 'boolean':
+        def parse(value: str) -> Any:
+            # boolean_error accepts any case, so the record does too
+            lowered = value.lower()
+            return lowered == 'true' if lowered in BOOLEAN_VALUES else value
+        return parse
+
+    return lambda value: value
+
+class Field:
+    """One compiled column (or Configuration) check"""
+
+    def __init__(self, compiled: Dict[str, Any]):
+        self.name = compiled['field']
+        self.column = compiled['column']
+        self.lower = compiled['lower']
+        self.numbered = compiled['numbered']
+        self.repeated = compiled['repeated']
+        self.default = compiled['default']
+        self.values = frozenset(compiled.get('values', ()))
+        self.check, self.warn = build_check(compiled)
+        self.parse = build_parse(compiled)
+        self.parsed_default = self.parse(self.default) if self.default is not None else ''
+
+    def read(self, row: Dict[str, str]) -> str:
+        """The row's value as this field compares it"""
+        value = row.get(self.column, '').strip()
+        return value.lower() if self.lower else value
+
+    def normalize(self, row: Dict[str, str]) -> Any:
+        """The row's value as a record holds it; an empty value is the default, or '' without one"""
+        value = self.read(row)
+        return self.parse(value) if value else self.parsed_default
+
+class Dialect:
+    """Compiled checks of one BOM dialect"""
+
+    def __init__(self, name: str, compiled: Dict[str, Any]):
+        self.name = name
+        self.required_columns = compiled['required_columns']
+        self.comment_prefix = compiled['comment_prefix']
+        self.key_column = compiled['key_column']
+        self.value_column = compiled['value_column']
+        self.discriminator = Field(compiled['discriminator'])
+        self.columns = [Field(field) for field in compiled['columns']]
+        # Per resource type, fields in the order their messages are reported
+        self.rules: Dict[str, List[Field]] = {
+            resource_type: [Field(field) for field in fields]
+            for resource_type, fields in compiled['fields'].items()
+        }
+        self.fields: Dict[str, Dict[str, Field]] = {
+            resource_type: {field.name: field for field in fields}
+            for resource_type, fields in self.rules.items()
+        }
+
+    def values(self, resource_type: str, field: str) -> frozenset:
+        """Valid values of an enum field"""
+        return self.fields[resource_type][field].values
+
+class CompiledSchema:
+    def __init__(self, compiled: Dict[str, Any], path: Optional[str] = None):
+        self.path = path
+        self.sha256 = compiled['schema_sha256']
+        # Dialects are built (and their regexes compiled) only when a BOM uses them
+        self.compiled_dialects = compiled['dialects']
+        self.dialects: Dict[str, Dialect] = {}
+
+    def dialect(self, name: str) -> Dialect:
+        dialect = self.dialects.get(name)
+        if dialect is None:
+            if name not in self.compiled_dialects:
+                raise SchemaError(f"schema has no '{name}' dialect")
+            dialect = self.dialects[name] = Dialect(name, self.compiled_dialects[name])
+        return dialect
+
+    def detect(self, bom_file: str, default: str = 'customer') -> Dialect:
+        """Dialect whose required columns the BOM's header has, else the default"""
+        try:
+            with open(bom_file, 'r', newline='', encoding='utf-8-sig') as file:
+                header = [column.strip() for column in file.readline().rstrip('\r\n').split(',')]
+        except (OSError, UnicodeDecodeError):
+            return self.dialect(default)
+        columns = set(header)
+        name = next((name for name, dialect in self.compiled_dialects.items() if set(dialect['required_columns']) <= columns), default)
+        return self.dialect(name)
+
+def compiled_path(cache_dir: str, sha256: str) -> str:
+    # A subdirectory, so BOMCache.evict_stale never mistakes it for a BOM entry
+    return os.path.join(cache_dir, 'schema', f"{sha256[:24]}.marshal")
+
+def index_path(cache_dir: str) -> str:
+    return os.path.join(cache_dir, 'schema', 'index.marshal')
+
+def read_marshal(path: str) -> Any:
+    """A cache file's contents, or None if it is missing or unreadable"""
+    try:
+        # One read: marshal.load on a file object reads it a few bytes at a time
+        with open(path, 'rb') as f:
+            return marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+def write_marshal(path: str, value: Any) -> None:
+    """Atomically replace a cache file; a cache that cannot be written is skipped"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(marshal.dumps(value))
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+def load_compiled(schema_file: str, cache_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Compiled form of a schema file, from the cache when its hash matches
+
+    Marshal rather than JSON: it is built in, so a cache hit imports neither json nor hashlib.
+    """
+    cache_dir = cache_dir or DEFAULT_CACHE_DIR
+    path = os.path.abspath(schema_file)
+    stat = os.stat(path)
+    key = (stat.st_size, stat.st_mtime_ns)
+
+    # Size and mtime unchanged since the file was last hashed: its hash is known
+    index = read_marshal(index_path(cache_dir))
+    if not isinstance(index, dict):
+        index = {}
+    known = index.get(path)
+    if known and tuple(known[:2]) == key:
+        compiled = read_marshal(compiled_path(cache_dir, known[2]))
+        if isinstance(compiled, dict) and compiled.get('format') == SCHEMA_FORMAT and compiled.get('schema_sha256') == known[2]:
+            return compiled
+
+    import hashlib
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    sha256 = hashlib.sha256(data).hexdigest()
+
+    compiled = read_marshal(compiled_path(cache_dir, sha256))
+    if not (isinstance(compiled, dict) and compiled.get('format') == SCHEMA_FORMAT and compiled.get('schema_sha256') == sha256):
+        import json
+
+        try:
+            document = json.loads(data.decode('utf-8'))
+        except ValueError as e:
+            raise SchemaError(f"{schema_file} is not valid JSON: {e}")
+        compiled = compile_schema(document, sha256)
+        write_marshal(compiled_path(cache_dir, sha256), compiled)
+
+    index[path] = (stat.st_size, stat.st_mtime_ns, sha256)
+    write_marshal(index_path(cache_dir), index)
+    return compiled
+
+_LOADED: Dict[str, Tuple[Tuple[int, int], CompiledSchema]] = {}
+
+def load_schema(schema_file: Optional[str] = None, cache_dir: Optional[str] = None) -> CompiledSchema:
+    """Compiled schema for --schema-file, $BOM_SCHEMA_FILE or bom/schema.json, once per process
+    while the file is unchanged"""
+    path = os.path.abspath(schema_file or os.environ.get(SCHEMA_ENV) or DEFAULT_SCHEMA_FILE)
+    stat = os.stat(path)
+    key = (stat.st_size, stat.st_mtime_ns)
+
+    loaded = _LOADED.get(path)
+    if loaded and loaded[0] == key:
+        return loaded[1]
+
+    schema = CompiledSchema(load_compiled(path, cache_dir), path)
+    _LOADED[path] = (key, schema)
+    return schema
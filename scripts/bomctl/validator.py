@@ -0,0 +1,407 @@
+"""
+BOM Validator - Validates the customer BOM CSV file structure and content
+Ensures all required fields are present and values are valid
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, List, Sequence, Set, Optional, Tuple
+
+    from bomctl.cache import BOMCache
+    from bomctl.records import Record, RecordBuilder
+    from bomctl.schema import Field
+
+BOOLEAN_VALUES = frozenset({'true', 'false'})
+
+def check_vpc_cidr(cidr: str, min_prefix: int = 16, max_prefix: int = 28, label: str = 'VPC CIDR') -> Tuple[List[str], Optional[str]]:
+    """Warnings and the error (or None) for a non-empty CIDR"""
+    import ipaddress
+    
+    warnings = []
+    try:
+        network = ipaddress.IPv4Network(cidr, strict=False)
+        
+        # Check if it's a valid private network
+        if not network.is_private:
+            warnings.append(f"{label} {cidr} is not a private network")
+        
+        # Check prefix length (should be between /16 and /28)
+        if network.prefixlen < min_prefix or network.prefixlen > max_prefix:
+            return warnings, f"{label} {cidr} prefix length should be between /{min_prefix} and /{max_prefix}"
+        
+        return warnings, None
+        
+    except ValueError:
+        return warnings, f"Invalid {label} format: {cidr}"
+
+def option_error(value: str, label: str, options: str) -> str:
+    """Message for a value outside a set of valid options"""
+    return f"Invalid {label} '{value}'. Valid options: {options}"
+
+def numeric_error(value: str, field_name: str, min_val: int, max_val: int) -> Optional[str]:
+    """Message for an optional numeric field that is not a number or out of range, else None"""
+    if not value:
+        return None  # Optional field
+    
+    try:
+        num_val = int(value)
+        if num_val < min_val or num_val > max_val:
+            return f"{field_name} must be between {min_val} and {max_val}, got {num_val}"
+        return None
+    except ValueError:
+        return f"{field_name} must be a number, got '{value}'"
+
+def boolean_error(value: str, field_name: str) -> Optional[str]:
+    """Message for an optional boolean field that is not 'true' or 'false', else None"""
+    if value and value.lower() not in BOOLEAN_VALUES:
+        return f"{field_name} must be 'true' or 'false', got '{value}'"
+    return None
+
+class BOMValidator:
+    # Schema dialect whose compiled fields check the rows
+    dialect_name = 'customer'
+    
+    def __init__(self, bom_file: str = 'bom/customer-bom.csv', cache: Optional['BOMCache'] = None,
+                 schema_file: Optional[str] = None):
+        from bomctl.schema import load_schema
+        
+        self.bom_file = bom_file
+        self.cache = cache
+        self.bom_data = []
+        self.records: List[Optional['Record']] = []
+        self.errors = []
+        self.warnings = []
+        
+        # Valid values, ranges and required columns come from the compiled BOM schema
+        self.schema = load_schema(schema_file, cache.cache_dir if cache else None)
+        self.dialect = self.schema.dialect(self.dialect_name)
+        self.required_columns = set(self.dialect.required_columns)
+        self._builder = None
+    
+    @property
+    def builder(self) -> 'RecordBuilder':
+        """Row normalizer for the dialect, built on first use"""
+        if self._builder is None:
+            from bomctl.records import RecordBuilder
+            
+            self._builder = RecordBuilder(self.dialect)
+        return self._builder
+    
+    def load_bom(self) -> bool:
+        """Load and parse BOM CSV file"""
+        import csv
+        
+        try:
+            with open(self.bom_file, 'r', newline='', encoding='utf-8') as file:
+                reader = csv.DictReader(file)
+                self.bom_data = list(reader)
+                
+            if not self.bom_data:
+                self.errors.append("BOM file is empty")
+                return False
+            
+            # None for rows of unknown resource type, which validate_row reports
+            build = self.builder.build
+            self.records = [build(row, i) for i, row in enumerate(self.bom_data, 1)]
+                
+            print(f"Loaded {len(self.bom_data)} rows from BOM")
+            return True
+            
+        except FileNotFoundError:
+            self.errors.append(f"BOM file not found: {self.bom_file}")
+            return False
+        except Exception as e:
+            self.errors.append(f"Failed to load BOM file: {e}")
+            return False
+    
+    def validate_columns(self) -> bool:
+        """Validate that all required columns are present"""
+        if not self.bom_data:
+            return False
+        
+        actual_columns = set(self.bom_data[0].keys())
+        missing_columns = self.required_columns - actual_columns
+        
+        if missing_columns:
+            self.errors.append(f"Missing required columns: {', '.join(missing_columns)}")
+            return False
+        
+        return True
+    
+    def validate_fields(self, row: Dict[str, str], row_num: int, fields: Sequence['Field']) -> bool:
+        """Apply compiled field checks to a row, in order"""
+        valid = True
+        
+        for field in fields:
+            value = row.get(field.column, '').strip()
+            if field.lower:
+                value = value.lower()
+            
+            if field.warn and value:
+                self.warnings.extend(field.warn(value))
+            
+            message = field.check(value)
+            if message:
+                self.errors.append(f"Row {row_num}: {message}" if field.numbered else message)
+                valid = False
+        
+        return valid
+    
+    def validate_record(self, record: 'Record') -> bool:
+        """Apply compiled field checks to a record, in order
+        
+        Ints and bools were parsed only after passing their check, so just the strings are checked.
+        """
+        valid = True
+        
+        for field in self.dialect.rules[record.kind]:
+            value = getattr(record, field.name)
+            if value.__class__ is not str:
+                continue
+            
+            if field.warn and value:
+                self.warnings.extend(field.warn(value))
+            
+            message = field.check(value)
+            if message:
+                self.errors.append(f"Row {record.row_num}: {message}" if field.numbered else message)
+                valid = False
+        
+        return valid
+    
+    def validate_network_row(self, row: Dict[str, str], row_num: int) -> bool:
+        """Validate network configuration row"""
+        return self.validate_record(self.builder.build(row, row_num))
+    
+    def validate_service_row(self, row: Dict[str, str], row_num: int) -> bool:
+        """Validate service configuration row"""
+        return self.validate_record(self.builder.build(row, row_num))
+    
+    def validate_dependencies(self) -> bool:
+        """Validate service dependencies"""
+        valid = True
+        network_exists = False
+        service_names = set()
+        
+        # Check if network foundation exists
+        for record in self.records:
+            if record is not None and record.kind == 'network':
+                network_exists = True
+                break
+        
+        # Validate service dependencies
+        for record in self.records:
+            if record is not None and record.kind == 'service':
+                i = record.row_num
+                dependency = record.dependency
+                
+                # Check for duplicate service names + instance IDs
+                service_key = f"{record.service_name}-{record.instance_id}"
+                if service_key in service_names:
+                    self.errors.append(f"Row {i}: Duplicate service name and instance ID combination: {service_key}")
+                    valid = False
+                else:
+                    service_names.add(service_key)
+                
+                # Check dependency
+                if dependency == 'network-foundation' and not network_exists:
+                    self.errors.append(f"Row {i}: Service depends on network-foundation but no network configuration found")
+                    valid = False
+                elif dependency and dependency != 'network-foundation':
+                    self.warnings.append(f"Row {i}: Unsupported dependency '{dependency}'. Only 'network-foundation' is supported")
+        
+        return valid
+    
+    def validate_row(self, row: Dict[str, str], row_num: int) -> bool:
+        """Validate a single row's data"""
+        discriminator = self.dialect.discriminator
+        resource_type = discriminator.read(row)
+        
+        # Validate resource type
+        message = discriminator.check(resource_type)
+        if message:
+            self.errors.append(f"Row {row_num}: {message}")
+            return False
+        
+        # Validate based on resource type
+        return self.validate_record(self.builder.build(row, row_num))
+    
+    def validate_row_data(self) -> bool:
+        """Validate each row's data"""
+        valid = True
+        
+        for i, (row, record) in enumerate(zip(self.bom_data, self.records), 1):
+            if not (self.validate_record(record) if record is not None else self.validate_row(row, i)):
+                valid = False
+        
+        return valid
+    
+    def load_cached_results(self) -> Optional[bool]:
+        """Restore errors and warnings from the cache; returns the cached result or None on a miss"""
+        if not self.cache:
+            return None
+        
+        start = time.perf_counter()
+        cached = self.cache.load_validation(self.bom_file)
+        # Results checked against another schema (or dialect) no longer apply
+        if cached is None or cached.get('schema') != self.schema.sha256 or cached.get('dialect') != self.dialect_name:
+            return None
+        
+        self.errors = list(cached['errors'])
+        self.warnings = list(cached['warnings'])
+        print(f"Loaded validation results from cache ({(time.perf_counter() - start) * 1000:.1f} ms)")
+        return cached['valid']
+    
+    def store_results(self, valid: bool, start: float) -> None:
+        """Cache the validation result for an unchanged BOM"""
+        if not self.cache or not os.path.isfile(self.bom_file):
+            return
+        
+        self.cache.store(self.bom_file, validation={
+            'valid': valid, 'errors': self.errors, 'warnings': self.warnings,
+            'schema': self.schema.sha256, 'dialect': self.dialect_name
+        })
+        print(f"Validated BOM (cache miss, {(time.perf_counter() - start) * 1000:.1f} ms)")
+    
+    def validate(self) -> bool:
+        """Run all validations"""
+        print("Validating BOM file...")
+        
+        cached = self.load_cached_results()
+        if cached is not None:
+            return cached
+        
+        start = time.perf_counter()
+        valid = self._validate()
+        self.store_results(valid, start)
+        return valid
+    
+    def _validate(self) -> bool:
+        # Load BOM file
+        if not self.load_bom():
+            return False
+        
+        # Validate structure
+        if not self.validate_columns():
+            return False
+        
+        # Validate data
+        data_valid = self.validate_row_data()
+        deps_valid = self.validate_dependencies()
+        
+        return data_valid and deps_valid
+    
+    def validate_streaming(self) -> bool:
+        """Run all validations in a single pass without holding the BOM in memory
+        
+        Row checks run as each row is read. Dependency checks only keep the set of
+        service keys, whether a network row has been seen, and references to
+        network-foundation made before it was seen. Errors and warnings match
+        validate() exactly, including order and row numbers.
+        """
+        print("Validating BOM file (streaming)...")
+        
+        cached = self.load_cached_results()
+        if cached is not None:
+            return cached
+        
+        start = time.perf_counter()
+        valid = self._validate_streaming()
+        self.store_results(valid, start)
+        return valid
+    
+    def _validate_streaming(self) -> bool:
+        data_valid = True
+        deps_valid = True
+        network_exists = False
+        service_keys: Set[str] = set()
+        
+        # Dependency findings are reported after all row findings, as in validate()
+        dep_errors: List[Optional[str]] = []
+        dep_warnings: List[str] = []
+        pending_network_refs: List[Tuple[int, int]] = []
+        row_count = 0
+        
+        import csv
+        
+        try:
+            with open(self.bom_file, 'r', newline='', encoding='utf-8') as file:
+                reader = csv.DictReader(file)
+                
+                for i, row in enumerate(reader, 1):
+                    if i == 1:
+                        missing_columns = self.required_columns - set(row.keys())
+                        if missing_columns:
+                            self.errors.append(f"Missing required columns: {', '.join(missing_columns)}")
+                            return False
+                    row_count = i
+                    
+                    if not self.validate_row(row, i):
+                        data_valid = False
+                    
+                    resource_type = row.get('resource_type', '').strip().lower()
+                    if resource_type == 'network':
+                        network_exists = True
+                    elif resource_type == 'service':
+                        service_key = f"{row.get('service_name', '').strip()}-{row.get('instance_id', '').strip()}"
+                        if service_key in service_keys:
+                            dep_errors.append(f"Row {i}: Duplicate service name and instance ID combination: {service_key}")
+                            deps_valid = False
+                        else:
+                            service_keys.add(service_key)
+                        
+                        dependency = row.get('dependency', '').strip()
+                        if dependency == 'network-foundation' and not network_exists:
+                            # A network row may still follow; resolve once the file is read
+                            pending_network_refs.append((len(dep_errors), i))
+                            dep_errors.append(None)
+                        elif dependency and dependency != 'network-foundation':
+                            dep_warnings.append(f"Row {i}: Unsupported dependency '{dependency}'. Only 'network-foundation' is supported")
+        
+        except FileNotFoundError:
+            self.errors.append(f"BOM file not found: {self.bom_file}")
+            return False
+        except Exception as e:
+            self.errors.append(f"Failed to load BOM file: {e}")
+            return False
+        
+        if row_count == 0:
+            self.errors.append("BOM file is empty")
+            return False
+        
+        print(f"Loaded {row_count} rows from BOM")
+        
+        if not network_exists:
+            for index, row_num in pending_network_refs:
+                dep_errors[index] = f"Row {row_num}: Service depends on network-foundation but no network configuration found"
+            if pending_network_refs:
+                deps_valid = False
+        
+        self.errors.extend(error for error in dep_errors if error is not None)
+        self.warnings.extend(dep_warnings)
+        
+        return data_valid and deps_valid
+    
+    def print_results(self) -> None:
+        """Print validation results"""
+        if self.errors:
+            print("\n❌ VALIDATION ERRORS:")
+            for error in self.errors:
+                print(f"  - {error}")
+        
+        if self.warnings:
+            print("\n⚠️  VALIDATION WARNINGS:")
+            for warning in self.warnings:
+                print(f"  - {warning}")
+        
+        if not self.errors and not self.warnings:
+            print("\n✅ BOM validation passed - no issues found")
+        elif not self.errors:
+            print(f"\n✅ BOM validation passed - {len(self.warnings)} warnings")
+        else:
+            print(f"\n❌ BOM validation failed - {len(self.errors)} errors, {len(self.warnings)} warnings")
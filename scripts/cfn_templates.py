@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+CloudFormation Template Index - Parses templates, including short-form intrinsic function tags,
+into a summary of their Parameters, Outputs/Exports and Fn::ImportValue references
+Summaries are cached in memory and on disk keyed by the template's content hash
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from typing import Dict, List, Any, Optional
+
+SUMMARY_FORMAT = 1
+
+# Directories holding deployable templates (bootstrap/ is applied by hand)
+TEMPLATE_DIRS = ['foundation', 'network', 'security', 'compute', 'database', 'loadbalancer', 'services']
+
+# Parameter properties that constrain values; descriptions and labels are not kept
+PARAMETER_KEYS = ['Type', 'Default', 'AllowedValues', 'AllowedPattern', 'MinValue', 'MaxValue', 'MinLength', 'MaxLength', 'NoEcho']
+
+SUB_VARIABLE = re.compile(r'\$\{([^}!]+)\}')
+
+_loader_class = None
+
+def template_loader():
+    """YAML loader that turns !Ref, !Sub, !GetAtt, ... into their long-form dicts"""
+    global _loader_class
+    if _loader_class is None:
+        import yaml
+
+        # libyaml's loader is several times faster when PyYAML was built with it
+        base = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+        class CloudFormationLoader(base):
+            pass
+
+        def construct_intrinsic(loader, suffix, node):
+            if isinstance(node, yaml.ScalarNode):
+                value = loader.construct_scalar(node)
+            elif isinstance(node, yaml.SequenceNode):
+                value = loader.construct_sequence(node, deep=True)
+            else:
+                value = loader.construct_mapping(node, deep=True)
+
+            if suffix in ('Ref', 'Condition'):
+                return {suffix: value}
+            if suffix == 'GetAtt' and isinstance(value, str):
+                value = value.split('.', 1)
+            return {f"Fn::{suffix}": value}
+
+        CloudFormationLoader.add_multi_constructor('!', construct_intrinsic)
+        _loader_class = CloudFormationLoader
+    return _loader_class
+
+def load_template(source) -> Dict[str, Any]:
+    """Parse a template from text or bytes"""
+    import yaml
+    return yaml.load(source, Loader=template_loader()) or {}
+
+def name_pattern(value: Any) -> Optional[str]:
+    """Render an export or import name as a ${...} pattern, or None if it is not static
+
+    'a-${X}', {'Fn::Sub': 'a-${X}'}, {'Fn::Sub': ['a-${V}', {'V': {'Ref': 'X'}}]},
+    {'Fn::Join': ['-', ['a', {'Ref': 'X'}]]} and {'Ref': 'X'} all resolve.
+    """
+    if isinstance(value, str):
+        return value
+    if not isinstance(value, dict) or len(value) != 1:
+        return None
+
+    function, argument = next(iter(value.items()))
+    if function == 'Ref' and isinstance(argument, str):
+        return f"${{{argument}}}"
+    if function == 'Fn::Sub':
+        if isinstance(argument, str):
+            return argument
+        if isinstance(argument, list) and len(argument) == 2 and isinstance(argument[0], str):
+            variables = {name: name_pattern(variable) for name, variable in (argument[1] or {}).items()}
+            if any(pattern is None for pattern in variables.values()):
+                return None
+            return SUB_VARIABLE.sub(lambda match: variables.get(match.group(1), match.group(0)), argument[0])
+    if function == 'Fn::Join' and isinstance(argument, list) and len(argument) == 2:
+        delimiter, parts = argument
+        patterns = [name_pattern(part) for part in parts] if isinstance(parts, list) else [None]
+        if isinstance(delimiter, str) and all(pattern is not None for pattern in patterns):
+            return delimiter.join(patterns)
+    return None
+
+def find_imports(node: Any, found: List[Any]) -> None:
+    """Collect the argument of every Fn::ImportValue under node"""
+    if isinstance(node, dict):
+        if len(node) == 1 and 'Fn::ImportValue' in node:
+            found.append(node['Fn::ImportValue'])
+            return
+        for child in node.values():
+            find_imports(child, found)
+    elif isinstance(node, list):
+        for child in node:
+            find_imports(child, found)
+
+def summarize(template: Dict[str, Any]) -> Dict[str, Any]:
+    """Parameters, outputs, export names and import names of a parsed template"""
+    parameters = {}
+    for name, spec in (template.get('Parameters') or {}).items():
+        spec = spec or {}
+        parameters[name] = {key: spec[key] for key in PARAMETER_KEYS if key in spec}
+
+    outputs = template.get('Outputs') or {}
+    exports = {}
+    for name, output in outputs.items():
+        export = (output or {}).get('Export')
+        if export and 'Name' in export:
+            exports[name] = name_pattern(export['Name'])
+
+    imports = []
+    for section in ('Resources', 'Outputs', 'Conditions'):
+        find_imports(template.get(section) or {}, imports)
+    import_names = [name_pattern(value) for value in imports]
+
+    return {
+        'parameters': parameters,
+        'outputs': sorted(outputs),
+        'exports': exports,
+        'imports': sorted(set(name for name in import_names if name is not None)),
+        'dynamic_imports': sum(1 for name in import_names if name is None)
+    }
+
+def discover_templates(root: str = '.', template_dirs: Optional[List[str]] = None) -> List[str]:
+    """Relative paths of the .yml/.yaml templates in the deployable template directories"""
+    templates = []
+    for directory in template_dirs or TEMPLATE_DIRS:
+        path = os.path.join(root, directory)
+        if not os.path.isdir(path):
+            continue
+        for filename in sorted(os.listdir(path)):
+            if filename.endswith(('.yml', '.yaml')):
+                templates.append(os.path.join(directory, filename))
+    return templates
+
+class TemplateCache:
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir
+        self.memory: Dict[str, Dict[str, Any]] = {}
+        self.stats = {'memory': 0, 'disk': 0, 'parsed': 0}
+
+    def _entry_path(self, sha256: str) -> str:
+        return os.path.join(self.cache_dir, f"{sha256}.json")
+
+    def _read_entry(self, sha256: str) -> Optional[Dict[str, Any]]:
+        """Summary stored on disk for this content hash, or None"""
+        try:
+            with open(self._entry_path(sha256), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('format') != SUMMARY_FORMAT:
+            return None
+        return entry['summary']
+
+    def _write_entry(self, sha256: str, summary: Dict[str, Any]) -> None:
+        """Atomically write a summary"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry_path = self._entry_path(sha256)
+        tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'format': SUMMARY_FORMAT, 'summary': summary}, f, separators=(',', ':'))
+        os.replace(tmp_path, entry_path)
+
+    def summary(self, template_file: str) -> Dict[str, Any]:
+        """Summary of a template file, parsing it only if its content has not been seen before"""
+        with open(template_file, 'rb') as f:
+            data = f.read()
+        sha256 = hashlib.sha256(data).hexdigest()
+
+        summary = self.memory.get(sha256)
+        if summary is not None:
+            self.stats['memory'] += 1
+            return summary
+
+        summary = self._read_entry(sha256) if self.cache_dir else None
+        if summary is not None:
+            self.stats['disk'] += 1
+        else:
+            summary = summarize(load_template(data))
+            self.stats['parsed'] += 1
+            if self.cache_dir:
+                self._write_entry(sha256, summary)
+
+        self.memory[sha256] = summary
+        return summary
+
+    def summaries(self, template_files: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Summaries for several templates, keyed by path"""
+        return {template_file: self.summary(template_file) for template_file in template_files}
+
+def default_cache_dir() -> str:
+    return os.environ.get('TEMPLATE_CACHE_DIR', '.template-cache')
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarize CloudFormation template parameters, exports and imports')
+    parser.add_argument('templates', nargs='*', help='Template files (default: all deployable templates)')
+    parser.add_argument('--cache-dir', default=default_cache_dir(), help='Summary cache directory (default: $TEMPLATE_CACHE_DIR or .template-cache)')
+    parser.add_argument('--no-cache', action='store_true', help='Always parse the templates')
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    cache = TemplateCache(None if args.no_cache else args.cache_dir)
+    try:
+        summaries = cache.summaries(args.templates or discover_templates())
+    except Exception as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    json.dump(summaries, sys.stdout, indent=2)
+    print(f"\nSummarized {len(summaries)} templates in {(time.perf_counter() - start) * 1000:.1f} ms "
+          f"({cache.stats['parsed']} parsed, {cache.stats['disk']} from cache)", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,609 @@
+#!/usr/bin/env python3
+"""
+Changeset Preview - Predicts, without calling AWS, which resources a stack update modifies in
+place and which it replaces
+Templates are rendered with the old and new parameters and diffed property by property; each
+changed property is looked up in a table of CloudFormation update behaviours. Replacements then
+propagate to whatever references the replaced resource, within a stack and through its exports
+"""
+
+import argparse
+import ipaddress
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+from cfn_templates import load_template
+from param_contract import load_parameter_file, parameter_string
+
+MANIFEST_FILE = 'bom-manifest.json'
+NETWORK_TEMPLATE = 'network/network-foundation.yml'
+SERVICE_TEMPLATE_DIR = 'services'
+
+# Update behaviours, least disruptive first; 'conditional' means the change may replace the resource
+LEVELS = ['none', 'no-interruption', 'some-interruptions', 'conditional', 'replacement']
+RANK = {level: rank for rank, level in enumerate(LEVELS)}
+
+# Per resource type, the properties whose update interrupts or replaces the resource (CloudFormation's
+# "Update requires"); any other property updates without interruption. 'name' is the property giving
+# the resource a custom name, which CloudFormation cannot replace without a new one
+REPLACEMENT_TABLE: Dict[str, Dict[str, Any]] = {
+    'AWS::EC2::VPC': {
+        'replacement': ['CidrBlock', 'Ipv4IpamPoolId', 'Ipv4NetmaskLength'],
+        'conditional': ['InstanceTenancy']
+    },
+    'AWS::EC2::Subnet': {
+        'replacement': ['AvailabilityZone', 'AvailabilityZoneId', 'CidrBlock', 'Ipv4IpamPoolId', 'Ipv4NetmaskLength',
+                        'OutpostArn', 'VpcId']
+    },
+    'AWS::EC2::SecurityGroup': {
+        'replacement': ['GroupDescription', 'GroupName', 'VpcId'],
+        'name': 'GroupName'
+    },
+    'AWS::EC2::LaunchTemplate': {
+        # LaunchTemplateData changes add a version; instances pick it up when next launched
+        'replacement': ['LaunchTemplateName'],
+        'name': 'LaunchTemplateName'
+    },
+    'AWS::AutoScaling::AutoScalingGroup': {
+        'replacement': ['AutoScalingGroupName', 'InstanceId'],
+        'some-interruptions': ['VPCZoneIdentifier', 'AvailabilityZones'],
+        'name': 'AutoScalingGroupName'
+    },
+    'AWS::EC2::Instance': {
+        'replacement': ['AvailabilityZone', 'ImageId', 'KeyName', 'LaunchTemplate', 'NetworkInterfaces',
+                        'PrivateIpAddress', 'SecurityGroups', 'SubnetId'],
+        'some-interruptions': ['EbsOptimized', 'InstanceType', 'UserData'],
+        'conditional': ['BlockDeviceMappings', 'Tenancy']
+    },
+    'AWS::RDS::DBInstance': {
+        'replacement': ['AvailabilityZone', 'CharacterSetName', 'DBClusterIdentifier', 'DBInstanceIdentifier', 'DBName',
+                        'DBSnapshotIdentifier', 'DBSubnetGroupName', 'KmsKeyId', 'MasterUsername', 'Port',
+                        'SourceDBInstanceIdentifier', 'StorageEncrypted', 'Timezone'],
+        'some-interruptions': ['DBInstanceClass', 'DBParameterGroupName', 'EngineVersion', 'StorageType'],
+        'conditional': ['BackupRetentionPeriod', 'Engine'],
+        'name': 'DBInstanceIdentifier'
+    },
+    'AWS::RDS::DBSubnetGroup': {
+        'replacement': ['DBSubnetGroupName'],
+        'name': 'DBSubnetGroupName'
+    },
+    'AWS::RDS::DBParameterGroup': {
+        # Static parameters only apply after a reboot
+        'replacement': ['DBParameterGroupName', 'Description', 'Family'],
+        'some-interruptions': ['Parameters'],
+        'name': 'DBParameterGroupName'
+    },
+    'AWS::ElasticLoadBalancingV2::LoadBalancer': {
+        'replacement': ['Name', 'Scheme', 'Type'],
+        'name': 'Name'
+    },
+    'AWS::ElasticLoadBalancingV2::TargetGroup': {
+        'replacement': ['IpAddressType', 'Name', 'Port', 'Protocol', 'ProtocolVersion', 'TargetType', 'VpcId'],
+        'name': 'Name'
+    },
+    'AWS::ElasticLoadBalancingV2::Listener': {
+        'replacement': ['LoadBalancerArn']
+    },
+    'AWS::EC2::InternetGateway': {},
+    'AWS::EC2::VPCGatewayAttachment': {},
+    'AWS::EC2::NatGateway': {
+        'replacement': ['AllocationId', 'ConnectivityType', 'PrivateIpAddress', 'SubnetId']
+    },
+    'AWS::EC2::EIP': {
+        'replacement': ['Domain', 'NetworkBorderGroup', 'PublicIpv4Pool', 'TransferAddress']
+    },
+    'AWS::EC2::RouteTable': {
+        'replacement': ['VpcId']
+    },
+    'AWS::EC2::Route': {
+        'replacement': ['DestinationCidrBlock', 'DestinationIpv6CidrBlock', 'DestinationPrefixListId', 'RouteTableId']
+    },
+    'AWS::EC2::SubnetRouteTableAssociation': {
+        'replacement': ['SubnetId']
+    },
+    'AWS::EC2::FlowLog': {
+        'replacement': ['DeliverLogsPermissionArn', 'DestinationOptions', 'LogDestination', 'LogDestinationType',
+                        'LogFormat', 'LogGroupName', 'MaxAggregationInterval', 'ResourceId', 'ResourceType', 'TrafficType']
+    },
+    'AWS::EC2::KeyPair': {
+        'replacement': ['KeyFormat', 'KeyName', 'KeyType', 'PublicKeyMaterial', 'Tags'],
+        'name': 'KeyName'
+    },
+    'AWS::IAM::Role': {
+        'replacement': ['Path', 'RoleName'],
+        'name': 'RoleName'
+    },
+    'AWS::IAM::InstanceProfile': {
+        'replacement': ['InstanceProfileName', 'Path'],
+        'name': 'InstanceProfileName'
+    },
+    'AWS::IAM::OIDCIdentityProvider': {
+        'replacement': ['Url']
+    },
+    'AWS::Logs::LogGroup': {
+        'replacement': ['LogGroupName'],
+        'name': 'LogGroupName'
+    },
+    'AWS::S3::Bucket': {
+        'replacement': ['BucketName', 'ObjectLockEnabled'],
+        'name': 'BucketName'
+    }
+}
+
+# Attributes that change when the resource is updated in place (every attribute changes on replacement)
+UPDATED_ATTRIBUTES: Dict[str, Set[str]] = {
+    'AWS::EC2::LaunchTemplate': {'LatestVersionNumber', 'DefaultVersionNumber'}
+}
+
+SUB_REFERENCE = re.compile(r'\$\{(?!!)([A-Za-z0-9:]+)(?:\.([A-Za-z0-9.]+))?\}')
+
+# Fn::If branches and properties set to AWS::NoValue are dropped
+NO_VALUE = object()
+
+def property_level(resource_type: str, name: str) -> str:
+    """How CloudFormation updates one property of a resource type; unknown types may replace"""
+    behaviour = REPLACEMENT_TABLE.get(resource_type)
+    if behaviour is None:
+        return 'conditional'
+    for level in ('replacement', 'some-interruptions', 'conditional'):
+        if name in behaviour.get(level, ()):
+            return level
+    return 'no-interruption'
+
+class Renderer:
+    """Resolves a template's intrinsic functions for one parameter set
+
+    Parameters, conditions and Fn::Sub/Join/Select/Split/If/Cidr/FindInMap are evaluated. Resource
+    references, attributes, pseudo parameters and imports are unknown before deployment and stay
+    {'Ref': ...}, {'Fn::GetAtt': ...} or {'Fn::ImportValue': name} tokens; an import of an export
+    that the update changes is marked so it compares unequal.
+    """
+
+    def __init__(self, template: Dict[str, Any], parameters: Dict[str, str], changed_exports: Set[str] = frozenset()):
+        self.template = template
+        self.changed_exports = changed_exports
+        self.conditions: Dict[str, bool] = {}
+        self.parameters: Dict[str, Any] = {}
+
+        for name, spec in (template.get('Parameters') or {}).items():
+            spec = spec or {}
+            if name in parameters:
+                value = parameters[name]
+            elif 'Default' in spec:
+                value = parameter_string(spec['Default'])
+            else:
+                continue
+            list_type = spec.get('Type', 'String')
+            is_list = list_type == 'CommaDelimitedList' or list_type.startswith('List<')
+            self.parameters[name] = [item.strip() for item in value.split(',')] if is_list else value
+
+    def condition(self, name: Any) -> bool:
+        # network-foundation.yml gives some resources an !And of condition names as their Condition
+        if not isinstance(name, str):
+            return self.truth(self.resolve(name))
+        if name not in self.conditions:
+            self.conditions[name] = False  # a condition referring to itself is false
+            self.conditions[name] = bool(self.resolve((self.template.get('Conditions') or {}).get(name, False)))
+        return self.conditions[name]
+
+    def truth(self, value: Any) -> bool:
+        """A resolved condition operand; a bare string names a condition"""
+        if isinstance(value, str) and value in (self.template.get('Conditions') or {}):
+            return self.condition(value)
+        return bool(value)
+
+    def substitute(self, text: str, variables: Dict[str, Any]) -> Any:
+        """Fn::Sub with known values filled in; a token if anything is left unresolved"""
+        unresolved = False
+
+        def replace(match) -> str:
+            nonlocal unresolved
+            name = match.group(1) if match.group(2) is None else f"{match.group(1)}.{match.group(2)}"
+            value = variables.get(name, self.parameters.get(name) if match.group(2) is None else None)
+            if isinstance(value, str):
+                return value
+            unresolved = True
+            return match.group(0)
+
+        result = SUB_REFERENCE.sub(replace, text)
+        return {'Fn::Sub': result} if unresolved else result.replace('${!', '${')
+
+    def resolve(self, node: Any) -> Any:
+        if isinstance(node, list):
+            return [value for value in map(self.resolve, node) if value is not NO_VALUE]
+        if not isinstance(node, dict):
+            return node
+        function, argument = next(iter(node.items())) if len(node) == 1 else (None, None)
+        if function not in ('Ref', 'Condition') and not (function or '').startswith('Fn::'):
+            return {key: value for key, value in ((key, self.resolve(value)) for key, value in node.items()) if value is not NO_VALUE}
+
+        if function == 'Ref':
+            if argument == 'AWS::NoValue':
+                return NO_VALUE
+            return self.parameters.get(argument, node)
+        if function == 'Condition':
+            return self.condition(argument)
+        if function == 'Fn::If':
+            name, if_true, if_false = argument
+            return self.resolve(if_true if self.condition(name) else if_false)
+        if function == 'Fn::Equals':
+            left, right = self.resolve(argument)
+            return parameter_string(left) == parameter_string(right) if not isinstance(left, (dict, list)) else left == right
+        if function == 'Fn::Not':
+            return not self.truth(self.resolve(argument)[0])
+        if function == 'Fn::And':
+            return all(map(self.truth, self.resolve(argument)))
+        if function == 'Fn::Or':
+            return any(map(self.truth, self.resolve(argument)))
+
+        argument = self.resolve(argument)
+        if function == 'Fn::ImportValue':
+            if isinstance(argument, str) and argument in self.changed_exports:
+                return {'Fn::ImportValue': argument, 'Export': 'changed'}
+            return {'Fn::ImportValue': argument}
+        if function == 'Fn::Sub':
+            if isinstance(argument, str):
+                return self.substitute(argument, {})
+            text, variables = argument
+            return self.substitute(text, variables or {}) if isinstance(text, str) else {function: argument}
+        if function == 'Fn::Join':
+            delimiter, parts = argument
+            if isinstance(parts, list) and all(isinstance(part, str) for part in parts):
+                return delimiter.join(parts)
+        elif function == 'Fn::Select':
+            index, values = argument
+            if isinstance(values, list) and str(index).isdigit() and int(index) < len(values):
+                return values[int(index)]
+        elif function == 'Fn::Split':
+            delimiter, source = argument
+            if isinstance(source, str):
+                return source.split(delimiter)
+        elif function == 'Fn::Cidr':
+            block, count, bits = argument
+            if isinstance(block, str) and str(count).isdigit() and str(bits).isdigit():
+                try:
+                    network = ipaddress.ip_network(block, strict=False)
+                    subnets = network.subnets(new_prefix=network.max_prefixlen - int(bits))
+                    return [str(subnet) for subnet, _ in zip(subnets, range(int(count)))]
+                except ValueError:
+                    pass
+        elif function == 'Fn::FindInMap':
+            mappings = self.template.get('Mappings') or {}
+            try:
+                return mappings[argument[0]][argument[1]][argument[2]]
+            except (KeyError, TypeError):
+                pass
+        return {function: argument}
+
+    def render(self) -> Dict[str, Any]:
+        """The resources whose Condition holds, with resolved properties, and the outputs"""
+        resources = {}
+        for logical_id, resource in (self.template.get('Resources') or {}).items():
+            if 'Condition' in resource and not self.condition(resource['Condition']):
+                continue
+            resources[logical_id] = {
+                'Type': resource.get('Type'),
+                'Properties': self.resolve(resource.get('Properties') or {}),
+                'Retain': resource.get('UpdateReplacePolicy', resource.get('DeletionPolicy')) == 'Retain'
+            }
+
+        outputs = {}
+        for name, output in (self.template.get('Outputs') or {}).items():
+            if 'Condition' in output and not self.condition(output['Condition']):
+                continue
+            export = (output.get('Export') or {}).get('Name')
+            outputs[name] = {
+                'value': self.resolve(output.get('Value')),
+                'export': self.resolve(export) if export is not None else None
+            }
+        return {'resources': resources, 'outputs': outputs}
+
+def references(node: Any, found: Set[Tuple[str, Optional[str]]]) -> Set[Tuple[str, Optional[str]]]:
+    """(logical id, attribute or None for Ref) of every resource reference left in a rendered value"""
+    if isinstance(node, dict):
+        if len(node) == 1:
+            function, argument = next(iter(node.items()))
+            if function == 'Ref' and isinstance(argument, str):
+                found.add((argument, None))
+                return found
+            if function == 'Fn::GetAtt' and isinstance(argument, list) and len(argument) == 2:
+                found.add((argument[0], argument[1]))
+                return found
+            if function == 'Fn::Sub' and isinstance(argument, str):
+                for match in SUB_REFERENCE.finditer(argument):
+                    found.add((match.group(1), match.group(2)))
+                return found
+        for value in node.values():
+            references(value, found)
+    elif isinstance(node, list):
+        for value in node:
+            references(value, found)
+    return found
+
+def imports(node: Any, found: Set[str]) -> Set[str]:
+    """Export names imported by a rendered value"""
+    if isinstance(node, dict):
+        if 'Fn::ImportValue' in node and isinstance(node['Fn::ImportValue'], str):
+            found.add(node['Fn::ImportValue'])
+            return found
+        for value in node.values():
+            imports(value, found)
+    elif isinstance(node, list):
+        for value in node:
+            imports(value, found)
+    return found
+
+def changed_parameters(old_params: Optional[Dict[str, str]], new_params: Optional[Dict[str, str]]) -> List[str]:
+    """Names of the parameters whose value differs between two parameter files"""
+    if old_params is None or new_params is None:
+        return []
+    return sorted(name for name in old_params.keys() | new_params.keys() if old_params.get(name) != new_params.get(name))
+
+def preview_stack(old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Resource changes between two renderings of a stack, with replacements propagated"""
+    old_resources = old['resources'] if old else {}
+    new_resources = new['resources'] if new else {}
+    changes: Dict[str, Dict[str, Any]] = {}
+
+    def change(logical_id: str, resource: Dict[str, Any]) -> Dict[str, Any]:
+        if logical_id not in changes:
+            changes[logical_id] = {'logical_id': logical_id, 'type': resource['Type'], 'action': 'modify',
+                                   'level': 'none', 'properties': []}
+        return changes[logical_id]
+
+    def flag_property(logical_id: str, name: str, level: str, cause: Optional[str]) -> bool:
+        """Record a changed property; True if it made the resource's change more disruptive"""
+        entry = change(logical_id, new_resources[logical_id])
+        for prop in entry['properties']:
+            if prop['name'] == name:
+                if RANK[level] <= RANK[prop['level']]:
+                    return False
+                prop.update(level=level, cause=cause)
+                break
+        else:
+            entry['properties'].append({'name': name, 'level': level, 'cause': cause})
+        escalated = RANK[level] > RANK[entry['level']]
+        if escalated:
+            entry['level'] = level
+            entry['action'] = {'replacement': 'replace', 'conditional': 'conditional'}.get(level, 'modify')
+        return escalated
+
+    for logical_id in old_resources.keys() - new_resources.keys():
+        changes[logical_id] = {'logical_id': logical_id, 'type': old_resources[logical_id]['Type'], 'action': 'remove',
+                               'level': 'replacement', 'properties': []}
+    for logical_id, resource in new_resources.items():
+        previous = old_resources.get(logical_id)
+        if previous is None:
+            changes[logical_id] = {'logical_id': logical_id, 'type': resource['Type'], 'action': 'add',
+                                   'level': 'none', 'properties': []}
+        elif previous['Type'] != resource['Type']:
+            flag_property(logical_id, 'Type', 'replacement', None)
+        else:
+            old_props, new_props = previous['Properties'], resource['Properties']
+            for name in sorted(old_props.keys() | new_props.keys()):
+                if old_props.get(name) != new_props.get(name):
+                    flag_property(logical_id, name, property_level(resource['Type'], name), None)
+
+    # A replaced resource gets a new physical ID and attributes; an updated one may get new attributes
+    pending = [logical_id for logical_id, entry in changes.items() if entry['action'] in ('replace', 'conditional', 'modify')]
+    while pending:
+        source = pending.pop()
+        entry = changes[source]
+        for logical_id, resource in new_resources.items():
+            if logical_id == source or logical_id not in old_resources:
+                continue
+            for name, value in resource['Properties'].items():
+                for target, attribute in references(value, set()):
+                    if target != source:
+                        continue
+                    if entry['action'] == 'modify' and attribute not in UPDATED_ATTRIBUTES.get(entry['type'], ()):
+                        continue
+                    level = property_level(resource['Type'], name)
+                    if entry['action'] == 'conditional':
+                        level = min(level, 'conditional', key=RANK.get)
+                    reason = f"{source} is {'updated' if entry['action'] == 'modify' else 'replaced'}"
+                    if flag_property(logical_id, name, level, reason):
+                        pending.append(logical_id)
+
+    changed_exports = []
+    blockers = []
+    notes = []
+    if old and new:
+        for name, output in new['outputs'].items():
+            export = output['export']
+            previous = old['outputs'].get(name)
+            if not isinstance(export, str) or previous is None:
+                continue
+            moved = any(changes.get(target, {}).get('action') in ('replace', 'conditional')
+                        or attribute in UPDATED_ATTRIBUTES.get(changes.get(target, {}).get('type'), ())
+                        for target, attribute in references(output['value'], set()))
+            if previous['value'] != output['value'] or moved:
+                changed_exports.append(export)
+
+    for entry in changes.values():
+        if entry['action'] != 'replace' or entry['logical_id'] not in old_resources:
+            continue
+        resource = new_resources[entry['logical_id']]
+        name_property = REPLACEMENT_TABLE.get(resource['Type'], {}).get('name')
+        old_name = old_resources[entry['logical_id']]['Properties'].get(name_property)
+        if name_property and old_name is not None and old_name == resource['Properties'].get(name_property):
+            blockers.append(f"{entry['logical_id']} must be replaced but keeps its custom {name_property}; "
+                            f"CloudFormation cannot replace a custom-named resource")
+        if resource['Retain']:
+            notes.append(f"{entry['logical_id']} is retained, so the resource it replaces is left in place")
+
+    for entry in changes.values():
+        if entry['type'] == 'AWS::AutoScaling::AutoScalingGroup' and \
+                any(prop['name'] == 'LaunchTemplate' for prop in entry['properties']) and entry['action'] == 'modify':
+            notes.append(f"{entry['logical_id']} launches new instances from the new launch template version; "
+                         f"running instances keep the old one until they are replaced")
+
+    resources = sorted((entry for entry in changes.values() if entry['action'] != 'modify' or entry['properties']),
+                       key=lambda entry: entry['logical_id'])
+    return {'resources': resources, 'changed_exports': changed_exports, 'blockers': blockers, 'notes': notes}
+
+def stack_action(old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]], result: Dict[str, Any]) -> str:
+    """create/delete, none, update (in place, without interruption), disruptive or blocked"""
+    if old is None:
+        return 'create'
+    if new is None:
+        return 'delete'
+    if result['blockers']:
+        return 'blocked'
+    if any(entry['action'] in ('replace', 'conditional', 'remove') or entry['level'] == 'some-interruptions'
+           for entry in result['resources']):
+        return 'disruptive'
+    return 'update' if result['resources'] else 'none'
+
+def stacks_from_manifest(params_dir: str) -> Dict[str, Tuple[str, str]]:
+    """Stack key -> (template path, parameter file) for a bomctl compile-all output directory"""
+    with open(os.path.join(params_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    stacks = {}
+    if manifest.get('network'):
+        stacks['network-foundation'] = (NETWORK_TEMPLATE, os.path.join(params_dir, manifest['network']['parameters']))
+    for service in manifest.get('services', []):
+        stacks[f"{service['name']}-{service['instance_id']}"] = (
+            f"{SERVICE_TEMPLATE_DIR}/{service['template']}", os.path.join(params_dir, service['parameters']))
+    return stacks
+
+def read_template(path: str, template_root: str = '.', git_ref: Optional[str] = None) -> Dict[str, Any]:
+    """A template from the working tree, or as it was at a git revision"""
+    if git_ref:
+        result = subprocess.run(['git', 'show', f"{git_ref}:{path}"], capture_output=True, cwd=template_root)
+        if result.returncode != 0:
+            raise FileNotFoundError(f"{path} at {git_ref}: {result.stderr.decode().strip()}")
+        return load_template(result.stdout)
+    with open(os.path.join(template_root, path), 'rb') as f:
+        return load_template(f.read())
+
+class ChangesetPreview:
+    def __init__(self, stack_prefix: str = ''):
+        self.stack_prefix = stack_prefix
+        self.results: List[Dict[str, Any]] = []
+
+    def preview(self, stacks: List[Tuple[str, Optional[Dict[str, Any]], Optional[Dict[str, str]],
+                                   Optional[Dict[str, Any]], Optional[Dict[str, str]]]]) -> List[Dict[str, Any]]:
+        """Preview (key, old template, old parameters, new template, new parameters) stacks
+
+        Stacks are given providers first, so each sees the exports changed by the ones before it.
+        """
+        changed_exports: Set[str] = set()
+        imported_by: Dict[str, List[str]] = {}
+        rendered = []
+
+        for key, old_template, old_params, new_template, new_params in stacks:
+            old = Renderer(old_template, old_params).render() if old_template is not None else None
+            new = Renderer(new_template, new_params, changed_exports).render() if new_template is not None else None
+            result = preview_stack(old, new)
+            result['parameters'] = changed_parameters(old_params, new_params)
+            changed_exports.update(result['changed_exports'])
+            rendered.append((key, old, new, result))
+
+            for resource in (new or {}).get('resources', {}).values():
+                for name in imports(resource['Properties'], set()):
+                    imported_by.setdefault(name, []).append(key)
+
+        # CloudFormation refuses to change an export another stack still imports
+        for key, old, new, result in rendered:
+            for export in result['changed_exports']:
+                importers = sorted(set(importer for importer in imported_by.get(export, []) if importer != key))
+                if importers:
+                    result['blockers'].append(f"export {export} changes but is imported by {', '.join(importers)}")
+
+            result.update(stack=key, stack_name=f"{self.stack_prefix}{key}", action=stack_action(old, new, result))
+            self.results.append(result)
+        return self.results
+
+    def batches(self) -> Dict[str, List[str]]:
+        """Stacks safe to deploy together, and stacks held back for review"""
+        return {
+            'safe': [result['stack'] for result in self.results if result['action'] in ('create', 'update')],
+            'held': [result['stack'] for result in self.results if result['action'] in ('disruptive', 'blocked', 'delete')],
+            'unchanged': [result['stack'] for result in self.results if result['action'] == 'none']
+        }
+
+    def print_results(self) -> None:
+        icons = {'none': '⏭️ ', 'create': '🆕', 'update': '✅', 'disruptive': '⚠️ ', 'blocked': '❌', 'delete': '🗑️ '}
+        for result in self.results:
+            print(f"{icons[result['action']]} {result['stack_name']}: {result['action']}")
+            if result['parameters']:
+                print(f"    parameters: {', '.join(result['parameters'])}")
+            for entry in result['resources']:
+                print(f"  - {entry['logical_id']} ({entry['type']}): {entry['action']}")
+                for prop in entry['properties']:
+                    cause = f" ({prop['cause']})" if prop['cause'] else ''
+                    print(f"      {prop['name']}: {prop['level']}{cause}")
+            for blocker in result['blockers']:
+                print(f"  ❌ {blocker}")
+            for note in result['notes']:
+                print(f"  ℹ️  {note}")
+
+def load_stacks(old_dir: str, new_dir: str, template_root: str = '.', old_ref: Optional[str] = None) -> List[Tuple]:
+    """Stacks of two compile-all output directories, the network first"""
+    old_stacks = stacks_from_manifest(old_dir)
+    new_stacks = stacks_from_manifest(new_dir)
+
+    # Service instances share their template; each revision is parsed once
+    templates: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+
+    def template(path: str, git_ref: Optional[str]) -> Dict[str, Any]:
+        if (path, git_ref) not in templates:
+            templates[path, git_ref] = read_template(path, template_root, git_ref)
+        return templates[path, git_ref]
+
+    stacks = []
+    for key in list(new_stacks) + [key for key in old_stacks if key not in new_stacks]:
+        old_template = old_params = new_template = new_params = None
+        if key in old_stacks:
+            path, params_file = old_stacks[key]
+            old_template, old_params = template(path, old_ref), load_parameter_file(params_file)
+        if key in new_stacks:
+            path, params_file = new_stacks[key]
+            new_template, new_params = template(path, None), load_parameter_file(params_file)
+        stacks.append((key, old_template, old_params, new_template, new_params))
+    return stacks
+
+def main():
+    parser = argparse.ArgumentParser(description='Predict in-place updates and replacements of a BOM change without calling AWS')
+    parser.add_argument('--old-dir', required=True, help='bomctl compile-all output of the deployed BOM')
+    parser.add_argument('--new-dir', required=True, help='bomctl compile-all output of the changed BOM')
+    parser.add_argument('--old-ref', help='Git revision of the deployed templates (default: the working tree)')
+    parser.add_argument('--template-root', default='.', help='Repository root holding the templates')
+    parser.add_argument('--customer', help='Customer name, to report full stack names')
+    parser.add_argument('--environment', help='Environment, to report full stack names')
+    parser.add_argument('--output', help='Write the preview as JSON to this file')
+
+    args = parser.parse_args()
+
+    try:
+        stacks = load_stacks(args.old_dir, args.new_dir, args.template_root, args.old_ref)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"ERROR: Failed to load stacks: {e}")
+        sys.exit(1)
+
+    prefix = f"{args.customer}-{args.environment}-" if args.customer and args.environment else ''
+    preview = ChangesetPreview(prefix)
+    preview.preview(stacks)
+    preview.print_results()
+
+    batches = preview.batches()
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'stacks': preview.results, 'batches': batches}, f, indent=2)
+        print(f"Preview written: {args.output}")
+
+    # Output for GitHub Actions
+    print(f"::set-output name=safe-stacks::{json.dumps(batches['safe'])}")
+    print(f"::set-output name=held-stacks::{json.dumps(batches['held'])}")
+
+    print(f"\nSafe to deploy together: {len(batches['safe'])}, held back: {len(batches['held'])}, "
+          f"unchanged: {len(batches['unchanged'])}")
+
+if __name__ == '__main__':
+    main()
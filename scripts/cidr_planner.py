@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+CIDR Planner - Indexes the VPC and subnet ranges of every BOM to catch overlaps, and carves
+per-AZ public/private subnets out of a VPC
+The carved subnets follow network-foundation.yml's layout (public AZ1-3, then private AZ1-3) and
+are emitted as its SubnetCidrs parameter; a fleet registry records ranges handed out to customers
+"""
+
+import argparse
+import ipaddress
+import json
+import os
+import sys
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+
+ADDRESS_BITS = 32
+
+# network-foundation.yml reserves a slot per AZ for each tier, public first
+MAX_AZS = 3
+SLOT_BITS = 3
+
+# What network-foundation.yml's !Cidr [VpcCidr, 6, 8] carves from a /16; AWS allows down to /28
+DEFAULT_SUBNET_PREFIX = 24
+MAX_SUBNET_PREFIX = 28
+
+PRIVATE_POOLS = ['10.0.0.0/8', '172.16.0.0/12', '192.168.0.0/16']
+
+REGISTRY_FORMAT = 1
+
+# Prefix tree node slots: children by address bit, allocation owner, shortest free prefix below
+ZERO, ONE, OWNER, FREE = range(4)
+NO_FREE_BLOCK = ADDRESS_BITS + 1
+
+def parse_cidr(cidr: str) -> Tuple[int, int]:
+    """(network address as int, prefix length); host bits are dropped"""
+    network = ipaddress.IPv4Network(cidr.strip(), strict=False)
+    return int(network.network_address), network.prefixlen
+
+def format_cidr(address: int, prefixlen: int) -> str:
+    return f"{ipaddress.IPv4Address(address)}/{prefixlen}"
+
+def block_mask(prefixlen: int) -> int:
+    return ((1 << prefixlen) - 1) << (ADDRESS_BITS - prefixlen)
+
+class IntervalIndex:
+    """Disjoint IPv4 ranges held in a binary prefix tree
+
+    CIDR blocks are aligned intervals, so two blocks either nest or do not touch. An overlap
+    check, insert or first-fit allocation therefore only walks the block's prefix bits: at most
+    32 steps however many ranges are indexed. Every node keeps the shortest prefix of a free
+    block below it, so allocation goes straight to the first fit without backtracking.
+    """
+
+    def __init__(self):
+        self.root: List[Any] = [None, None, None, 0]
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def conflicts(self, address: int, prefixlen: int, limit: int = 10) -> List[Tuple[str, str]]:
+        """(cidr, owner) of indexed ranges overlapping a block: the one containing it, or those inside it"""
+        node = self.root
+        for depth in range(prefixlen):
+            if node[OWNER] is not None:
+                return [(format_cidr(address & block_mask(depth), depth), node[OWNER])]
+            node = node[(address >> (ADDRESS_BITS - 1 - depth)) & 1]
+            if node is None:
+                return []
+        return list(self._allocations(node, address & block_mask(prefixlen), prefixlen, limit))
+
+    def containing(self, address: int, prefixlen: int) -> Optional[Tuple[str, str]]:
+        """(cidr, owner) of the indexed range holding a block, or None"""
+        node = self.root
+        for depth in range(prefixlen + 1):
+            if node[OWNER] is not None:
+                return format_cidr(address & block_mask(depth), depth), node[OWNER]
+            if depth == prefixlen:
+                break
+            node = node[(address >> (ADDRESS_BITS - 1 - depth)) & 1]
+            if node is None:
+                break
+        return None
+
+    def insert(self, address: int, prefixlen: int, owner: str) -> List[Tuple[str, str]]:
+        """Index a block unless it overlaps; returns the overlapping ranges (empty when inserted)"""
+        found = self.conflicts(address, prefixlen)
+        if found:
+            return found
+
+        node = self.root
+        path = [node]
+        for depth in range(prefixlen):
+            bit = (address >> (ADDRESS_BITS - 1 - depth)) & 1
+            if node[bit] is None:
+                node[bit] = [None, None, None, depth + 1]
+            node = node[bit]
+            path.append(node)
+
+        node[OWNER] = owner
+        node[FREE] = NO_FREE_BLOCK
+        for depth in range(prefixlen - 1, -1, -1):
+            parent = path[depth]
+            parent[FREE] = min(self._free(parent[ZERO], depth + 1), self._free(parent[ONE], depth + 1))
+        self.count += 1
+        return []
+
+    def allocate(self, prefixlen: int, owner: str, within: Tuple[int, int] = (0, 0)) -> Optional[Tuple[int, int]]:
+        """Index the lowest free block of a prefix length inside another block; None when full"""
+        address, depth = within
+        if prefixlen < depth:
+            raise ValueError(f"a /{prefixlen} does not fit in a /{depth}")
+        address &= block_mask(depth)
+
+        node = self.root
+        for step in range(depth):
+            if node[OWNER] is not None:
+                return None
+            node = node[(address >> (ADDRESS_BITS - 1 - step)) & 1]
+            if node is None:
+                break
+
+        # Descend toward the first block with room; an absent child is entirely free
+        while node is not None and depth < prefixlen:
+            if node[OWNER] is not None or node[FREE] > prefixlen:
+                return None
+            zero = node[ZERO]
+            if zero is None or zero[FREE] <= prefixlen:
+                node = zero
+            else:
+                node = node[ONE]
+                address |= 1 << (ADDRESS_BITS - 1 - depth)
+            depth += 1
+        if node is not None and (node[OWNER] is not None or node[ZERO] or node[ONE]):
+            return None
+
+        self.insert(address, prefixlen, owner)
+        return address, prefixlen
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        """(cidr, owner) of every indexed range in address order"""
+        return self._allocations(self.root, 0, 0, None)
+
+    @staticmethod
+    def _free(node: Optional[List[Any]], depth: int) -> int:
+        return depth if node is None else node[FREE]
+
+    @staticmethod
+    def _allocations(node: List[Any], address: int, depth: int, limit: Optional[int]) -> Iterator[Tuple[str, str]]:
+        stack = [(node, address, depth)]
+        found = 0
+        while stack and (limit is None or found < limit):
+            node, address, depth = stack.pop()
+            if node[OWNER] is not None:
+                found += 1
+                yield format_cidr(address, depth), node[OWNER]
+                continue
+            if node[ONE] is not None:
+                stack.append((node[ONE], address | (1 << (ADDRESS_BITS - 1 - depth)), depth + 1))
+            if node[ZERO] is not None:
+                stack.append((node[ZERO], address, depth + 1))
+
+def subnet_prefix_for(vpc_prefixlen: int, subnet_prefix: Optional[int] = None) -> int:
+    """Subnet size for a VPC: /24 as network-foundation.yml carves, smaller when six /24s do not fit"""
+    if subnet_prefix is None:
+        subnet_prefix = max(DEFAULT_SUBNET_PREFIX, vpc_prefixlen + SLOT_BITS)
+    if subnet_prefix > MAX_SUBNET_PREFIX or subnet_prefix - vpc_prefixlen < SLOT_BITS:
+        raise ValueError(f"a /{vpc_prefixlen} VPC cannot hold {2 * MAX_AZS} /{subnet_prefix} subnets "
+                         f"(subnets can be at most /{MAX_SUBNET_PREFIX})")
+    return subnet_prefix
+
+class CidrPlanner:
+    """Every VPC range in one index, and each VPC's subnets in an index of their own"""
+
+    def __init__(self):
+        self.vpcs = IntervalIndex()
+        self.subnets: Dict[str, IntervalIndex] = {}
+        self.conflicts: List[Dict[str, str]] = []
+
+    def _conflict(self, cidr: str, owner: str, other_cidr: str, other_owner: str) -> None:
+        self.conflicts.append({'cidr': cidr, 'owner': owner, 'overlaps': other_cidr, 'overlaps_owner': other_owner})
+
+    def add_vpc(self, cidr: str, owner: str) -> bool:
+        """Index a VPC range; records a conflict and returns False if it overlaps another"""
+        address, prefixlen = parse_cidr(cidr)
+        found = self.vpcs.insert(address, prefixlen, owner)
+        for other_cidr, other_owner in found:
+            self._conflict(format_cidr(address, prefixlen), owner, other_cidr, other_owner)
+        if not found:
+            self.subnets[format_cidr(address, prefixlen)] = IntervalIndex()
+        return not found
+
+    def allocate_vpc(self, prefixlen: int, owner: str, pools: List[str] = PRIVATE_POOLS) -> Optional[str]:
+        """First free VPC range of a size in the pools, indexed for the owner"""
+        for pool in pools:
+            block = self.vpcs.allocate(prefixlen, owner, parse_cidr(pool))
+            if block:
+                cidr = format_cidr(*block)
+                self.subnets[cidr] = IntervalIndex()
+                return cidr
+        return None
+
+    def add_subnet(self, cidr: str, owner: str) -> bool:
+        """Index a subnet in the VPC holding it; records a conflict when no VPC holds it or it overlaps"""
+        address, prefixlen = parse_cidr(cidr)
+        cidr = format_cidr(address, prefixlen)
+        vpc = self.vpcs.containing(address, prefixlen)
+        if vpc is None or vpc[0] == cidr:
+            self._conflict(cidr, owner, '', 'no indexed VPC holds it')
+            return False
+
+        found = self.subnets[vpc[0]].insert(address, prefixlen, owner)
+        for other_cidr, other_owner in found:
+            self._conflict(cidr, owner, other_cidr, other_owner)
+        return not found
+
+    def carve(self, vpc_cidr: str, owner: str, az_count: int, public: bool = True, private: bool = True,
+              subnet_prefix: Optional[int] = None) -> List[str]:
+        """Allocate per-AZ subnets in a VPC; returns all six slots in network-foundation.yml's order
+
+        Public subnet N takes slot N-1 and private subnet N slot 3+N-1, so a /16 gets exactly the
+        /24s of !Cidr [VpcCidr, 6, 8]. A slot already taken (e.g. by a subnet listed in the BOM)
+        moves that subnet to the VPC's first free block. Slots past az_count stay reserved.
+        """
+        vpc_address, vpc_prefixlen = parse_cidr(vpc_cidr)
+        vpc_cidr = format_cidr(vpc_address, vpc_prefixlen)
+        if vpc_cidr not in self.subnets:
+            raise ValueError(f"VPC {vpc_cidr} is not indexed")
+        if not 1 <= az_count <= MAX_AZS:
+            raise ValueError(f"az_count must be between 1 and {MAX_AZS}, got {az_count}")
+
+        prefixlen = subnet_prefix_for(vpc_prefixlen, subnet_prefix)
+        size = 1 << (ADDRESS_BITS - prefixlen)
+        index = self.subnets[vpc_cidr]
+        layout = [format_cidr(vpc_address + slot * size, prefixlen) for slot in range(2 * MAX_AZS)]
+
+        for tier, offset, wanted in (('public', 0, public), ('private', MAX_AZS, private)):
+            if not wanted:
+                continue
+            for az in range(az_count):
+                subnet_owner = f"{owner} {tier}-{az + 1}"
+                address = vpc_address + (offset + az) * size
+                if not index.insert(address, prefixlen, subnet_owner):
+                    continue
+                block = index.allocate(prefixlen, subnet_owner, (vpc_address, vpc_prefixlen))
+                if block is None:
+                    raise ValueError(f"VPC {vpc_cidr} has no free /{prefixlen} left for {subnet_owner}")
+                layout[offset + az] = format_cidr(*block)
+        return layout
+
+def subnet_cidrs(vpc_cidr: str, az_count: int, public: bool = True, private: bool = True) -> str:
+    """network-foundation.yml SubnetCidrs for a lone VPC"""
+    planner = CidrPlanner()
+    planner.add_vpc(vpc_cidr, 'network-foundation')
+    return ','.join(planner.carve(vpc_cidr, 'network-foundation', az_count, public, private))
+
+def load_networks(bom_file: str) -> List[Dict[str, Any]]:
+    """The VPC (and listed subnets) of a customer BOM, or of each environment of a future-ready BOM"""
+    with open(bom_file, 'r', encoding='utf-8-sig', newline='') as f:
+        lines = [line.rstrip('\r') for line in f.read().split('\n')]
+    header = [column.strip() for column in lines[0].split(',')]
+
+    if 'resource_type' in header:
+        import csv
+
+        # The first network row is the one BOMParser deploys
+        for row in csv.DictReader(lines[1:], fieldnames=header):
+            if (row.get('resource_type') or '').strip().lower() == 'network':
+                return [{
+                    'owner': bom_file,
+                    'vpc_cidr': (row.get('vpc_cidr') or '10.0.0.0/16').strip(),
+                    'az_count': int((row.get('az_count') or '2').strip()),
+                    'public': (row.get('create_public_subnets') or 'true').strip().lower() == 'true',
+                    'private': (row.get('create_private_subnets') or 'true').strip().lower() == 'true',
+                    'subnets': []
+                }]
+        return []
+
+    # Future-ready: rows for an environment are its own plus those marked 'all'
+    rows = [dict(zip(header, line.split(','))) for line in lines[1:] if line.strip() and not line.startswith('#')]
+    environments = sorted({row.get('Environment', '').strip() for row in rows} - {'all', ''}) or ['all']
+    networks = []
+    for environment in environments:
+        values: Dict[Tuple[str, str, str], str] = {}
+        order: Dict[str, List[str]] = {}
+        for row in rows:
+            if row.get('Environment', '').strip() not in (environment, 'all'):
+                continue
+            resource_type, name = row.get('ResourceType', '').strip(), row.get('ResourceName', '').strip()
+            key = (resource_type, name, row.get('Configuration', '').strip())
+            if key not in values:
+                values[key] = row.get('Value', '').strip()
+            if name not in order.setdefault(resource_type, []):
+                order[resource_type].append(name)
+
+        vpcs = order.get('VPC', [])
+        if not vpcs or not values.get(('VPC', vpcs[0], 'CIDR')):
+            continue
+        owner = bom_file if environment == 'all' else f"{bom_file} ({environment})"
+        networks.append({
+            'owner': owner,
+            'vpc_cidr': values[('VPC', vpcs[0], 'CIDR')],
+            'az_count': None,
+            'subnets': [(values[('Subnet', name, 'CIDR')], f"{owner} {name}")
+                        for name in order.get('Subnet', []) if values.get(('Subnet', name, 'CIDR'))]
+        })
+    return networks
+
+def load_registry(path: str) -> List[Dict[str, str]]:
+    """Allocations recorded in a registry file; a missing file is an empty registry"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            registry = json.load(f)
+    except FileNotFoundError:
+        return []
+    if registry.get('format') != REGISTRY_FORMAT:
+        raise ValueError(f"{path}: unsupported registry format")
+    return registry['allocations']
+
+def save_registry(path: str, allocations: List[Dict[str, str]]) -> None:
+    """Atomically write the registry"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'format': REGISTRY_FORMAT, 'allocations': allocations}, f, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+def build_planner(bom_files: List[str], registry: List[Dict[str, str]]) -> Tuple[CidrPlanner, List[str]]:
+    """Index the registry, then every BOM's VPC and subnets; returns the planner and BOM errors"""
+    planner = CidrPlanner()
+    errors = []
+
+    for allocation in registry:
+        if allocation.get('kind') == 'subnet':
+            planner.add_subnet(allocation['cidr'], allocation['owner'])
+        else:
+            planner.add_vpc(allocation['cidr'], allocation['owner'])
+
+    registered = {allocation['owner'] for allocation in registry}
+    for bom_file in bom_files:
+        try:
+            networks = load_networks(bom_file)
+        except (OSError, ValueError) as e:
+            errors.append(f"{bom_file}: {e}")
+            continue
+
+        for network in networks:
+            # A BOM whose ranges were recorded earlier is checked against everyone else's
+            if network['owner'] in registered:
+                continue
+            try:
+                if not planner.add_vpc(network['vpc_cidr'], network['owner']):
+                    continue
+                for cidr, owner in network['subnets']:
+                    planner.add_subnet(cidr, owner)
+                if network['az_count'] is not None:
+                    planner.carve(network['vpc_cidr'], network['owner'], network['az_count'], network['public'], network['private'])
+            except ValueError as e:
+                errors.append(f"{network['owner']}: {e}")
+
+    return planner, errors
+
+def print_conflicts(planner: CidrPlanner, errors: List[str]) -> None:
+    for error in errors:
+        print(f"❌ {error}")
+    for conflict in planner.conflicts:
+        if conflict['overlaps']:
+            print(f"❌ {conflict['cidr']} ({conflict['owner']}) overlaps {conflict['overlaps']} ({conflict['overlaps_owner']})")
+        else:
+            print(f"❌ {conflict['cidr']} ({conflict['owner']}): {conflict['overlaps_owner']}")
+
+def cmd_check(args) -> int:
+    planner, errors = build_planner(args.bom_files, load_registry(args.registry) if args.registry else [])
+    subnet_count = sum(len(index) for index in planner.subnets.values())
+    print(f"Indexed {len(planner.vpcs)} VPCs and {subnet_count} subnets")
+    print_conflicts(planner, errors)
+    if errors or planner.conflicts:
+        return 1
+    print("✅ No overlapping ranges")
+    return 0
+
+def cmd_plan(args) -> int:
+    registry = load_registry(args.registry) if args.registry else []
+    networks = load_networks(args.bom_file)
+    if not networks:
+        print(f"ERROR: No network configuration found in {args.bom_file}")
+        return 1
+
+    network = networks[0]
+    vpc_cidr = args.vpc_cidr or network['vpc_cidr']
+    az_count = args.az_count or network['az_count'] or 2
+    owner = args.owner or network['owner']
+    # The owner's own earlier record is replaced, so only everyone else's ranges can conflict
+    planner, errors = build_planner([], [allocation for allocation in registry if allocation['owner'] != owner])
+    try:
+        planner.add_vpc(vpc_cidr, owner)
+        layout = planner.carve(vpc_cidr, owner, az_count, network.get('public', True), network.get('private', True), args.subnet_prefix) \
+            if not planner.conflicts else []
+    except ValueError as e:
+        errors.append(str(e))
+    if errors or planner.conflicts:
+        print_conflicts(planner, errors)
+        return 1
+
+    parameters = [
+        {'ParameterKey': 'VpcCidr', 'ParameterValue': vpc_cidr},
+        {'ParameterKey': 'AvailabilityZoneCount', 'ParameterValue': str(az_count)},
+        {'ParameterKey': 'SubnetCidrs', 'ParameterValue': ','.join(layout)}
+    ]
+    print(f"VPC {vpc_cidr}: public {', '.join(layout[:az_count])}; private {', '.join(layout[MAX_AZS:MAX_AZS + az_count])}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(parameters, f, indent=2)
+        print(f"Parameters written: {args.output}")
+    else:
+        print(json.dumps(parameters, indent=2))
+
+    if args.record:
+        registry = [allocation for allocation in registry if allocation['owner'] != owner]
+        registry.append({'cidr': vpc_cidr, 'owner': owner, 'kind': 'vpc'})
+        save_registry(args.registry, registry)
+        print(f"Recorded {vpc_cidr} for {owner} in {args.registry}")
+    return 0
+
+def cmd_allocate(args) -> int:
+    registry = load_registry(args.registry)
+    if any(allocation['owner'] == args.owner and allocation.get('kind') != 'subnet' for allocation in registry):
+        print(f"ERROR: {args.owner} already has a VPC range in {args.registry}")
+        return 1
+
+    planner, _ = build_planner([], registry)
+    cidr = planner.allocate_vpc(args.prefix, args.owner, args.pool or PRIVATE_POOLS)
+    if cidr is None:
+        print(f"ERROR: No free /{args.prefix} left in {', '.join(args.pool or PRIVATE_POOLS)}")
+        return 1
+
+    registry.append({'cidr': cidr, 'owner': args.owner, 'kind': 'vpc'})
+    save_registry(args.registry, registry)
+    print(cidr)
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Check BOM CIDR ranges for overlaps and plan per-AZ subnets')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    check = subparsers.add_parser('check', help='Report overlapping VPC and subnet ranges across BOMs')
+    check.add_argument('bom_files', nargs='+', help='Customer or future-ready BOM CSV files')
+    check.add_argument('--registry', help='Fleet registry of allocated ranges to check against')
+    check.set_defaults(handler=cmd_check)
+
+    plan = subparsers.add_parser('plan', help="Carve a BOM's per-AZ subnets and emit network-foundation.yml parameters")
+    plan.add_argument('--bom-file', default='bom/customer-bom.csv', help='Path to the BOM CSV file')
+    plan.add_argument('--vpc-cidr', help='Override VPC CIDR from BOM')
+    plan.add_argument('--az-count', type=int, choices=range(1, MAX_AZS + 1), help='Override az_count from BOM')
+    plan.add_argument('--subnet-prefix', type=int, help=f'Subnet prefix length (default: /{DEFAULT_SUBNET_PREFIX}, smaller for small VPCs)')
+    plan.add_argument('--owner', help='Owner recorded in the registry (default: the BOM path)')
+    plan.add_argument('--registry', help='Fleet registry the VPC must not overlap')
+    plan.add_argument('--record', action='store_true', help='Record the VPC range in the registry')
+    plan.add_argument('--output', help='Write the CloudFormation parameters to this file')
+    plan.set_defaults(handler=cmd_plan)
+
+    allocate = subparsers.add_parser('allocate', help='Hand out the first free VPC range and record it')
+    allocate.add_argument('--owner', required=True, help='Owner of the range, e.g. customer/environment')
+    allocate.add_argument('--prefix', type=int, default=16, help='VPC prefix length (default: 16)')
+    allocate.add_argument('--pool', action='append', help='Pool to allocate from (repeatable; default: RFC 1918 ranges)')
+    allocate.add_argument('--registry', required=True, help='Fleet registry file')
+    allocate.set_defaults(handler=cmd_allocate)
+
+    args = parser.parse_args()
+    if getattr(args, 'record', False) and not args.registry:
+        parser.error('--record needs --registry')
+
+    try:
+        sys.exit(args.handler(args))
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Deployment Fingerprints - Detects stacks whose inputs have not changed since their last deployment
+A stack's fingerprint hashes its template bytes, its canonicalized parameters, the stack tags and the
+fingerprints of the stacks it depends on, so a change upstream also changes everything downstream
+
+Usage: python scripts/deploy_fingerprint.py --state-file .deploy-state/dev.json forget dev-vpc dev-subnets
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional
+
+MISSING = 'missing'
+
+# Stack statuses in which an unchanged stack is left alone; anything else is redeployed
+SETTLED_STATUSES = {'CREATE_COMPLETE', 'UPDATE_COMPLETE', 'IMPORT_COMPLETE'}
+
+def file_sha256(path: str) -> str:
+    """Hash a file's bytes, or return MISSING if it does not exist"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return MISSING
+
+def canonical_parameters(params_file: str) -> Optional[str]:
+    """Canonical JSON for a parameter file so formatting and ordering do not affect the hash"""
+    try:
+        with open(params_file, 'r', encoding='utf-8-sig') as f:
+            params = json.load(f)
+    except FileNotFoundError:
+        return None
+
+    # Accept both CloudFormation [{ParameterKey, ParameterValue}] files and plain dicts
+    if isinstance(params, list):
+        params = {param['ParameterKey']: param['ParameterValue'] for param in params}
+
+    return json.dumps({key: str(value) for key, value in params.items()}, sort_keys=True, separators=(',', ':'))
+
+def parameters_sha256(params_file: str) -> str:
+    """Hash a parameter file's canonical form, or return MISSING if it does not exist"""
+    canonical = canonical_parameters(params_file)
+    if canonical is None:
+        return MISSING
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def tags_sha256(tags: List[str]) -> str:
+    """Hash Key=Value stack tags independent of their order"""
+    canonical = json.dumps(sorted(tags), separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def compute_fingerprints(stacks: List[Dict[str, Any]], levels: List[List[str]], tags: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """Fingerprint every stack, visiting levels in dependency order; every stack is deployed with the same tags"""
+    by_name = {stack['name']: stack for stack in stacks}
+    fingerprints: Dict[str, Dict[str, Any]] = {}
+    tags_hash = tags_sha256(tags or [])
+
+    for level in levels:
+        for name in level:
+            stack = by_name[name]
+            entry = {
+                'template_sha256': file_sha256(stack['template']),
+                'parameters_sha256': parameters_sha256(stack.get('parameters', '')),
+                'tags_sha256': tags_hash,
+                'upstream': {dep: fingerprints[dep]['fingerprint'] for dep in sorted(stack.get('depends_on', []))}
+            }
+
+            digest = hashlib.sha256()
+            digest.update(f"template:{entry['template_sha256']}\n".encode('utf-8'))
+            digest.update(f"parameters:{entry['parameters_sha256']}\n".encode('utf-8'))
+            digest.update(f"tags:{entry['tags_sha256']}\n".encode('utf-8'))
+            for dep, fingerprint in entry['upstream'].items():
+                digest.update(f"upstream:{dep}:{fingerprint}\n".encode('utf-8'))
+
+            entry['fingerprint'] = digest.hexdigest()
+            fingerprints[name] = entry
+
+    return fingerprints
+
+class FingerprintCache:
+    """Fingerprints of the last successful deployment of each stack, kept in a local JSON state file"""
+
+    def __init__(self, state_file: str):
+        self.state_file = state_file
+        self.stacks: Dict[str, Dict[str, Any]] = {}
+
+    def load(self) -> None:
+        """Load recorded fingerprints; a missing or unreadable state file means nothing is recorded"""
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                self.stacks = json.load(f).get('stacks', {})
+        except FileNotFoundError:
+            self.stacks = {}
+        except (ValueError, AttributeError):
+            print(f"WARNING: Ignoring unreadable deployment state file: {self.state_file}")
+            self.stacks = {}
+
+    def save(self) -> None:
+        """Write recorded fingerprints back to the state file"""
+        state_dir = os.path.dirname(self.state_file)
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'stacks': self.stacks}, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, self.state_file)
+
+    def record(self, stack_name: str, entry: Dict[str, Any]) -> None:
+        """Record the fingerprint of a stack that deployed successfully"""
+        self.stacks[stack_name] = dict(entry, deployed_at=datetime.now(timezone.utc).isoformat())
+
+    def forget(self, stack_name: str) -> bool:
+        """Drop the record of a deleted stack so its next deploy is not skipped; False if none was recorded"""
+        return self.stacks.pop(stack_name, None) is not None
+
+    def plan(self, stack_name: str, entry: Dict[str, Any], stack_status: Optional[str]) -> Dict[str, Any]:
+        """Decide whether a stack needs deploying and explain why
+
+        stack_status is the stack's current CloudFormation status, None if it does not exist; an
+        unchanged fingerprint only skips a stack that is still deployed.
+        """
+        if MISSING in (entry['template_sha256'], entry['parameters_sha256']):
+            return {'action': 'deploy', 'reasons': ['template or parameter file missing']}
+
+        recorded = self.stacks.get(stack_name)
+        if not recorded:
+            return {'action': 'deploy', 'reasons': ['no recorded deployment']}
+
+        if recorded.get('fingerprint') == entry['fingerprint']:
+            if stack_status is None:
+                return {'action': 'deploy', 'reasons': ['unchanged but stack does not exist']}
+            if stack_status not in SETTLED_STATUSES:
+                return {'action': 'deploy', 'reasons': [f"unchanged but stack is {stack_status}"]}
+            return {'action': 'skip', 'reasons': ['unchanged']}
+
+        reasons = []
+        if recorded.get('template_sha256') != entry['template_sha256']:
+            reasons.append('template changed')
+        if recorded.get('parameters_sha256') != entry['parameters_sha256']:
+            reasons.append('parameters changed')
+        if recorded.get('tags_sha256') != entry['tags_sha256']:
+            reasons.append('tags changed')
+
+        recorded_upstream = recorded.get('upstream', {})
+        for dep, fingerprint in entry['upstream'].items():
+            if recorded_upstream.get(dep) != fingerprint:
+                reasons.append(f"upstream {dep} changed")
+        for dep in recorded_upstream:
+            if dep not in entry['upstream']:
+                reasons.append(f"upstream {dep} removed")
+
+        return {'action': 'deploy', 'reasons': reasons or ['fingerprint changed']}
+
+def main():
+    parser = argparse.ArgumentParser(description='Maintain the deployment fingerprint state file')
+    parser.add_argument('--state-file', required=True, help='Deployment fingerprint state file')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    forget = subparsers.add_parser('forget', help='Drop the records of deleted stacks')
+    forget.add_argument('stacks', nargs='+', metavar='STACK_NAME')
+
+    args = parser.parse_args()
+
+    cache = FingerprintCache(args.state_file)
+    cache.load()
+    forgotten = [stack_name for stack_name in args.stacks if cache.forget(stack_name)]
+    for stack_name in forgotten:
+        print(f"🧹 Forgot recorded deployment of {stack_name}")
+    if not forgotten:
+        return
+
+    try:
+        cache.save()
+    except OSError as e:
+        print(f"ERROR: Failed to write deployment state file: {e}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
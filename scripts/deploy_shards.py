@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Deploy Shards - Packs the BOM's service stacks into a fixed number of deploy jobs
+Services are weighted by the historical stack.deploy duration of their template (deploy telemetry
+spans) and assigned longest-first to the least loaded shard (LPT bin packing); each shard job then
+deploys its services concurrently, so per-job setup is paid once per shard instead of per service.
+`simulate` estimates the makespan of the per-service matrix and of a range of shard counts
+"""
+
+import argparse
+import heapq
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional
+
+from bomctl.manifest import StackManifest
+from deploy_telemetry import load_spans
+from stack_outputs import AwsCliOutputsBackend, StackOutputResolver
+from telemetry_report import latest_runs, percentile
+
+MANIFEST_FILE = 'bom-manifest.json'
+SERVICE_TEMPLATE_DIR = 'services'
+
+# Seconds assumed for a template without deploy history
+DEFAULT_DURATION = 300.0
+# Checkout, setup-python, dependency install and OIDC credentials of one deploy job
+DEFAULT_SETUP = 60.0
+# Parallel jobs a workflow run gets before the rest queue
+DEFAULT_MAX_RUNNERS = 20
+# Stacks one shard job deploys at once
+DEFAULT_CONCURRENCY = 8
+# Jobs GitHub Actions generates from one matrix
+MATRIX_LIMIT = 256
+
+# stack.deploy span statuses of completed deploys (stack_watcher outcomes and orchestrator statuses)
+COMPLETED_STATUSES = ('succeeded', 'deployed')
+
+def load_services(params_dir: str) -> List[Dict[str, str]]:
+    """Services of a bomctl compile-all output directory, as `bomctl check` lists them"""
+    with open(os.path.join(params_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    return [
+        {'name': service['name'], 'instance_id': service['instance_id'], 'template': service['template']}
+        for service in manifest.get('services', [])
+    ]
+
+def service_key(service: Dict[str, str]) -> str:
+    return f"{service['name']}-{service['instance_id']}"
+
+def template_durations(spans: List[Dict[str, Any]], services: List[Dict[str, str]], stack_prefix: str,
+                       statistic: str = 'p50') -> Dict[str, float]:
+    """Deploy seconds per template from stack.deploy spans of the prefix's service stacks
+
+    Spans carry the stack name only; a stack that is no longer in the BOM is attributed to the
+    template of its service name, so history survives new instance IDs.
+    """
+    by_stack = {service_key(service): service['template'] for service in services}
+    by_name = {service['name']: service['template'] for service in services}
+
+    samples: Dict[str, List[float]] = {}
+    for span in spans:
+        stack = span.get('stack') or ''
+        if span['phase'] != 'stack.deploy' or span.get('status') not in COMPLETED_STATUSES or not stack.startswith(stack_prefix):
+            continue
+        key = stack[len(stack_prefix):]
+        template = span.get('template') or by_stack.get(key) or by_name.get(key.rsplit('-', 1)[0])
+        if template:
+            samples.setdefault(template, []).append(span['duration'])
+
+    return {
+        template: percentile(values, 95 if statistic == 'p95' else 50)
+        for template, values in sorted(samples.items())
+    }
+
+def estimate_services(services: List[Dict[str, str]], durations: Dict[str, float],
+                      default: float = DEFAULT_DURATION) -> List[Dict[str, Any]]:
+    """The services with their expected deploy seconds"""
+    return [dict(service, estimate=round(durations.get(service['template'], default), 1)) for service in services]
+
+def pack_shards(services: List[Dict[str, Any]], shards: int) -> List[List[Dict[str, Any]]]:
+    """Longest-processing-time packing: each service, longest first, joins the least loaded shard
+
+    Ties go to the lower shard and services are ordered by key first, so a BOM always packs the same way.
+    """
+    bins: List[List[Dict[str, Any]]] = [[] for _ in range(max(1, min(shards, len(services))))]
+    loads = [(0.0, index) for index in range(len(bins))]
+    for service in sorted(sorted(services, key=service_key), key=lambda service: -service['estimate']):
+        load, index = heapq.heappop(loads)
+        bins[index].append(service)
+        heapq.heappush(loads, (load + service['estimate'], index))
+    return [shard for shard in bins if shard]
+
+def list_schedule(durations: List[float], slots: int) -> float:
+    """Finish time of running the durations in order on a number of parallel slots"""
+    if not durations:
+        return 0.0
+    finish = [0.0] * max(1, min(slots, len(durations)))
+    for duration in durations:
+        heapq.heappush(finish, heapq.heappop(finish) + duration)
+    return max(finish)
+
+def shard_seconds(shard: List[Dict[str, Any]], concurrency: int) -> float:
+    """Deploy seconds of one shard job, excluding setup; the shard lists its longest service first"""
+    return list_schedule([service['estimate'] for service in shard], concurrency)
+
+def build_matrix(shards: List[List[Dict[str, Any]]], concurrency: int) -> Dict[str, List[Dict[str, Any]]]:
+    """GitHub Actions matrix with one include entry per shard job"""
+    return {
+        'include': [
+            {
+                'shard': index,
+                'services': [{key: service[key] for key in ('name', 'instance_id', 'template')} for service in shard],
+                'estimate': round(shard_seconds(shard, concurrency), 1)
+            }
+            for index, shard in enumerate(shards, 1)
+        ]
+    }
+
+def simulate(services: List[Dict[str, Any]], shard_counts: List[int], setup: float = DEFAULT_SETUP,
+             max_runners: int = DEFAULT_MAX_RUNNERS, concurrency: int = DEFAULT_CONCURRENCY) -> List[Dict[str, Any]]:
+    """Estimated wall time of the service deploys: one job per service, then each shard count
+
+    Jobs beyond max_runners queue for a free runner; each job pays the setup seconds first.
+    """
+    jobs = [setup + service['estimate'] for service in sorted(services, key=lambda service: -service['estimate'])]
+    rows = [{
+        'layout': 'per-service',
+        'jobs': len(jobs),
+        'makespan': list_schedule(jobs, max_runners),
+        'runner_seconds': sum(jobs)
+    }]
+
+    for count in shard_counts:
+        shards = pack_shards(services, count)
+        jobs = sorted((setup + shard_seconds(shard, concurrency) for shard in shards), reverse=True)
+        loads = [sum(service['estimate'] for service in shard) for shard in shards]
+        rows.append({
+            'layout': f"{count} shard{'s' if count != 1 else ''}",
+            'jobs': len(jobs),
+            'makespan': list_schedule(jobs, max_runners),
+            'runner_seconds': sum(jobs),
+            'imbalance': (max(loads) / (sum(loads) / len(loads)) - 1) if loads and sum(loads) else 0.0
+        })
+    return rows
+
+def print_simulation(rows: List[Dict[str, Any]], services: int, setup: float, max_runners: int, concurrency: int) -> None:
+    print(f"{services} services, {setup:.0f}s setup per job, {max_runners} runners, {concurrency} stacks per shard at once\n")
+    print(f"{'layout':<12} {'jobs':>5} {'makespan':>10} {'runner min':>11} {'imbalance':>10}")
+    for row in rows:
+        imbalance = f"{row['imbalance'] * 100:.1f}%" if 'imbalance' in row else '-'
+        limit = f"  (over the {MATRIX_LIMIT}-job matrix limit)" if row['jobs'] > MATRIX_LIMIT else ''
+        print(f"{row['layout']:<12} {row['jobs']:>5} {row['makespan'] / 60:>9.1f}m {row['runner_seconds'] / 60:>11.1f} {imbalance:>10}{limit}")
+
+class ShardDeployer:
+    """Deploys one shard's service stacks concurrently, each through stack_watcher.py"""
+
+    def __init__(self, customer: str, environment: str, region: str, params_dir: str, concurrency: int = DEFAULT_CONCURRENCY,
+                 manifest: Optional['StackManifest'] = None):
+        self.customer = customer
+        self.environment = environment
+        self.region = region
+        self.params_dir = params_dir
+        self.concurrency = concurrency
+        self.manifest = manifest
+        self.resolver = StackOutputResolver(f"{customer}-{environment}", AwsCliOutputsBackend(region))
+
+    def stack_name(self, service: Dict[str, str]) -> str:
+        return f"{self.customer}-{self.environment}-{service_key(service)}"
+
+    def deploy_command(self, service: Dict[str, str]) -> List[str]:
+        scripts_dir = os.path.dirname(os.path.abspath(__file__))
+        if self.manifest:
+            # Parameters and overlay tags come from the stack manifest, passed inline
+            stack = self.manifest.stack(self.stack_name(service))
+            overrides = [f"{param['ParameterKey']}={param['ParameterValue']}" for param in stack['parameters']]
+            tags = [f"{tag['Key']}={tag['Value']}" for tag in stack['tags']]
+        else:
+            overrides = [f"file://{os.path.join(self.params_dir, f'service-params-{service_key(service)}.json')}"]
+            tags = []
+        command = [
+            sys.executable, os.path.join(scripts_dir, 'stack_watcher.py'), '--region', self.region, self.stack_name(service), '--',
+            'aws', 'cloudformation', 'deploy',
+            '--template-file', f"{SERVICE_TEMPLATE_DIR}/{service['template']}",
+            '--stack-name', self.stack_name(service),
+            '--parameter-overrides', *overrides,
+            '--capabilities', 'CAPABILITY_IAM', 'CAPABILITY_NAMED_IAM',
+            '--region', self.region,
+            '--no-fail-on-empty-changeset'
+        ]
+        if tags:
+            command += ['--tags'] + tags
+        return command
+
+    def deploy_one(self, service: Dict[str, str]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        process = subprocess.run(self.deploy_command(service), capture_output=True, text=True)
+        return {
+            'stack_name': self.stack_name(service),
+            'status': 'deployed' if process.returncode == 0 else 'failed',
+            'seconds': time.perf_counter() - start,
+            'output': process.stdout + process.stderr
+        }
+
+    def run(self, services: List[Dict[str, str]]) -> bool:
+        if self.manifest:
+            missing = [self.stack_name(service) for service in services if self.stack_name(service) not in self.manifest]
+            for stack_name in missing:
+                print(f"ERROR: Stack {stack_name} is not in the stack manifest {self.manifest.path}")
+            if missing:
+                return False
+
+        # Service stacks are append-only; one batched describe-stacks checks the whole shard
+        self.resolver.prefetch([service_key(service) for service in services])
+        existing = [service for service in services if self.resolver.exists(service_key(service))]
+        for service in existing:
+            print(f"ERROR: Service stack {self.stack_name(service)} already exists!")
+        if existing:
+            print("Service stacks are append-only. Use a different instance ID for new deployments.")
+            return False
+
+        failed = []
+        with ThreadPoolExecutor(max_workers=max(1, self.concurrency)) as executor:
+            futures = []
+            for service in services:
+                print(f"📦 Deploying stack: {self.stack_name(service)}")
+                futures.append(executor.submit(self.deploy_one, service))
+
+            for future in as_completed(futures):
+                result = future.result()
+                # Grouped so the concurrent deploys' output stays readable in the job log
+                print(f"::group::{result['stack_name']}")
+                print(result['output'].rstrip())
+                print("::endgroup::")
+                if result['status'] == 'failed':
+                    failed.append(result['stack_name'])
+                    print(f"❌ Stack {result['stack_name']} failed ({result['seconds']:.1f}s)")
+                else:
+                    print(f"✅ Stack {result['stack_name']} deployed ({result['seconds']:.1f}s)")
+
+        print(f"\nDeployed {len(services) - len(failed)}/{len(services)} service stacks")
+        return not failed
+
+def load_estimates(args) -> List[Dict[str, Any]]:
+    services = load_services(args.params_dir)
+    spans = latest_runs(load_spans(args.history), args.max_runs) if args.history else []
+    durations = template_durations(spans, services, f"{args.customer}-{args.environment}-", args.statistic)
+    for template in sorted({service['template'] for service in services} - set(durations)):
+        print(f"WARNING: No deploy history for {template}, assuming {args.default_duration:.0f}s", file=sys.stderr)
+    return estimate_services(services, durations, args.default_duration)
+
+def main():
+    parser = argparse.ArgumentParser(description='Pack service stacks into deploy jobs by historical deploy duration')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    estimates = argparse.ArgumentParser(add_help=False)
+    estimates.add_argument('--params-dir', default='compiled-params', help='bomctl compile-all output directory')
+    estimates.add_argument('--customer', required=True, help='Customer name')
+    estimates.add_argument('--environment', required=True, help='Environment (dev/staging/prod)')
+    estimates.add_argument('--history', nargs='*', default=[], help='Deploy telemetry span files or directories')
+    estimates.add_argument('--max-runs', type=int, default=30, help='Only use the most recent runs of the history')
+    estimates.add_argument('--statistic', choices=['p50', 'p95'], default='p50', help='Template duration used for packing')
+    estimates.add_argument('--default-duration', type=float, default=DEFAULT_DURATION, help='Seconds for templates without history')
+    estimates.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='Stacks a shard job deploys at once')
+
+    plan = subparsers.add_parser('plan', parents=[estimates], help='Print the shard matrix for the deploy-services job')
+    plan.add_argument('--shards', type=int, default=4, help='Number of deploy jobs')
+    plan.add_argument('--output', help='Also write the matrix to this file')
+
+    sim = subparsers.add_parser('simulate', parents=[estimates], help='Estimate the makespan for a range of shard counts')
+    sim.add_argument('--shards', type=int, nargs='+', default=[1, 2, 4, 8, 16], help='Shard counts to compare')
+    sim.add_argument('--setup', type=float, default=DEFAULT_SETUP, help='Setup seconds per deploy job')
+    sim.add_argument('--max-runners', type=int, default=DEFAULT_MAX_RUNNERS, help='Deploy jobs running at once')
+
+    deploy = subparsers.add_parser('deploy', help="Deploy one shard's services concurrently")
+    deploy.add_argument('--services-json', required=True, help="The shard's services, as in the matrix")
+    deploy.add_argument('--params-dir', default='compiled-params', help='bomctl compile-all output directory')
+    deploy.add_argument('--customer', required=True, help='Customer name')
+    deploy.add_argument('--environment', required=True, help='Environment (dev/staging/prod)')
+    deploy.add_argument('--region', default=os.environ.get('AWS_REGION', 'ap-south-1'), help='AWS region')
+    deploy.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='Stacks deployed at once')
+    deploy.add_argument('--manifest', help='bomctl stack-manifest file to read parameters and tags from instead of --params-dir')
+
+    args = parser.parse_args()
+    if args.command == 'plan' and not 1 <= args.shards <= MATRIX_LIMIT:
+        parser.error(f"--shards must be between 1 and {MATRIX_LIMIT}")
+
+    if args.command == 'deploy':
+        try:
+            services = json.loads(args.services_json)
+        except ValueError as e:
+            parser.error(f"--services-json: {e}")
+        try:
+            manifest = StackManifest(args.manifest) if args.manifest else None
+        except (OSError, ValueError) as e:
+            print(f"ERROR: Failed to open stack manifest: {e}")
+            sys.exit(1)
+        deployer = ShardDeployer(args.customer, args.environment, args.region, args.params_dir, args.concurrency, manifest)
+        try:
+            ok = deployer.run(services)
+        except RuntimeError as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+        sys.exit(0 if ok else 1)
+
+    try:
+        services = load_estimates(args)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"ERROR: Failed to load services: {e}")
+        sys.exit(1)
+
+    if args.command == 'simulate':
+        rows = simulate(services, args.shards, args.setup, args.max_runners, args.concurrency)
+        print_simulation(rows, len(services), args.setup, args.max_runners, args.concurrency)
+        return
+
+    matrix = build_matrix(pack_shards(services, args.shards), args.concurrency)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(matrix, f, indent=2)
+
+    # Output for GitHub Actions
+    print(f"::set-output name=deploy-shards::{json.dumps(matrix)}")
+
+    print(f"Services to deploy: {len(services)} in {len(matrix['include'])} shards")
+    for entry in matrix['include']:
+        print(f"  - shard {entry['shard']}: {len(entry['services'])} services, ~{entry['estimate']:.0f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Deploy Telemetry - Records timing spans of the BOM and deploy steps as JSON lines
+Every span carries the run, phase, stack, resource and its start/end (epoch seconds), so runs can
+be compared over time with scripts/telemetry_report.py
+Recording is off unless $DEPLOY_TELEMETRY_FILE names the file to append to
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Any, Optional
+
+TELEMETRY_ENV = 'DEPLOY_TELEMETRY_FILE'
+
+def default_run_id() -> str:
+    """$DEPLOY_TELEMETRY_RUN_ID, the GitHub Actions run (and attempt), or a unique local id"""
+    if os.environ.get('DEPLOY_TELEMETRY_RUN_ID'):
+        return os.environ['DEPLOY_TELEMETRY_RUN_ID']
+    run_id = os.environ.get('GITHUB_RUN_ID')
+    if run_id:
+        return f"{run_id}-{os.environ.get('GITHUB_RUN_ATTEMPT', '1')}"
+    return f"local-{int(time.time())}-{os.getpid()}"
+
+class Telemetry:
+    def __init__(self, path: Optional[str] = None, run_id: Optional[str] = None):
+        self.path = path
+        self.run_id = run_id or default_run_id()
+        self.job = os.environ.get('GITHUB_JOB')
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def record(self, phase: str, start: float, end: float, stack: Optional[str] = None,
+               resource: Optional[str] = None, **attributes: Any) -> None:
+        """Append one span; start and end are epoch seconds"""
+        if not self.path:
+            return
+        span = {
+            'run_id': self.run_id,
+            'job': self.job,
+            'phase': phase,
+            'stack': stack,
+            'resource': resource,
+            'start': round(start, 6),
+            'end': round(end, 6),
+            'duration': round(end - start, 6)
+        }
+        span.update(attributes)
+        line = json.dumps(span, separators=(',', ':')) + '\n'
+
+        # One append-mode write per span keeps lines whole when steps write concurrently
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+
+    @contextmanager
+    def span(self, phase: str, stack: Optional[str] = None, resource: Optional[str] = None,
+             **attributes: Any) -> Iterator[Dict[str, Any]]:
+        """Time the with-block; the yielded dict collects extra attributes for the span"""
+        start = time.time()
+        attributes['status'] = 'ok'
+        try:
+            yield attributes
+        except BaseException:
+            attributes['status'] = 'error'
+            raise
+        finally:
+            self.record(phase, start, time.time(), stack, resource, **attributes)
+
+_default: Optional[Telemetry] = None
+
+def telemetry_from_env() -> Telemetry:
+    """Process-wide recorder for $DEPLOY_TELEMETRY_FILE (disabled when unset)"""
+    global _default
+    if _default is None:
+        _default = Telemetry(os.environ.get(TELEMETRY_ENV))
+    return _default
+
+def load_spans(paths: List[str]) -> List[Dict[str, Any]]:
+    """Spans from JSON lines files or directory trees of them; torn or foreign lines are skipped"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, names in sorted(os.walk(path)):
+                files += sorted(os.path.join(directory, name) for name in names if name.endswith('.jsonl'))
+        else:
+            files.append(path)
+
+    spans = []
+    for path in files:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    span = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(span, dict) and {'run_id', 'phase', 'start', 'end'} <= span.keys():
+                    spans.append(span)
+    return spans
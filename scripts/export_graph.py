@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Export Graph - Derives the cross-stack dependency DAG from the templates' Export and
+Fn::ImportValue names
+Flags cycles and dangling imports, diffs the derived edges against deployment-order.json
+and reports how many stacks can deploy in parallel at each level
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+from cfn_templates import SUB_VARIABLE, TemplateCache, default_cache_dir, discover_templates
+from param_contract import load_parameter_file, parameter_string
+from stack_orchestrator import DEFAULT_ORDER_FILE, topological_sort
+
+def resolve_name(pattern: str, context: Dict[str, str]) -> str:
+    """Substitute known ${...} variables; unknown ones stay literal so both sides still match"""
+    return SUB_VARIABLE.sub(lambda match: context.get(match.group(1), match.group(0)), pattern)
+
+def load_order_stacks(order_file: str) -> List[Dict[str, Any]]:
+    """All stacks of a deployment order file, enabled or not"""
+    # The generated file is written with a byte order mark by PowerShell
+    with open(order_file, 'r', encoding='utf-8-sig') as f:
+        return json.load(f)['stacks']
+
+def strongly_connected(nodes: List[str], edges: Dict[str, Set[str]]) -> List[List[str]]:
+    """Tarjan's algorithm; returns the components that form cycles (size > 1 or a self edge)"""
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    cycles = []
+
+    def visit(node: str) -> None:
+        index[node] = lowlink[node] = len(index)
+        stack.append(node)
+        on_stack.add(node)
+
+        for target in sorted(edges.get(node, ())):
+            if target not in index:
+                visit(target)
+                lowlink[node] = min(lowlink[node], lowlink[target])
+            elif target in on_stack:
+                lowlink[node] = min(lowlink[node], index[target])
+
+        if lowlink[node] == index[node]:
+            component = []
+            while True:
+                member = stack.pop()
+                on_stack.discard(member)
+                component.append(member)
+                if member == node:
+                    break
+            if len(component) > 1 or node in edges.get(node, ()):
+                cycles.append(sorted(component))
+
+    for node in nodes:
+        if node not in index:
+            visit(node)
+    return cycles
+
+def closure(node: str, edges: Dict[str, Set[str]]) -> Set[str]:
+    """Everything node depends on, directly or transitively"""
+    seen: Set[str] = set()
+    pending = list(edges.get(node, ()))
+    while pending:
+        target = pending.pop()
+        if target not in seen:
+            seen.add(target)
+            pending.extend(edges.get(target, ()))
+    return seen
+
+class ExportGraph:
+    def __init__(self, environment: str, cache: Optional[TemplateCache] = None, customer: Optional[str] = None):
+        self.environment = environment
+        self.customer = customer
+        self.cache = cache or TemplateCache()
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.exports: Dict[str, str] = {}
+        self.duplicate_exports: List[Dict[str, Any]] = []
+        self.edges: Dict[str, Set[str]] = {}
+        self.edge_imports: Dict[Tuple[str, str], List[str]] = {}
+        self.dangling: List[Dict[str, str]] = []
+
+    def add_template(self, name: str, template_file: str, params_file: Optional[str] = None) -> None:
+        """Add a stack; its exports and imports are resolved with its own parameter values"""
+        summary = self.cache.summary(template_file)
+        context = {
+            param: parameter_string(spec['Default'])
+            for param, spec in summary['parameters'].items() if 'Default' in spec
+        }
+        if params_file and os.path.isfile(params_file):
+            context.update(load_parameter_file(params_file))
+        if 'Environment' in summary['parameters'] and 'Environment' not in context:
+            context['Environment'] = self.environment
+        if self.customer and 'Customer' in summary['parameters'] and 'Customer' not in context:
+            context['Customer'] = self.customer
+        context['AWS::StackName'] = f"{self.environment}-{name}"
+
+        self.nodes[name] = {
+            'template': template_file,
+            'parameters': params_file,
+            'exports': sorted(resolve_name(pattern, context) for pattern in summary['exports'].values() if pattern),
+            'imports': sorted(resolve_name(pattern, context) for pattern in summary['imports']),
+            'dynamic_imports': summary['dynamic_imports']
+        }
+
+    def build(self) -> None:
+        """Match every import to the stack exporting that name"""
+        for name, node in self.nodes.items():
+            for export in node['exports']:
+                if export in self.exports and self.exports[export] != name:
+                    self.duplicate_exports.append({'export': export, 'stacks': sorted([self.exports[export], name])})
+                    continue
+                self.exports[export] = name
+
+        for name, node in self.nodes.items():
+            self.edges[name] = set()
+            for imported in node['imports']:
+                exporter = self.exports.get(imported)
+                if exporter is None:
+                    self.dangling.append({'stack': name, 'template': node['template'], 'import': imported})
+                    continue
+                self.edges[name].add(exporter)
+                self.edge_imports.setdefault((name, exporter), []).append(imported)
+
+    def cycles(self) -> List[List[str]]:
+        return strongly_connected(list(self.nodes), self.edges)
+
+    def levels(self) -> List[List[str]]:
+        """Deployment levels of the acyclic part of the graph"""
+        in_cycles = {name for cycle in self.cycles() for name in cycle}
+        stacks = [
+            {'name': name, 'depends_on': sorted(self.edges[name] - in_cycles)}
+            for name in self.nodes if name not in in_cycles
+        ]
+        return [sorted(level) for level in topological_sort(stacks)]
+
+    def diff_order(self, order_stacks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Compare declared depends_on with the derived edges, per deployment-order stack
+
+        missing: derived dependencies not covered by the declared ones (a deploy may race)
+        unneeded: declared dependencies with no import behind them; either ordering-only (a NAT
+                  gateway needs the IGW attached) or serialization that can be dropped
+        """
+        declared = {stack['name']: set(stack.get('depends_on', [])) for stack in order_stacks}
+        diff = []
+        for stack in order_stacks:
+            name = stack['name']
+            if name not in self.nodes:
+                continue
+            declared_closure = closure(name, declared)
+            derived_closure = closure(name, self.edges)
+            missing = sorted(dep for dep in self.edges[name] if dep not in declared_closure)
+            unneeded = sorted(dep for dep in declared[name] if dep not in derived_closure)
+            if missing or unneeded:
+                diff.append({'name': name, 'missing': missing, 'unneeded': unneeded})
+        return diff
+
+    def report(self, order_stacks: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Machine-readable summary of the graph and its comparison with the deployment order"""
+        levels = self.levels()
+        report = {
+            'environment': self.environment,
+            'stacks': {
+                name: dict(node, depends_on=sorted(self.edges[name]))
+                for name, node in self.nodes.items()
+            },
+            'edges': [
+                {'from': importer, 'to': exporter, 'imports': sorted(names)}
+                for (importer, exporter), names in sorted(self.edge_imports.items())
+            ],
+            'cycles': self.cycles(),
+            'dangling_imports': self.dangling,
+            'duplicate_exports': self.duplicate_exports,
+            'levels': [{'stacks': level, 'width': len(level)} for level in levels],
+            'max_parallel_width': max((len(level) for level in levels), default=0)
+        }
+
+        if order_stacks is not None:
+            enabled = [stack for stack in order_stacks if stack.get('enabled', True)]
+            order_levels = topological_sort([
+                {'name': stack['name'], 'depends_on': [dep for dep in stack.get('depends_on', []) if dep in {s['name'] for s in enabled}]}
+                for stack in enabled
+            ])
+            report['order'] = {
+                'diff': self.diff_order(order_stacks),
+                'levels': [{'stacks': sorted(level), 'width': len(level)} for level in order_levels],
+                'not_in_order': sorted(name for name in self.nodes if name not in {stack['name'] for stack in order_stacks})
+            }
+
+        return report
+
+def stack_name_for(template_file: str) -> str:
+    """Stack name for a template outside the deployment order (file name without extension)"""
+    return os.path.splitext(os.path.basename(template_file))[0]
+
+def print_graph_report(report: Dict[str, Any]) -> None:
+    """Print a human-readable graph report"""
+    edges = report['edges']
+    print(f"## Export/ImportValue graph ({report['environment']})")
+    print(f"Stacks: {len(report['stacks'])}, edges: {len(edges)}, "
+          f"imports matched: {sum(len(edge['imports']) for edge in edges)}")
+
+    print("\nDerived levels:")
+    for i, level in enumerate(report['levels'], 1):
+        print(f"  Level {i} (width {level['width']}): {', '.join(level['stacks'])}")
+    print(f"Max parallel width: {report['max_parallel_width']}")
+
+    print("\nCycles:" + ('' if report['cycles'] else ' none'))
+    for cycle in report['cycles']:
+        print(f"  - {' <-> '.join(cycle)}")
+
+    print("Dangling imports:" + ('' if report['dangling_imports'] else ' none'))
+    for dangling in report['dangling_imports']:
+        print(f"  - {dangling['stack']} ({dangling['template']}) imports '{dangling['import']}', which no template exports")
+
+    for duplicate in report['duplicate_exports']:
+        print(f"  - Export '{duplicate['export']}' is defined by {' and '.join(duplicate['stacks'])}")
+
+    order = report.get('order')
+    if order:
+        print("\ndeployment-order.json:")
+        for i, level in enumerate(order['levels'], 1):
+            print(f"  Level {i} (width {level['width']}): {', '.join(level['stacks'])}")
+        if not order['diff']:
+            print("  depends_on matches the derived graph")
+        for entry in order['diff']:
+            if entry['missing']:
+                print(f"  - {entry['name']}: missing depends_on {', '.join(entry['missing'])} (imports their exports)")
+            if entry['unneeded']:
+                print(f"  - {entry['name']}: depends_on {', '.join(entry['unneeded'])} without importing anything from it")
+        if order['not_in_order']:
+            print(f"  Templates not in the deployment order: {', '.join(order['not_in_order'])}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Derive the stack dependency graph from template exports and imports')
+    parser.add_argument('--environment', default='dev', help='Environment used to resolve stack names (default: dev)')
+    parser.add_argument('--customer', help='Customer used to resolve ${Customer} (default: left symbolic)')
+    parser.add_argument('--order-file', default=DEFAULT_ORDER_FILE, help='Deployment order JSON file to diff against')
+    parser.add_argument('--report-file', help='Write the graph report as JSON')
+    parser.add_argument('--strict', action='store_true', help='Also fail when deployment-order.json is missing a derived dependency')
+    parser.add_argument('--cache-dir', default=default_cache_dir(), help='Template summary cache directory (default: $TEMPLATE_CACHE_DIR or .template-cache)')
+    parser.add_argument('--no-cache', action='store_true', help='Always parse the templates')
+
+    args = parser.parse_args()
+
+    graph = ExportGraph(args.environment, TemplateCache(None if args.no_cache else args.cache_dir), args.customer)
+
+    order_stacks = None
+    if args.order_file and os.path.isfile(args.order_file):
+        order_stacks = load_order_stacks(args.order_file)
+        for stack in order_stacks:
+            graph.add_template(stack['name'], stack['template'], stack.get('parameters'))
+
+    known_templates = {os.path.normpath(node['template']) for node in graph.nodes.values()}
+    for template_file in discover_templates():
+        if os.path.normpath(template_file) not in known_templates:
+            graph.add_template(stack_name_for(template_file), template_file)
+
+    graph.build()
+    report = graph.report(order_stacks)
+    print_graph_report(report)
+
+    if args.report_file:
+        with open(args.report_file, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    missing = any(entry['missing'] for entry in (report.get('order') or {}).get('diff', []))
+    if report['cycles'] or report['dangling_imports'] or report['duplicate_exports'] or (args.strict and missing):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
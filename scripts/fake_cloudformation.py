@@ -0,0 +1,1005 @@
+#!/usr/bin/env python3
+"""
+Fake CloudFormation - Local stand-in for the CloudFormation API the deploy tooling calls
+Deploys this repo's templates into an in-memory region: parameters, conditions and intrinsic
+functions are resolved, resources are created in dependency order with per-type latencies on a
+simulated clock, and stacks report the statuses, events, outputs and exports the real service would.
+Failures can be injected per resource; a failed operation rolls back like CloudFormation does
+
+Python callers use FakeOutputsBackend, FakeEventSource and FakeStackDeployer, which implement the
+interfaces of stack_outputs.py, stack_watcher.py and stack_orchestrator.py. Everything else can put
+the `aws` shim on PATH, which answers the `aws cloudformation` calls the scripts and workflows make
+from a state file:
+
+Usage: python scripts/fake_cloudformation.py init --state-file .fake-cfn/state.json --time-scale 0.01
+       python scripts/fake_cloudformation.py install-shim .fake-cfn/bin
+       FAKE_CFN_STATE=.fake-cfn/state.json PATH=.fake-cfn/bin:$PATH python scripts/stack_watcher.py ...
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Any, Optional, Set, Tuple
+
+from cfn_templates import load_template
+from changeset_preview import REPLACEMENT_TABLE, Renderer, property_level, references
+from param_contract import load_parameter_file, parameter_string
+from stack_orchestrator import Deployer, StackSkipped
+from stack_outputs import PAGE_SIZE, OutputsBackend
+from stack_watcher import STACK_RESOURCE_TYPE, EventSource, StackGone
+
+STATE_ENV = 'FAKE_CFN_STATE'
+
+# Simulated seconds to create, update or delete one resource of a type
+DEFAULT_LATENCIES = {
+    'AWS::EC2::VPC': 15.0,
+    'AWS::EC2::Subnet': 5.0,
+    'AWS::EC2::InternetGateway': 15.0,
+    'AWS::EC2::VPCGatewayAttachment': 15.0,
+    'AWS::EC2::EIP': 5.0,
+    'AWS::EC2::NatGateway': 95.0,
+    'AWS::EC2::RouteTable': 3.0,
+    'AWS::EC2::Route': 3.0,
+    'AWS::EC2::SubnetRouteTableAssociation': 2.0,
+    'AWS::EC2::SecurityGroup': 6.0,
+    'AWS::EC2::KeyPair': 2.0,
+    'AWS::EC2::LaunchTemplate': 3.0,
+    'AWS::EC2::FlowLog': 5.0,
+    'AWS::AutoScaling::AutoScalingGroup': 70.0,
+    'AWS::IAM::Role': 15.0,
+    'AWS::IAM::InstanceProfile': 125.0,
+    'AWS::Logs::LogGroup': 2.0,
+    'AWS::S3::Bucket': 25.0,
+    'AWS::RDS::DBInstance': 600.0,
+    'AWS::ElasticLoadBalancingV2::LoadBalancer': 180.0,
+    'AWS::ElasticLoadBalancingV2::TargetGroup': 10.0,
+    'AWS::ElasticLoadBalancingV2::Listener': 3.0
+}
+DEFAULT_LATENCY = 10.0
+
+# Seconds from create-change-set until the change set can execute
+CHANGESET_SECONDS = 8.0
+# Polling delays of the waiters in `aws cloudformation deploy`
+CHANGESET_WAITER_DELAY = 5.0
+STACK_WAITER_DELAY = 30.0
+# describe-stack-events returns the newest events first, this many per page
+EVENTS_PAGE_SIZE = 100
+
+PHYSICAL_PREFIXES = {
+    'AWS::EC2::VPC': 'vpc-',
+    'AWS::EC2::Subnet': 'subnet-',
+    'AWS::EC2::InternetGateway': 'igw-',
+    'AWS::EC2::EIP': 'eipalloc-',
+    'AWS::EC2::NatGateway': 'nat-',
+    'AWS::EC2::RouteTable': 'rtb-',
+    'AWS::EC2::SubnetRouteTableAssociation': 'rtbassoc-',
+    'AWS::EC2::SecurityGroup': 'sg-',
+    'AWS::EC2::LaunchTemplate': 'lt-',
+    'AWS::EC2::FlowLog': 'fl-'
+}
+
+IAM_TYPES = {'AWS::IAM::Role', 'AWS::IAM::InstanceProfile', 'AWS::IAM::Policy', 'AWS::IAM::ManagedPolicy', 'AWS::IAM::User', 'AWS::IAM::Group'}
+
+# `describe-stacks --query` as stack_outputs.AwsCliOutputsBackend writes it
+PREFIX_QUERY = re.compile(r"^Stacks\[\?starts_with\(StackName, '([^']*)'\)\]\.\{StackName: StackName, StackStatus: StackStatus, Outputs: Outputs\}$")
+
+class FakeStackError(Exception):
+    """A request CloudFormation rejects with a ValidationError"""
+
+def status_at(timeline: List[List[Any]], moment: float) -> Optional[List[Any]]:
+    """The last (time, ...) entry of a timeline at a moment"""
+    current = None
+    for entry in timeline:
+        if entry[0] > moment:
+            break
+        current = entry
+    return current
+
+def isoformat(moment: float) -> str:
+    return datetime.fromtimestamp(moment, timezone.utc).isoformat()
+
+class StackRenderer(Renderer):
+    """Renderer that also resolves resource references, attributes, pseudo parameters and imports
+
+    Resources are added as they are provisioned; references to them resolve from then on.
+    """
+
+    def __init__(self, template: Dict[str, Any], parameters: Dict[str, str], pseudo: Dict[str, str], exports: Dict[str, str]):
+        super().__init__(template, parameters)
+        self.parameters.update(pseudo)
+        self.exports = exports
+        self.imported: Set[str] = set()
+        self.physical: Dict[str, Dict[str, str]] = {}
+        self.sub_values: Dict[str, str] = {}
+
+    def add_resource(self, logical_id: str, physical_id: str, attributes: Dict[str, str]) -> None:
+        self.physical[logical_id] = dict(attributes, Ref=physical_id)
+        self.sub_values[logical_id] = physical_id
+        for name, value in attributes.items():
+            self.sub_values[f"{logical_id}.{name}"] = value
+
+    def resolve(self, node: Any) -> Any:
+        if isinstance(node, dict) and len(node) == 1:
+            function, argument = next(iter(node.items()))
+            if function == 'Ref' and argument in self.physical:
+                return self.physical[argument]['Ref']
+            if function == 'Fn::GetAtt':
+                logical_id, attribute = self.resolve(argument)
+                if logical_id not in self.physical:
+                    raise FakeStackError(f"Template error: instance of Fn::GetAtt references undefined resource {logical_id}")
+                return self.physical[logical_id].get(attribute, f"{self.physical[logical_id]['Ref']}.{attribute}")
+            if function == 'Fn::ImportValue':
+                name = self.resolve(argument)
+                if name not in self.exports:
+                    raise FakeStackError(f"No export named {name} found")
+                self.imported.add(name)
+                return self.exports[name]
+        return super().resolve(node)
+
+    def substitute(self, text: str, variables: Dict[str, Any]) -> Any:
+        return super().substitute(text, dict(self.sub_values, **variables))
+
+class FakeCloudFormation:
+    """One region's stacks and exports on a simulated clock
+
+    time_scale is real seconds per simulated second; with 0 every operation has finished by the
+    time anyone looks, and only the event timestamps carry the simulated durations.
+    """
+
+    def __init__(self, region: str = 'eu-north-1', account_id: str = '123456789012', time_scale: float = 0.0,
+                 latencies: Optional[Dict[str, float]] = None, failures: Optional[Dict[str, str]] = None,
+                 failure_rate: float = 0.0, seed: int = 0):
+        self.region = region
+        self.account_id = account_id
+        self.time_scale = time_scale
+        self.latencies = dict(DEFAULT_LATENCIES, **(latencies or {}))
+        # fnmatch pattern of 'stack/LogicalId', 'LogicalId' or resource type -> failure reason
+        self.failures = dict(failures or {})
+        self.failure_rate = failure_rate
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.epoch = time.time()
+        self.stacks: Dict[str, Dict[str, Any]] = {}
+        self.exports: Dict[str, Dict[str, Any]] = {}
+        self.api_calls: Dict[str, int] = {}
+        self._events = 0
+        self._templates: Dict[Tuple[str, float], Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+
+    # Clock
+
+    def clock(self) -> float:
+        """Simulated epoch seconds"""
+        if not self.time_scale:
+            return time.time()
+        return self.epoch + (time.time() - self.epoch) / self.time_scale
+
+    def horizon(self) -> float:
+        """Latest simulated moment that can be observed"""
+        return math.inf if not self.time_scale else self.clock()
+
+    def real_seconds(self, until: float) -> float:
+        """Real seconds until a simulated moment"""
+        return max(0.0, (until - self.clock()) * self.time_scale)
+
+    # Bookkeeping
+
+    def count(self, operation: str, calls: int = 1) -> None:
+        self.api_calls[operation] = self.api_calls.get(operation, 0) + calls
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.api_calls.values())
+
+    def latency(self, resource_type: str) -> float:
+        return self.latencies.get(resource_type, DEFAULT_LATENCY)
+
+    def injected_failure(self, stack_name: str, logical_id: str, resource_type: str) -> Optional[str]:
+        for pattern, reason in self.failures.items():
+            if any(fnmatch.fnmatchcase(key, pattern) for key in (f"{stack_name}/{logical_id}", logical_id, resource_type)):
+                return reason
+        if self.failure_rate and self.rng.random() < self.failure_rate:
+            return 'Injected failure'
+        return None
+
+    def physical_id(self, stack_name: str, logical_id: str, resource_type: str, generation: int) -> str:
+        digest = hashlib.sha1(f"{stack_name}/{logical_id}/{generation}".encode()).hexdigest()
+        if resource_type in PHYSICAL_PREFIXES:
+            return f"{PHYSICAL_PREFIXES[resource_type]}0{digest[:16]}"
+        return f"{stack_name}-{logical_id}-{digest[:12].upper()}"
+
+    def attributes(self, resource_type: str, physical_id: str, properties: Dict[str, Any], version: int) -> Dict[str, str]:
+        """Fn::GetAtt values of a provisioned resource; other attributes read '<physical id>.<name>'"""
+        arn = f"arn:aws:{resource_type.split('::')[1].lower()}:{self.region}:{self.account_id}"
+        if resource_type == 'AWS::EC2::VPC':
+            return {'CidrBlock': str(properties.get('CidrBlock', '')), 'VpcId': physical_id,
+                    'DefaultSecurityGroup': f"sg-0{physical_id[-16:]}"}
+        if resource_type == 'AWS::EC2::Subnet':
+            return {'SubnetId': physical_id, 'AvailabilityZone': str(properties.get('AvailabilityZone', f"{self.region}a"))}
+        if resource_type == 'AWS::EC2::SecurityGroup':
+            return {'GroupId': physical_id}
+        if resource_type == 'AWS::EC2::EIP':
+            digest = int(physical_id[-8:], 16)
+            return {'AllocationId': physical_id, 'PublicIp': f"203.0.{digest >> 8 & 255}.{digest & 255}"}
+        if resource_type == 'AWS::EC2::LaunchTemplate':
+            return {'LatestVersionNumber': str(version), 'DefaultVersionNumber': '1', 'LaunchTemplateId': physical_id}
+        if resource_type in ('AWS::IAM::Role', 'AWS::IAM::InstanceProfile'):
+            kind = 'role' if resource_type == 'AWS::IAM::Role' else 'instance-profile'
+            return {'Arn': f"arn:aws:iam::{self.account_id}:{kind}/{physical_id}"}
+        if resource_type == 'AWS::S3::Bucket':
+            return {'Arn': f"arn:aws:s3:::{physical_id}", 'DomainName': f"{physical_id}.s3.amazonaws.com"}
+        return {'Arn': f"{arn}:{physical_id}"}
+
+    def record_event(self, stack: Dict[str, Any], moment: float, logical_id: str, resource_type: str, status: str,
+                     physical_id: str = '', reason: str = '') -> None:
+        self._events += 1
+        stack['events'].append({
+            'time': moment,
+            'EventId': f"{self._events:012d}",
+            'StackName': stack['name'],
+            'StackId': stack['id'],
+            'LogicalResourceId': logical_id,
+            'PhysicalResourceId': physical_id,
+            'ResourceType': resource_type,
+            'ResourceStatus': status,
+            'ResourceStatusReason': reason
+        })
+
+    def set_status(self, stack: Dict[str, Any], moment: float, status: str, reason: str = '') -> None:
+        stack['statuses'].append([moment, status, reason])
+        self.record_event(stack, moment, stack['name'], STACK_RESOURCE_TYPE, status, stack['id'], reason)
+
+    # Stack state as of now
+
+    def live_stack(self, stack_name: str) -> Optional[Dict[str, Any]]:
+        """The stack unless it does not exist (yet) or its deletion has completed"""
+        stack = self.stacks.get(stack_name)
+        if stack is None:
+            return None
+        current = status_at(stack['statuses'], self.horizon())
+        if current is None or current[1] == 'DELETE_COMPLETE':
+            return None
+        return stack
+
+    def stack_status(self, stack: Dict[str, Any]) -> List[Any]:
+        return status_at(stack['statuses'], self.horizon())
+
+    def available_exports(self, importer: Optional[str] = None) -> Dict[str, str]:
+        moment = self.horizon()
+        return {
+            name: export['value'] for name, export in self.exports.items()
+            if export['available'] <= moment and export['stack'] != importer
+        }
+
+    def describe(self, stack: Dict[str, Any]) -> Dict[str, Any]:
+        moment, status, reason = self.stack_status(stack)
+        outputs = (status_at(stack['outputs'], self.horizon()) or [0, []])[1]
+        description = {
+            'StackId': stack['id'],
+            'StackName': stack['name'],
+            'CreationTime': isoformat(stack['created']),
+            'LastUpdatedTime': isoformat(moment),
+            'StackStatus': status,
+            'Parameters': [{'ParameterKey': key, 'ParameterValue': value} for key, value in stack['parameters'].items()],
+            'Capabilities': stack['capabilities']
+        }
+        if reason:
+            description['StackStatusReason'] = reason
+        if outputs:
+            description['Outputs'] = outputs
+        return description
+
+    # Template handling
+
+    def render_parameters(self, template: Dict[str, Any], overrides: Dict[str, str],
+                          previous: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Template parameters from the overrides, the previous deploy and the defaults, as `deploy` merges them"""
+        values = {}
+        missing = []
+        for name, spec in (template.get('Parameters') or {}).items():
+            spec = spec or {}
+            if name in overrides:
+                value = overrides[name]
+            elif previous and name in previous:
+                value = previous[name]
+            elif 'Default' in spec:
+                value = parameter_string(spec['Default'])
+            else:
+                missing.append(name)
+                continue
+            allowed = [parameter_string(item) for item in spec.get('AllowedValues') or []]
+            if allowed and value not in allowed:
+                raise FakeStackError(f"Parameter '{name}' must be one of AllowedValues")
+            pattern = spec.get('AllowedPattern')
+            if pattern and value and not re.fullmatch(pattern, value):
+                raise FakeStackError(f"Parameter '{name}' must match pattern {pattern}")
+            values[name] = value
+        if missing:
+            raise FakeStackError(f"Parameters: [{', '.join(missing)}] must have values")
+        return values
+
+    def check_capabilities(self, template: Dict[str, Any], capabilities: List[str]) -> None:
+        named = unnamed = False
+        for resource in (template.get('Resources') or {}).values():
+            if resource.get('Type') in IAM_TYPES:
+                name_property = (REPLACEMENT_TABLE.get(resource['Type']) or {}).get('name')
+                if name_property and name_property in (resource.get('Properties') or {}):
+                    named = True
+                else:
+                    unnamed = True
+        if named and 'CAPABILITY_NAMED_IAM' not in capabilities:
+            raise FakeStackError("Requires capabilities : [CAPABILITY_NAMED_IAM]")
+        if unnamed and not {'CAPABILITY_IAM', 'CAPABILITY_NAMED_IAM'} & set(capabilities):
+            raise FakeStackError("Requires capabilities : [CAPABILITY_IAM]")
+
+    def ordered_resources(self, template: Dict[str, Any], renderer: StackRenderer) -> List[Tuple[str, Dict[str, Any], Set[str]]]:
+        """(logical id, resource, dependencies) of the resources whose Condition holds, dependencies first"""
+        resources = {
+            logical_id: resource for logical_id, resource in (template.get('Resources') or {}).items()
+            if 'Condition' not in resource or renderer.condition(resource['Condition'])
+        }
+        dependencies = {}
+        for logical_id, resource in resources.items():
+            depends_on = resource.get('DependsOn') or []
+            depends_on = [depends_on] if isinstance(depends_on, str) else depends_on
+            found = {name for name, _ in references(resource.get('Properties') or {}, set())}
+            dependencies[logical_id] = (found | set(depends_on)) & set(resources)
+
+        ordered = []
+        remaining = dict(dependencies)
+        while remaining:
+            ready = [logical_id for logical_id, deps in remaining.items() if not deps & set(remaining)]
+            if not ready:
+                raise FakeStackError(f"Circular dependency between resources: [{', '.join(sorted(remaining))}]")
+            for logical_id in ready:
+                ordered.append((logical_id, resources[logical_id], dependencies[logical_id]))
+                del remaining[logical_id]
+        return ordered
+
+    # Operations
+
+    def deploy(self, template_file: str, stack_name: str, parameters: Optional[Dict[str, str]] = None,
+               capabilities: Optional[List[str]] = None, fail_on_empty_changeset: bool = False,
+               template: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """What `aws cloudformation deploy` does: create a change set, execute it, wait for the stack
+
+        Returns {'stack_name', 'operation', 'status', 'finish'}; the operation is 'create', 'update'
+        or 'none' for an empty change set. Raises FakeStackError where the CLI fails before executing.
+        """
+        if template is None:
+            template = self.read_template(template_file)
+        parameters = parameters or {}
+        capabilities = list(capabilities or [])
+
+        with self._lock:
+            self.count('DescribeStacks')
+            stack = self.live_stack(stack_name)
+            start = self.clock()
+            if stack is not None:
+                current = self.stack_status(stack)[1]
+                if current.endswith('_IN_PROGRESS') or current in ('ROLLBACK_COMPLETE', 'ROLLBACK_FAILED', 'DELETE_FAILED'):
+                    raise FakeStackError(f"Stack:{stack['id']} is in {current} state and can not be updated.")
+                start = max(start, stack['finish'])
+
+            self.count('CreateChangeSet')
+            self.check_capabilities(template, capabilities)
+            values = self.render_parameters(template, parameters, stack['parameters'] if stack else None)
+            pseudo = {
+                'AWS::StackName': stack_name,
+                'AWS::Region': self.region,
+                'AWS::AccountId': self.account_id,
+                'AWS::Partition': 'aws',
+                'AWS::URLSuffix': 'amazonaws.com',
+                'AWS::StackId': stack['id'] if stack else f"arn:aws:cloudformation:{self.region}:{self.account_id}:stack/{stack_name}/"
+                                                         f"{hashlib.sha1(f'{stack_name}/{start}'.encode()).hexdigest()[:32]}"
+            }
+            renderer = StackRenderer(template, values, pseudo, self.available_exports(stack_name))
+            ordered = self.ordered_resources(template, renderer)
+            self.count('DescribeChangeSet', max(1, math.ceil(CHANGESET_SECONDS / CHANGESET_WAITER_DELAY)))
+
+            if stack is None:
+                stack = {
+                    'name': stack_name, 'id': pseudo['AWS::StackId'], 'created': start, 'finish': start,
+                    'statuses': [], 'outputs': [], 'events': [], 'resources': {}, 'parameters': {},
+                    'capabilities': capabilities, 'imports': [], 'generation': 0
+                }
+                self.set_status(stack, start, 'REVIEW_IN_PROGRESS', 'User Initiated')
+                self.stacks[stack_name] = stack
+                operation = 'create'
+            elif stack['resources'] or self.stack_status(stack)[1] != 'REVIEW_IN_PROGRESS':
+                operation = 'update'
+            else:
+                operation = 'create'
+
+            plan = self.plan_changes(stack, ordered, renderer, start + CHANGESET_SECONDS, operation)
+            outputs = self.render_outputs(template, renderer)
+            changed = plan['actions'] or values != stack['parameters'] or outputs != (stack['outputs'][-1][1] if stack['outputs'] else [])
+            if operation == 'update' and not changed:
+                if fail_on_empty_changeset:
+                    raise FakeStackError(f"No changes to deploy. Stack {stack_name} is up to date")
+                return {'stack_name': stack_name, 'operation': 'none', 'status': self.stack_status(stack)[1], 'finish': stack['finish']}
+
+            self.check_exports(stack, outputs, renderer.imported)
+            self.count('ExecuteChangeSet')
+            status = self.execute(stack, plan, operation, values, outputs, renderer.imported, capabilities)
+            self.count('DescribeStacks', max(1, math.ceil((stack['finish'] - start) / STACK_WAITER_DELAY)))
+            return {'stack_name': stack_name, 'operation': operation, 'status': status, 'finish': stack['finish']}
+
+    def read_template(self, template_file: str) -> Dict[str, Any]:
+        """A template file, parsed once per modification"""
+        key = (os.path.abspath(template_file), os.path.getmtime(template_file))
+        if key not in self._templates:
+            with open(template_file, 'rb') as f:
+                self._templates[key] = load_template(f.read())
+        return self._templates[key]
+
+    def render_outputs(self, template: Dict[str, Any], renderer: StackRenderer) -> List[Dict[str, str]]:
+        outputs = []
+        for name, output in (template.get('Outputs') or {}).items():
+            if 'Condition' in output and not renderer.condition(output['Condition']):
+                continue
+            entry = {'OutputKey': name, 'OutputValue': parameter_string(renderer.resolve(output.get('Value')))}
+            if output.get('Description'):
+                entry['Description'] = output['Description']
+            if (output.get('Export') or {}).get('Name') is not None:
+                entry['ExportName'] = parameter_string(renderer.resolve(output['Export']['Name']))
+            outputs.append(entry)
+        return outputs
+
+    def check_exports(self, stack: Dict[str, Any], outputs: List[Dict[str, str]], imported: Set[str]) -> None:
+        """Export names are unique per region and an imported export cannot change or go away"""
+        new_exports = {output['ExportName']: output['OutputValue'] for output in outputs if 'ExportName' in output}
+        for name in new_exports:
+            owner = self.exports.get(name)
+            if owner and owner['stack'] != stack['name']:
+                raise FakeStackError(f"Export with name {name} is already exported by stack {owner['stack']}")
+        for name, export in self.exports.items():
+            if export['stack'] != stack['name'] or new_exports.get(name) == export['value']:
+                continue
+            importers = sorted(importer for importer in export['importers'] if importer != stack['name'])
+            if importers:
+                action = 'update' if name in new_exports else 'delete'
+                raise FakeStackError(f"Cannot {action} export {name} as it is in use by {', '.join(importers)}")
+
+    def plan_changes(self, stack: Dict[str, Any], ordered: List[Tuple[str, Dict[str, Any], Set[str]]],
+                     renderer: StackRenderer, start: float, operation: str) -> Dict[str, Any]:
+        """Resolve every resource and schedule the ones that change; unchanged resources take no time"""
+        old_resources = stack['resources']
+        generation = stack['generation'] + 1
+        finish: Dict[str, float] = {}
+        actions = []
+        resources = {}
+
+        for logical_id, resource, dependencies in ordered:
+            resource_type = resource.get('Type')
+            properties = renderer.resolve(resource.get('Properties') or {})
+            old = old_resources.get(logical_id)
+            ready = max([start] + [finish[dep] for dep in dependencies if dep in finish])
+
+            if old is None or old['type'] != resource_type:
+                action = 'create'
+            elif old['properties'] != properties:
+                changed = {key for key in properties.keys() | old['properties'].keys() if properties.get(key) != old['properties'].get(key)}
+                action = 'replace' if any(property_level(resource_type, key) == 'replacement' for key in changed) else 'update'
+            else:
+                action = None
+
+            if action is None:
+                entry = old
+            else:
+                physical_id = old['physical'] if action == 'update' else self.physical_id(stack['name'], logical_id, resource_type, generation)
+                version = old['version'] + 1 if action == 'update' else 1
+                entry = {
+                    'type': resource_type,
+                    'physical': physical_id,
+                    'properties': properties,
+                    'attributes': self.attributes(resource_type, physical_id, properties, version),
+                    'version': version,
+                    'retain': resource.get('DeletionPolicy') == 'Retain',
+                    'depends_on': sorted(dependencies)
+                }
+                finish[logical_id] = ready + self.latency(resource_type)
+                actions.append({'logical_id': logical_id, 'action': action, 'start': ready, 'finish': finish[logical_id],
+                                'entry': entry, 'old': old})
+            resources[logical_id] = entry
+            renderer.add_resource(logical_id, entry['physical'], entry['attributes'])
+
+        removed = [logical_id for logical_id in old_resources if logical_id not in resources]
+        return {'start': start, 'actions': actions, 'resources': resources, 'removed': removed, 'generation': generation}
+
+    def execute(self, stack: Dict[str, Any], plan: Dict[str, Any], operation: str, values: Dict[str, str],
+                outputs: List[Dict[str, str]], imported: Set[str], capabilities: List[str]) -> str:
+        """Record the operation's events and its final state; returns the final stack status"""
+        start = plan['start']
+        prefix = 'CREATE' if operation == 'create' else 'UPDATE'
+        self.set_status(stack, start, f"{prefix}_IN_PROGRESS", 'User Initiated')
+
+        failure = None
+        for action in sorted(plan['actions'], key=lambda action: action['finish']):
+            entry = action['entry']
+            if action['action'] == 'replace' and self.custom_name(entry):
+                failure = (action, f"CloudFormation cannot update a stack when a custom-named resource requires replacing. "
+                                   f"Rename {self.custom_name(entry)} and update the stack again.")
+                break
+            reason = self.injected_failure(stack['name'], action['logical_id'], entry['type'])
+            if reason:
+                failure = (action, reason)
+                break
+
+        if failure is None:
+            return self.complete(stack, plan, operation, values, outputs, imported, capabilities)
+
+        failed_action, reason = failure
+        # A custom-named replacement fails as soon as it starts; anything else when it would have finished
+        failed_at = failed_action['start'] if reason.startswith('CloudFormation cannot update') else failed_action['finish']
+        started = []
+        for action in plan['actions']:
+            if action['start'] > failed_at or (action['start'] == failed_at and action is not failed_action):
+                continue
+            entry = action['entry']
+            verb = 'CREATE' if action['action'] in ('create', 'replace') else 'UPDATE'
+            self.record_event(stack, action['start'], action['logical_id'], entry['type'], f"{verb}_IN_PROGRESS", entry['physical'],
+                              'Requested update requires the creation of a new physical resource; hence creating one.'
+                              if action['action'] == 'replace' else '')
+            if action is failed_action:
+                self.record_event(stack, failed_at, action['logical_id'], entry['type'], f"{verb}_FAILED", entry['physical'], reason)
+            elif action['finish'] <= failed_at:
+                self.record_event(stack, action['finish'], action['logical_id'], entry['type'], f"{verb}_COMPLETE", entry['physical'])
+                started.append(action)
+            else:
+                self.record_event(stack, failed_at, action['logical_id'], entry['type'], f"{verb}_FAILED", entry['physical'],
+                                  f"Resource {verb.lower()} cancelled")
+                started.append(action)
+
+        if operation == 'create':
+            self.set_status(stack, failed_at, 'ROLLBACK_IN_PROGRESS',
+                            f"The following resource(s) failed to create: [{failed_action['logical_id']}]. Rollback requested by user.")
+        else:
+            self.set_status(stack, failed_at, 'UPDATE_ROLLBACK_IN_PROGRESS',
+                            f"The following resource(s) failed to update: [{failed_action['logical_id']}].")
+
+        # Created resources are deleted and updated ones restored, all at once
+        end = failed_at
+        for action in started:
+            entry = action['entry']
+            seconds = self.latency(entry['type']) / 2
+            if action['action'] == 'update':
+                old = action['old']
+                self.record_event(stack, failed_at, action['logical_id'], old['type'], 'UPDATE_IN_PROGRESS', old['physical'])
+                self.record_event(stack, failed_at + seconds, action['logical_id'], old['type'], 'UPDATE_COMPLETE', old['physical'])
+            else:
+                self.record_event(stack, failed_at, action['logical_id'], entry['type'], 'DELETE_IN_PROGRESS', entry['physical'])
+                self.record_event(stack, failed_at + seconds, action['logical_id'], entry['type'], 'DELETE_COMPLETE', entry['physical'])
+            end = max(end, failed_at + seconds)
+
+        if operation == 'create':
+            stack['resources'] = {}
+            self.set_status(stack, end, 'ROLLBACK_COMPLETE')
+        else:
+            self.set_status(stack, end, 'UPDATE_ROLLBACK_COMPLETE_CLEANUP_IN_PROGRESS')
+            self.set_status(stack, end, 'UPDATE_ROLLBACK_COMPLETE')
+        stack['finish'] = end
+        return self.stack_status_at(stack, end)
+
+    def custom_name(self, entry: Dict[str, Any]) -> Optional[str]:
+        name_property = (REPLACEMENT_TABLE.get(entry['type']) or {}).get('name')
+        return entry['properties'].get(name_property) if name_property else None
+
+    def complete(self, stack: Dict[str, Any], plan: Dict[str, Any], operation: str, values: Dict[str, str],
+                 outputs: List[Dict[str, str]], imported: Set[str], capabilities: List[str]) -> str:
+        end = plan['start']
+        for action in plan['actions']:
+            entry = action['entry']
+            verb = 'CREATE' if action['action'] in ('create', 'replace') else 'UPDATE'
+            reason = ('Requested update requires the creation of a new physical resource; hence creating one.'
+                      if action['action'] == 'replace' else '')
+            self.record_event(stack, action['start'], action['logical_id'], entry['type'], f"{verb}_IN_PROGRESS", entry['physical'], reason)
+            self.record_event(stack, action['finish'], action['logical_id'], entry['type'], f"{verb}_COMPLETE", entry['physical'])
+            end = max(end, action['finish'])
+
+        if operation == 'update':
+            # Replaced and removed resources are deleted once everything else is in place
+            self.set_status(stack, end, 'UPDATE_COMPLETE_CLEANUP_IN_PROGRESS')
+            cleanup = end
+            stale = [(action['logical_id'], action['old']) for action in plan['actions'] if action['action'] == 'replace']
+            stale += [(logical_id, stack['resources'][logical_id]) for logical_id in plan['removed']]
+            for logical_id, old in stale:
+                if old['retain']:
+                    self.record_event(stack, end, logical_id, old['type'], 'DELETE_SKIPPED', old['physical'])
+                    continue
+                seconds = self.latency(old['type']) / 2
+                self.record_event(stack, end, logical_id, old['type'], 'DELETE_IN_PROGRESS', old['physical'])
+                self.record_event(stack, end + seconds, logical_id, old['type'], 'DELETE_COMPLETE', old['physical'])
+                cleanup = max(cleanup, end + seconds)
+            end = cleanup
+
+        self.set_status(stack, end, f"{'CREATE' if operation == 'create' else 'UPDATE'}_COMPLETE")
+        stack.update(finish=end, resources=plan['resources'], parameters=values, capabilities=capabilities,
+                     generation=plan['generation'])
+        stack['outputs'].append([end, outputs])
+
+        # Exports appear when the stack completes; imports are tracked so exports in use stay put
+        for name in [name for name, export in self.exports.items() if export['stack'] == stack['name']]:
+            if not any(output.get('ExportName') == name for output in outputs):
+                del self.exports[name]
+        for output in outputs:
+            if 'ExportName' in output:
+                export = self.exports.setdefault(output['ExportName'], {'stack': stack['name'], 'importers': []})
+                export.update(value=output['OutputValue'], available=end)
+        for name, export in self.exports.items():
+            importers = set(export['importers']) - {stack['name']}
+            export['importers'] = sorted(importers | ({stack['name']} if name in imported else set()))
+        stack['imports'] = sorted(imported)
+        return self.stack_status_at(stack, end)
+
+    def stack_status_at(self, stack: Dict[str, Any], moment: float) -> str:
+        return status_at(stack['statuses'], moment)[1]
+
+    def delete_stack(self, stack_name: str) -> None:
+        """Delete a stack's resources, dependents first; deleting a missing stack is not an error"""
+        with self._lock:
+            self.count('DeleteStack')
+            stack = self.live_stack(stack_name)
+            if stack is None:
+                return
+            status = self.stack_status(stack)[1]
+            if status.endswith('_IN_PROGRESS') and status != 'REVIEW_IN_PROGRESS':
+                raise FakeStackError(f"Stack {stack_name} is in {status} state and can not be deleted")
+            for name, export in self.exports.items():
+                importers = [importer for importer in export['importers'] if importer != stack_name]
+                if export['stack'] == stack_name and importers:
+                    raise FakeStackError(f"Export {name} cannot be deleted as it is in use by {', '.join(importers)}")
+
+            start = max(self.clock(), stack['finish'])
+            self.set_status(stack, start, 'DELETE_IN_PROGRESS', 'User Initiated')
+
+            # A resource is deleted once everything depending on it is gone
+            dependents: Dict[str, Set[str]] = {logical_id: set() for logical_id in stack['resources']}
+            for logical_id, entry in stack['resources'].items():
+                for dependency in entry['depends_on']:
+                    if dependency in dependents:
+                        dependents[dependency].add(logical_id)
+
+            finish: Dict[str, float] = {}
+
+            def delete(logical_id: str, seen: Set[str]) -> float:
+                if logical_id not in finish:
+                    seen = seen | {logical_id}
+                    ready = max([start] + [delete(dependent, seen) for dependent in dependents[logical_id] if dependent not in seen])
+                    entry = stack['resources'][logical_id]
+                    if entry['retain']:
+                        self.record_event(stack, ready, logical_id, entry['type'], 'DELETE_SKIPPED', entry['physical'])
+                        finish[logical_id] = ready
+                    else:
+                        finish[logical_id] = ready + self.latency(entry['type']) / 2
+                        self.record_event(stack, ready, logical_id, entry['type'], 'DELETE_IN_PROGRESS', entry['physical'])
+                        self.record_event(stack, finish[logical_id], logical_id, entry['type'], 'DELETE_COMPLETE', entry['physical'])
+                return finish[logical_id]
+
+            end = max([start] + [delete(logical_id, set()) for logical_id in stack['resources']])
+            self.set_status(stack, end, 'DELETE_COMPLETE')
+            stack.update(finish=end, resources={})
+            for name in [name for name, export in self.exports.items() if export['stack'] == stack_name]:
+                del self.exports[name]
+            for export in self.exports.values():
+                export['importers'] = [importer for importer in export['importers'] if importer != stack_name]
+
+    def describe_stacks(self, stack_name: Optional[str] = None, next_token: Optional[str] = None) -> Dict[str, Any]:
+        """One DescribeStacks call: a single stack, or a page of the region's stacks"""
+        with self._lock:
+            self.count('DescribeStacks')
+            if stack_name:
+                stack = self.live_stack(stack_name)
+                if stack is None:
+                    raise FakeStackError(f"Stack with id {stack_name} does not exist")
+                return {'Stacks': [self.describe(stack)]}
+
+            names = sorted(name for name in self.stacks if self.live_stack(name) is not None)
+            start = int(next_token or 0)
+            page = {'Stacks': [self.describe(self.stacks[name]) for name in names[start:start + PAGE_SIZE]]}
+            if start + PAGE_SIZE < len(names):
+                page['NextToken'] = str(start + PAGE_SIZE)
+            return page
+
+    def describe_stack_events(self, stack_name: str, paginate: bool = False) -> Dict[str, Any]:
+        """The stack's events so far, newest first; one page unless paginate"""
+        with self._lock:
+            stack = self.live_stack(stack_name)
+            moment = self.horizon()
+            visible = [event for event in (stack or {}).get('events', []) if event['time'] <= moment]
+            pages = max(1, math.ceil(len(visible) / EVENTS_PAGE_SIZE)) if paginate else 1
+            self.count('DescribeStackEvents', pages)
+            if stack is None:
+                raise FakeStackError(f"Stack [{stack_name}] does not exist")
+
+            visible.sort(key=lambda event: (event['time'], event['EventId']), reverse=True)
+            if not paginate:
+                visible = visible[:EVENTS_PAGE_SIZE]
+            return {'StackEvents': [
+                dict({key: value for key, value in event.items() if key != 'time'}, Timestamp=isoformat(event['time']))
+                for event in visible
+            ]}
+
+    def list_exports(self) -> Dict[str, Any]:
+        with self._lock:
+            self.count('ListExports')
+            moment = self.horizon()
+            return {'Exports': [
+                {'ExportingStackId': self.stacks[export['stack']]['id'], 'Name': name, 'Value': export['value']}
+                for name, export in sorted(self.exports.items()) if export['available'] <= moment
+            ]}
+
+    def wait(self, stack_name: str) -> str:
+        """Sleep until the stack's current operation has finished; returns its final status"""
+        stack = self.stacks.get(stack_name)
+        if stack is None:
+            raise FakeStackError(f"Stack with id {stack_name} does not exist")
+        time.sleep(self.real_seconds(stack['finish']))
+        return self.stack_status_at(stack, stack['finish'])
+
+    # State file, for the CLI shim
+
+    def to_state(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'region': self.region, 'account_id': self.account_id, 'time_scale': self.time_scale,
+                'latencies': self.latencies, 'failures': self.failures, 'failure_rate': self.failure_rate,
+                'seed': self.seed, 'epoch': self.epoch, 'events': self._events, 'api_calls': self.api_calls,
+                'stacks': self.stacks, 'exports': self.exports
+            }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'FakeCloudFormation':
+        fake = cls(state['region'], state['account_id'], state['time_scale'], state['latencies'], state['failures'],
+                   state['failure_rate'], state['seed'])
+        fake.epoch = state['epoch']
+        fake._events = state['events']
+        fake.api_calls = state['api_calls']
+        fake.stacks = state['stacks']
+        fake.exports = state['exports']
+        # Later processes draw different injected failures than earlier ones
+        fake.rng = random.Random(f"{state['seed']}-{state['events']}")
+        return fake
+
+    def save(self, state_file: str) -> None:
+        os.makedirs(os.path.dirname(state_file) or '.', exist_ok=True)
+        tmp_file = f"{state_file}.tmp.{os.getpid()}"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.to_state(), f)
+        os.replace(tmp_file, state_file)
+
+class FakeOutputsBackend(OutputsBackend):
+    """describe-stacks against the fake, paging like the API"""
+
+    def __init__(self, cloudformation: FakeCloudFormation):
+        self.cloudformation = cloudformation
+        self.api_calls = 0
+
+    def describe_stacks(self, prefix: str, stack_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        if stack_name:
+            self.api_calls += 1
+            try:
+                return self.cloudformation.describe_stacks(stack_name)['Stacks']
+            except FakeStackError:
+                return []
+
+        stacks = []
+        next_token = None
+        while True:
+            self.api_calls += 1
+            page = self.cloudformation.describe_stacks(next_token=next_token)
+            stacks.extend(stack for stack in page['Stacks'] if stack['StackName'].startswith(prefix))
+            next_token = page.get('NextToken')
+            if not next_token:
+                return stacks
+
+class FakeEventSource(EventSource):
+    """describe-stack-events against the fake"""
+
+    def __init__(self, cloudformation: FakeCloudFormation, latency: float = 0.0):
+        self.cloudformation = cloudformation
+        self.latency = latency
+        self.calls = 0
+
+    async def stack_events(self, stack_name: str) -> List[Dict[str, Any]]:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        try:
+            return self.cloudformation.describe_stack_events(stack_name)['StackEvents']
+        except FakeStackError:
+            raise StackGone(stack_name)
+
+class FakeStackDeployer(Deployer):
+    """stack_orchestrator deployer that deploys deployment-order stacks into the fake"""
+
+    def __init__(self, cloudformation: FakeCloudFormation, capabilities: Optional[List[str]] = None):
+        self.cloudformation = cloudformation
+        self.capabilities = capabilities or ['CAPABILITY_IAM', 'CAPABILITY_NAMED_IAM']
+
+    def deploy(self, stack: Dict[str, Any], stack_name: str) -> None:
+        # Same rule as AwsCliDeployer, so a rehearsal skips what a real deploy would skip
+        if not os.path.isfile(stack['template']) or not os.path.isfile(stack.get('parameters', '')):
+            raise StackSkipped(f"Template or parameter file not found for {stack['name']}")
+
+        parameters = load_parameter_file(stack['parameters'])
+        try:
+            result = self.cloudformation.deploy(stack['template'], stack_name, parameters, self.capabilities)
+        except FakeStackError as e:
+            raise RuntimeError(f"aws cloudformation deploy failed for {stack_name}: {e}")
+        status = self.cloudformation.wait(stack_name) if result['operation'] != 'none' else result['status']
+        if status not in ('CREATE_COMPLETE', 'UPDATE_COMPLETE'):
+            raise RuntimeError(f"aws cloudformation deploy failed for {stack_name}: stack is {status}")
+
+@contextmanager
+def locked_state(state_file: str) -> Iterator[FakeCloudFormation]:
+    """The fake loaded from the state file, saved back on success; one process at a time"""
+    import fcntl
+
+    os.makedirs(os.path.dirname(state_file) or '.', exist_ok=True)
+    with open(f"{state_file}.lock", 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        with open(state_file, 'r', encoding='utf-8') as f:
+            fake = FakeCloudFormation.from_state(json.load(f))
+        yield fake
+        fake.save(state_file)
+
+def parse_overrides(values: List[str]) -> Dict[str, str]:
+    """--parameter-overrides as the CLI takes them: file://params.json or Key=Value pairs"""
+    parameters = {}
+    for value in values:
+        if value.startswith('file://'):
+            parameters.update(load_parameter_file(value[len('file://'):]))
+        else:
+            key, _, item = value.partition('=')
+            parameters[key] = item
+    return parameters
+
+def aws_error(operation: str, message: str) -> None:
+    print(f"\nAn error occurred (ValidationError) when calling the {operation} operation: {message}", file=sys.stderr)
+    sys.exit(254)
+
+def run_aws(argv: List[str], state_file: str) -> None:
+    """Answer an `aws cloudformation ...` command line from the state file"""
+    parser = argparse.ArgumentParser(prog='aws cloudformation')
+    parser.add_argument('operation', choices=['deploy', 'describe-stacks', 'describe-stack-events', 'list-exports', 'delete-stack'])
+    parser.add_argument('--stack-name')
+    parser.add_argument('--template-file')
+    parser.add_argument('--parameter-overrides', nargs='*', default=[])
+    parser.add_argument('--capabilities', nargs='*', default=[])
+    parser.add_argument('--tags', nargs='*', default=[])
+    parser.add_argument('--no-fail-on-empty-changeset', action='store_true')
+    parser.add_argument('--no-paginate', action='store_true')
+    parser.add_argument('--query')
+    parser.add_argument('--region')
+    parser.add_argument('--output', default='json')
+    args = parser.parse_args(argv)
+
+    if args.operation == 'deploy':
+        with locked_state(state_file) as fake:
+            print("\nWaiting for changeset to be created..")
+            try:
+                result = fake.deploy(args.template_file, args.stack_name, parse_overrides(args.parameter_overrides),
+                                     args.capabilities, fail_on_empty_changeset=not args.no_fail_on_empty_changeset)
+            except FakeStackError as e:
+                print(f"\nFailed to create the changeset: {e}", file=sys.stderr)
+                sys.exit(255)
+        if result['operation'] == 'none':
+            print(f"\nNo changes to deploy. Stack {args.stack_name} is up to date")
+            return
+        print(f"Waiting for stack {result['operation']} to complete")
+        time.sleep(fake.real_seconds(result['finish']))
+        if result['status'] not in ('CREATE_COMPLETE', 'UPDATE_COMPLETE'):
+            print(f"\nFailed to create/update the stack. Run the following command\nto fetch the list of events leading up to the failure\n"
+                  f"aws cloudformation describe-stack-events --stack-name {args.stack_name}", file=sys.stderr)
+            sys.exit(255)
+        print(f"Successfully created/updated stack - {args.stack_name}")
+        return
+
+    with locked_state(state_file) as fake:
+        try:
+            if args.operation == 'describe-stacks':
+                stacks = []
+                next_token = None
+                while True:
+                    page = fake.describe_stacks(args.stack_name, next_token)
+                    stacks += page['Stacks']
+                    next_token = page.get('NextToken')
+                    if not next_token:
+                        break
+                result: Any = {'Stacks': stacks}
+                if args.query:
+                    match = PREFIX_QUERY.match(args.query)
+                    if not match:
+                        print(f"fake_cloudformation: unsupported --query: {args.query}", file=sys.stderr)
+                        sys.exit(252)
+                    result = [
+                        {'StackName': stack['StackName'], 'StackStatus': stack['StackStatus'], 'Outputs': stack.get('Outputs')}
+                        for stack in stacks if stack['StackName'].startswith(match.group(1))
+                    ]
+            elif args.operation == 'describe-stack-events':
+                result = fake.describe_stack_events(args.stack_name, paginate=not args.no_paginate)
+            elif args.operation == 'list-exports':
+                result = fake.list_exports()
+            else:
+                fake.delete_stack(args.stack_name)
+                return
+        except FakeStackError as e:
+            operation = ''.join(part.title() for part in args.operation.split('-'))
+            aws_error(operation, str(e))
+    print(json.dumps(result, indent=4))
+
+def parse_assignments(values: List[str], option: str) -> Dict[str, str]:
+    assignments = {}
+    for value in values:
+        key, separator, item = value.rpartition('=')
+        if not separator or not key:
+            raise SystemExit(f"{option} takes PATTERN=VALUE, got {value!r}")
+        assignments[key] = item
+    return assignments
+
+def main():
+    argv = sys.argv[1:]
+    state_file = os.environ.get(STATE_ENV, '.fake-cfn/state.json')
+
+    # Called as the `aws` shim
+    if argv[:1] == ['cloudformation']:
+        run_aws(argv[1:], state_file)
+        return
+
+    parser = argparse.ArgumentParser(description='Local CloudFormation stand-in for the deploy tooling')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    init = subparsers.add_parser('init', help='Create an empty fake region in a state file')
+    init.add_argument('--state-file', default=state_file, help=f"State file (default: ${STATE_ENV} or .fake-cfn/state.json)")
+    init.add_argument('--region', default=os.environ.get('AWS_REGION', 'eu-north-1'), help='Region the stacks live in')
+    init.add_argument('--time-scale', type=float, default=0.0, help='Real seconds per simulated second (0: operations finish at once)')
+    init.add_argument('--latency', nargs='*', default=[], metavar='TYPE=SECONDS', help='Override per-resource-type latencies')
+    init.add_argument('--fail', nargs='*', default=[], metavar='PATTERN=REASON',
+                      help="Fail resources matching 'stack/LogicalId', 'LogicalId' or a resource type (fnmatch patterns)")
+    init.add_argument('--failure-rate', type=float, default=0.0, help='Chance that any resource operation fails')
+    init.add_argument('--seed', type=int, default=0, help='Random seed for --failure-rate')
+
+    shim = subparsers.add_parser('install-shim', help='Write an `aws` executable that answers from the state file')
+    shim.add_argument('directory', help='Directory to put on PATH')
+
+    stats = subparsers.add_parser('stats', help='Print the API calls made against the state file')
+    stats.add_argument('--state-file', default=state_file, help=f"State file (default: ${STATE_ENV} or .fake-cfn/state.json)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'init':
+        latencies = {key: float(value) for key, value in parse_assignments(args.latency, '--latency').items()}
+        fake = FakeCloudFormation(args.region, time_scale=args.time_scale, latencies=latencies,
+                                  failures=parse_assignments(args.fail, '--fail'), failure_rate=args.failure_rate, seed=args.seed)
+        fake.save(args.state_file)
+        print(f"✅ Fake CloudFormation region {args.region} initialized: {args.state_file}")
+    elif args.command == 'install-shim':
+        os.makedirs(args.directory, exist_ok=True)
+        path = os.path.join(args.directory, 'aws')
+        with open(path, 'w') as f:
+            f.write(f"#!/bin/sh\nexec {sys.executable} {os.path.abspath(__file__)} \"$@\"\n")
+        os.chmod(path, 0o755)
+        print(f"✅ aws shim written: {path} (set ${STATE_ENV} and put {args.directory} first on PATH)")
+    else:
+        with open(args.state_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        fake = FakeCloudFormation.from_state(state)
+        print(f"Stacks: {sum(1 for name in fake.stacks if fake.live_stack(name) is not None)}, exports: {len(fake.exports)}")
+        for operation, calls in sorted(fake.api_calls.items()):
+            print(f"  {operation:<22} {calls:>7}")
+        print(f"  {'total':<22} {fake.total_calls:>7}")
+
+if __name__ == '__main__':
+    main()
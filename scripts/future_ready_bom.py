@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Future-Ready BOM Parser - Native replacement for parse-future-ready-csv.sh
+Reads the ResourceType,ResourceName,Action,Configuration,Value,Dependencies,Environment
+format in a single pass and writes every generated-params/*-params.json file at once
+Output is byte-identical to the shell script
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List, Tuple
+
+PARAMETER_FILES = {
+    'vpc': 'vpc-params.json',
+    'subnet': 'subnet-params.json',
+    'igw': 'igw-params.json',
+    'nat': 'nat-params.json',
+    'security-group': 'security-group-params.json',
+    'ec2': 'ec2-params.json',
+    'alb': 'alb-params.json',
+    'rds': 'rds-params.json',
+    'ecs': 'ecs-params.json',
+    's3': 's3-params.json',
+    'lambda': 'lambda-params.json'
+}
+
+# (Configuration, ParameterKey) pairs copied into each parameter file, in output order
+VPC_PARAMETERS = [
+    ('CIDR', 'VpcCidr'),
+    ('AvailabilityZones', 'AvailabilityZoneCount'),
+    ('EnableDnsHostnames', 'EnableDnsHostnames'),
+    ('EnableDnsSupport', 'EnableDnsSupport'),
+    ('EnableFlowLogs', 'EnableFlowLogs')
+]
+
+RDS_PARAMETERS = [
+    ('Engine', 'DatabaseEngine'),
+    ('EngineVersion', 'EngineVersion'),
+    ('InstanceClass', 'DBInstanceClass'),
+    ('AllocatedStorage', 'AllocatedStorage'),
+    ('MultiAZ', 'MultiAZ'),
+    ('BackupRetentionPeriod', 'BackupRetentionPeriod'),
+    ('DatabaseName', 'DatabaseName'),
+    ('MasterUsername', 'MasterUsername')
+]
+
+DEPLOYMENT_ORDER_TEMPLATE = """{{
+  "stacks": [
+    {{
+      "name": "vpc",
+      "template": "foundation/vpc.yml",
+      "parameters": "generated-params/vpc-params.json",
+      "enabled": {vpc_enabled},
+      "priority": 1
+    }},
+    {{
+      "name": "subnets",
+      "template": "network/subnets.yml",
+      "parameters": "generated-params/subnet-params.json",
+      "enabled": true,
+      "depends_on": ["vpc"],
+      "priority": 2
+    }},
+    {{
+      "name": "igw",
+      "template": "network/igw.yml",
+      "parameters": "generated-params/igw-params.json",
+      "enabled": true,
+      "depends_on": ["vpc", "subnets"],
+      "priority": 2
+    }},
+    {{
+      "name": "nat",
+      "template": "network/nat.yml",
+      "parameters": "generated-params/nat-params.json",
+      "enabled": {nat_enabled},
+      "depends_on": ["subnets", "igw"],
+      "priority": 3
+    }},
+    {{
+      "name": "security-groups",
+      "template": "security/security-groups.yml",
+      "parameters": "generated-params/security-group-params.json",
+      "enabled": true,
+      "depends_on": ["vpc"],
+      "priority": 3
+    }},
+    {{
+      "name": "alb",
+      "template": "loadbalancer/alb.yml",
+      "parameters": "generated-params/alb-params.json",
+      "enabled": {alb_enabled},
+      "depends_on": ["subnets", "security-groups"],
+      "priority": 4
+    }},
+    {{
+      "name": "rds",
+      "template": "database/rds.yml",
+      "parameters": "generated-params/rds-params.json",
+      "enabled": {rds_enabled},
+      "depends_on": ["subnets", "security-groups"],
+      "priority": 4
+    }},
+    {{
+      "name": "ec2",
+      "template": "compute/ec2.yml",
+      "parameters": "generated-params/ec2-params.json",
+      "enabled": true,
+      "depends_on": ["subnets", "security-groups"],
+      "priority": 5
+    }}
+  ]
+}}
+"""
+
+class FutureReadyBOM:
+    """Indexed view of a future-ready BOM for one environment"""
+
+    def __init__(self, csv_file: str, environment: str):
+        self.csv_file = csv_file
+        self.environment = environment
+        self.first_resource: Dict[str, str] = {}
+        self.actions: Dict[Tuple[str, str], str] = {}
+        self.values: Dict[Tuple[str, str, str], str] = {}
+
+    def load(self) -> None:
+        """Index every row for this environment in one pass, keeping the first match per key"""
+        with open(self.csv_file, 'r', encoding='utf-8', newline='') as file:
+            lines = file.read().split('\n')
+
+        # Fields are split on bare commas and lines keep any '\r', exactly as awk -F',' does
+        if lines and lines[-1] == '':
+            lines.pop()
+
+        for line in lines[1:]:
+            fields = line.split(',')
+            fields += [''] * (7 - len(fields))
+            resource_type, resource_name, action, config, value = fields[:5]
+            row_environment = fields[6]
+
+            if row_environment != self.environment and row_environment != 'all':
+                continue
+
+            self.first_resource.setdefault(resource_type, resource_name)
+            self.actions.setdefault((resource_type, resource_name), action)
+            self.values.setdefault((resource_type, resource_name, config), value)
+
+    def resource_name(self, resource_type: str) -> str:
+        """Name of the first resource of a type, or '' if there is none"""
+        return self.first_resource.get(resource_type, '')
+
+    def get_value(self, resource_type: str, resource_name: str, config: str) -> str:
+        """Configuration value for a resource, or '' if it is not set"""
+        return self.values.get((resource_type, resource_name, config), '')
+
+    def should_create(self, resource_type: str, resource_name: str) -> str:
+        """'true'/'false' for the resource's Action, or '' if the resource is not in the BOM"""
+        action = self.actions.get((resource_type, resource_name))
+        if action is None:
+            return ''
+        return 'true' if action == 'create-new' else 'false'
+
+def build_parameter_files(bom: FutureReadyBOM) -> Dict[str, List[Dict[str, str]]]:
+    """Build the parameter list for every generated parameter file"""
+    params: Dict[str, List[Dict[str, str]]] = {key: [] for key in PARAMETER_FILES}
+    environment = bom.environment
+
+    def add(key: str, parameter_key: str, value: str) -> None:
+        if value:
+            params[key].append({'ParameterKey': parameter_key, 'ParameterValue': value})
+
+    vpc_name = bom.resource_name('VPC')
+    if vpc_name:
+        for config, parameter_key in VPC_PARAMETERS:
+            add('vpc', parameter_key, bom.get_value('VPC', vpc_name, config))
+        add('vpc', 'Environment', environment)
+
+    alb_name = bom.resource_name('ALB')
+    if alb_name:
+        add('alb', 'LoadBalancerType', bom.get_value('ALB', alb_name, 'Type'))
+        add('alb', 'LoadBalancerScheme', bom.get_value('ALB', alb_name, 'Scheme'))
+        add('alb', 'LoadBalancerName', alb_name)
+        add('alb', 'HealthCheckPath', bom.get_value('ALB', alb_name, 'HealthCheckPath'))
+        add('alb', 'Environment', environment)
+
+    rds_name = bom.resource_name('RDS')
+    if rds_name:
+        for config, parameter_key in RDS_PARAMETERS:
+            add('rds', parameter_key, bom.get_value('RDS', rds_name, config))
+        add('rds', 'Environment', environment)
+
+    return params
+
+def build_deployment_order(bom: FutureReadyBOM) -> str:
+    """Render deployment-order.json exactly as the shell script's heredoc does"""
+    return DEPLOYMENT_ORDER_TEMPLATE.format(
+        vpc_enabled=bom.should_create('VPC', bom.resource_name('VPC')),
+        nat_enabled='true' if bom.get_value('NATGateway', 'ProductionNAT', 'Strategy') else 'false',
+        alb_enabled='true' if bom.resource_name('ALB') else 'false',
+        rds_enabled='true' if bom.resource_name('RDS') else 'false'
+    )
+
+def format_parameters(params: List[Dict[str, str]]) -> str:
+    """Serialize parameters the way `jq` pretty-prints them"""
+    if not params:
+        return '[]\n'
+    return json.dumps(params, indent=2, ensure_ascii=False) + '\n'
+
+def write_outputs(bom: FutureReadyBOM, output_dir: str) -> None:
+    """Write every parameter file and the deployment order in one go"""
+    os.makedirs(output_dir, exist_ok=True)
+
+    for key, params in build_parameter_files(bom).items():
+        with open(os.path.join(output_dir, PARAMETER_FILES[key]), 'w', encoding='utf-8', newline='') as f:
+            f.write(format_parameters(params))
+
+    with open(os.path.join(output_dir, 'deployment-order.json'), 'w', encoding='utf-8', newline='') as f:
+        f.write(build_deployment_order(bom))
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate CloudFormation parameters from a future-ready BOM')
+    parser.add_argument('csv_file', nargs='?', default='config/future-ready-bom.csv', help='Future-ready BOM CSV file')
+    parser.add_argument('environment', nargs='?', default='dev', help='Environment (dev/prod)')
+    parser.add_argument('--output-dir', default='generated-params', help='Output directory for parameter files')
+
+    args = parser.parse_args()
+
+    print(f"Parsing Future-Ready CSV file: {args.csv_file} for environment: {args.environment}")
+
+    bom = FutureReadyBOM(args.csv_file, args.environment)
+    try:
+        bom.load()
+    except OSError as e:
+        print(f"ERROR: Failed to load BOM file: {e}")
+        sys.exit(1)
+
+    write_outputs(bom, args.output_dir)
+
+    print(f"Enhanced CSV parsing completed. Parameter files generated in {args.output_dir}/")
+    print(f"Deployment order: {args.output_dir}/deployment-order.json")
+    print("")
+    print("Future-Ready Services Detected:")
+    alb_name = bom.resource_name('ALB')
+    rds_name = bom.resource_name('RDS')
+    if alb_name:
+        print(f"✓ Application Load Balancer: {alb_name}")
+    if rds_name:
+        print(f"✓ RDS Database: {rds_name}")
+    print(f"✓ Enhanced VPC with {bom.get_value('VPC', bom.resource_name('VPC'), 'AvailabilityZones')} Availability Zones")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Parameter Contract Checker - Checks generated parameter files against the Parameters section
+of the templates they will be deployed with, before any AWS call
+Reports missing required keys, unknown (e.g. misspelled) keys, type mismatches and
+AllowedValues/AllowedPattern/range violations
+"""
+
+import argparse
+import difflib
+import json
+import os
+import re
+import sys
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+from cfn_templates import TemplateCache, default_cache_dir
+
+MANIFEST_FILE = 'bom-manifest.json'
+NETWORK_TEMPLATE = 'network/network-foundation.yml'
+SERVICE_TEMPLATE_DIR = 'services'
+
+def parameter_string(value: Any) -> str:
+    """A template value the way CloudFormation compares it (YAML true -> 'true', 10 -> '10')"""
+    if isinstance(value, bool):
+        return str(value).lower()
+    return str(value)
+
+def load_parameter_file(params_file: str) -> Dict[str, str]:
+    """Load [{ParameterKey, ParameterValue}] or {key: value} parameters"""
+    with open(params_file, 'r', encoding='utf-8-sig') as f:
+        params = json.load(f)
+
+    if isinstance(params, list):
+        return {param['ParameterKey']: parameter_string(param['ParameterValue']) for param in params}
+    return {key: parameter_string(value) for key, value in params.items()}
+
+def is_number(value: str) -> bool:
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+def check_value(name: str, value: str, spec: Dict[str, Any]) -> List[str]:
+    """Problems with one parameter value against its template definition"""
+    problems = []
+    param_type = spec.get('Type', 'String')
+    is_list = param_type.startswith('List<') or param_type == 'CommaDelimitedList'
+    items = [item.strip() for item in value.split(',')] if is_list else [value]
+
+    if param_type in ('Number', 'List<Number>'):
+        not_numbers = [item for item in items if not is_number(item)]
+        if not_numbers:
+            return [f"{name}: expected {param_type}, got '{value}'"]
+
+        for item in items:
+            number = float(item)
+            if 'MinValue' in spec and number < float(spec['MinValue']):
+                problems.append(f"{name}: {item} is below MinValue {spec['MinValue']}")
+            if 'MaxValue' in spec and number > float(spec['MaxValue']):
+                problems.append(f"{name}: {item} is above MaxValue {spec['MaxValue']}")
+
+    if param_type == 'String':
+        if 'MinLength' in spec and len(value) < int(spec['MinLength']):
+            problems.append(f"{name}: '{value}' is shorter than MinLength {spec['MinLength']}")
+        if 'MaxLength' in spec and len(value) > int(spec['MaxLength']):
+            problems.append(f"{name}: '{value}' is longer than MaxLength {spec['MaxLength']}")
+        if 'AllowedPattern' in spec and not re.fullmatch(spec['AllowedPattern'], value):
+            problems.append(f"{name}: '{value}' does not match AllowedPattern {spec['AllowedPattern']}")
+
+    if 'AllowedValues' in spec:
+        allowed = [parameter_string(allowed_value) for allowed_value in spec['AllowedValues']]
+        for item in items:
+            if item not in allowed:
+                problems.append(f"{name}: '{item}' is not one of AllowedValues [{', '.join(allowed)}]")
+
+    return problems
+
+def check_parameters(params: Dict[str, str], parameters: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Problems with a parameter set against a template's Parameters section"""
+    problems = []
+
+    for name, spec in parameters.items():
+        if name not in params and 'Default' not in spec:
+            problems.append(f"{name}: required by the template but missing (no Default)")
+
+    lower_names = {name.lower(): name for name in parameters}
+    for name, value in params.items():
+        if name in parameters:
+            problems.extend(check_value(name, value, parameters[name]))
+            continue
+
+        # CloudFormation rejects keys the template does not declare
+        suggestion = lower_names.get(name.lower()) or next(iter(difflib.get_close_matches(name, parameters, n=1)), None)
+        hint = f" (did you mean '{suggestion}'?)" if suggestion else ''
+        problems.append(f"{name}: not a parameter of the template{hint}")
+
+    return problems
+
+def contracts_from_manifest(params_dir: str, template_root: str = '.') -> List[Tuple[str, str]]:
+    """(template, parameter file) pairs for a bomctl compile-all output directory"""
+    with open(os.path.join(params_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    contracts = []
+    if manifest.get('network'):
+        contracts.append((os.path.join(template_root, NETWORK_TEMPLATE), os.path.join(params_dir, manifest['network']['parameters'])))
+    for service in manifest.get('services', []):
+        contracts.append((os.path.join(template_root, SERVICE_TEMPLATE_DIR, service['template']), os.path.join(params_dir, service['parameters'])))
+    return contracts
+
+def contracts_from_order(order_file: str) -> List[Tuple[str, str]]:
+    """(template, parameter file) pairs for the enabled stacks of a deployment order file"""
+    with open(order_file, 'r', encoding='utf-8-sig') as f:
+        stacks = json.load(f)['stacks']
+    return [
+        (stack['template'], stack['parameters'])
+        for stack in stacks
+        if stack.get('enabled', True) and stack.get('parameters')
+    ]
+
+class ContractChecker:
+    def __init__(self, cache: Optional[TemplateCache] = None):
+        self.cache = cache or TemplateCache()
+        self.results: List[Dict[str, Any]] = []
+
+    def check(self, template_file: str, params_file: str) -> Dict[str, Any]:
+        """Check one parameter file against one template"""
+        result = {'template': template_file, 'parameters': params_file, 'problems': [], 'status': 'ok'}
+
+        if not os.path.isfile(params_file):
+            result['status'] = 'skipped'
+            result['problems'].append(f"Parameter file not found: {params_file}")
+        else:
+            try:
+                summary = self.cache.summary(template_file)
+                result['problems'] = check_parameters(load_parameter_file(params_file), summary['parameters'])
+            except FileNotFoundError as e:
+                result['problems'] = [f"File not found: {e.filename}"]
+            except Exception as e:
+                result['problems'] = [f"Failed to load: {e}"]
+            if result['problems']:
+                result['status'] = 'failed'
+
+        self.results.append(result)
+        return result
+
+    def check_all(self, contracts: List[Tuple[str, str]]) -> bool:
+        """Check every pair; False if any parameter file violates its template"""
+        for template_file, params_file in contracts:
+            self.check(template_file, params_file)
+        return not any(result['status'] == 'failed' for result in self.results)
+
+    def print_results(self) -> None:
+        for result in self.results:
+            if result['status'] == 'ok':
+                print(f"✅ {result['parameters']} -> {result['template']}")
+            elif result['status'] == 'skipped':
+                print(f"⏭️  {result['parameters']} -> {result['template']} (skipped)")
+            else:
+                print(f"❌ {result['parameters']} -> {result['template']}")
+            for problem in result['problems'] if result['status'] == 'failed' else []:
+                print(f"  - {problem}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Check generated parameter files against their CloudFormation templates')
+    parser.add_argument('--params-dir', help=f"bomctl compile-all output directory (reads {MANIFEST_FILE})")
+    parser.add_argument('--order-file', help='Also check the stacks of a deployment order file')
+    parser.add_argument('--pair', nargs=2, action='append', default=[], metavar=('TEMPLATE', 'PARAMS'), help='Check one template/parameter file pair')
+    parser.add_argument('--cache-dir', default=default_cache_dir(), help='Template summary cache directory (default: $TEMPLATE_CACHE_DIR or .template-cache)')
+    parser.add_argument('--no-cache', action='store_true', help='Always parse the templates')
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    contracts = [tuple(pair) for pair in args.pair]
+    try:
+        if args.params_dir:
+            contracts += contracts_from_manifest(args.params_dir)
+        if args.order_file:
+            contracts += contracts_from_order(args.order_file)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"ERROR: Failed to read contracts: {e}")
+        sys.exit(1)
+
+    if not contracts:
+        parser.error('nothing to check; pass --params-dir, --order-file or --pair')
+
+    checker = ContractChecker(TemplateCache(None if args.no_cache else args.cache_dir))
+    passed = checker.check_all(contracts)
+    checker.print_results()
+
+    stats = checker.cache.stats
+    print(f"\nChecked {len(contracts)} parameter files in {(time.perf_counter() - start) * 1000:.1f} ms "
+          f"({stats['parsed']} templates parsed, {stats['disk']} from cache)")
+    if not passed:
+        print("❌ Parameter contract check failed")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -183,7 +183,7 @@ $deploymentOrder = @{
             template = "network/igw.yml"
             parameters = "generated-params/igw-params.json"
             enabled = $true
-            depends_on = @("vpc")
+            depends_on = @("vpc", "subnets")
         },
         @{
             name = "nat"
@@ -198,7 +198,7 @@ cat > "$OUTPUT_DIR/deployment-order.json" << EOF
       "template": "network/igw.yml",
       "parameters": "generated-params/igw-params.json",
       "enabled": true,
-      "depends_on": ["vpc"]
+      "depends_on": ["vpc", "subnets"]
     },
     {
       "name": "nat",
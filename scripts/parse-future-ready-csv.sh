@@ -156,7 +156,7 @@ cat > "$OUTPUT_DIR/deployment-order.json" << EOF
       "template": "network/igw.yml",
       "parameters": "generated-params/igw-params.json",
       "enabled": true,
-      "depends_on": ["vpc"],
+      "depends_on": ["vpc", "subnets"],
       "priority": 2
     },
     {
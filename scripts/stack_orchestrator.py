@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Stack Orchestrator - Deploys the stacks in generated-params/deployment-order.json
+Runs independent stacks concurrently as soon as their dependencies complete
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Any, Optional
+
+from deploy_fingerprint import FingerprintCache, compute_fingerprints
+from deploy_telemetry import telemetry_from_env
+from stack_outputs import AwsCliOutputsBackend, StackOutputResolver
+
+DEFAULT_ORDER_FILE = 'generated-params/deployment-order.json'
+
+def load_deployment_order(order_file: str = DEFAULT_ORDER_FILE) -> List[Dict[str, Any]]:
+    """Load enabled stacks from a deployment order file"""
+    # The generated file is written with a byte order mark by PowerShell
+    with open(order_file, 'r', encoding='utf-8-sig') as f:
+        stacks = json.load(f)['stacks']
+
+    names = {stack['name'] for stack in stacks}
+    enabled = {stack['name'] for stack in stacks if stack.get('enabled', True)}
+
+    result = []
+    for stack in stacks:
+        if stack['name'] not in enabled:
+            continue
+
+        unknown = [dep for dep in stack.get('depends_on', []) if dep not in names]
+        if unknown:
+            raise ValueError(f"Stack '{stack['name']}' depends on unknown stack(s): {', '.join(unknown)}")
+
+        # Disabled dependencies are assumed to already exist
+        result.append(dict(stack, depends_on=[dep for dep in stack.get('depends_on', []) if dep in enabled]))
+
+    return result
+
+def topological_sort(stacks: List[Dict[str, Any]]) -> List[List[str]]:
+    """Group stacks into levels where each level only depends on earlier levels"""
+    remaining = {stack['name']: set(stack.get('depends_on', [])) for stack in stacks}
+    levels = []
+
+    while remaining:
+        level = [name for name, deps in remaining.items() if not deps]
+        if not level:
+            raise ValueError(f"Dependency cycle detected between stacks: {', '.join(sorted(remaining))}")
+
+        levels.append(level)
+        for name in level:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(level)
+
+    return levels
+
+class StackSkipped(Exception):
+    """Raised by a deployer when a stack cannot be deployed and should be skipped"""
+
+class Deployer:
+    """Interface for deploying a single CloudFormation stack"""
+
+    def deploy(self, stack: Dict[str, Any], stack_name: str) -> None:
+        """Deploy the stack, raising StackSkipped to skip it or any other exception on failure"""
+        raise NotImplementedError
+
+class AwsCliDeployer(Deployer):
+    """Deploys stacks with `aws cloudformation deploy`"""
+
+    def __init__(self, region: str, tags: Optional[List[str]] = None):
+        self.region = region
+        self.tags = tags or []
+
+    def deploy(self, stack: Dict[str, Any], stack_name: str) -> None:
+        if not os.path.isfile(stack['template']) or not os.path.isfile(stack.get('parameters', '')):
+            raise StackSkipped(f"Template or parameter file not found for {stack['name']}")
+
+        command = [
+            'aws', 'cloudformation', 'deploy',
+            '--template-file', stack['template'],
+            '--stack-name', stack_name,
+            '--parameter-overrides', f"file://{stack['parameters']}",
+            '--capabilities', 'CAPABILITY_IAM', 'CAPABILITY_NAMED_IAM',
+            '--region', self.region,
+            '--no-fail-on-empty-changeset'
+        ]
+        if self.tags:
+            command += ['--tags'] + self.tags
+
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"aws cloudformation deploy failed for {stack_name}: {result.stderr.strip()}")
+
+class DeploymentOrchestrator:
+    def __init__(self, stacks: List[Dict[str, Any]], deployer: Deployer, environment: str, max_workers: int = 4,
+                 fingerprint_cache: Optional[FingerprintCache] = None, output_resolver: Optional[StackOutputResolver] = None,
+                 tags: Optional[List[str]] = None):
+        if fingerprint_cache and not output_resolver:
+            raise ValueError("skipping unchanged stacks needs an output resolver to confirm they still exist")
+
+        self.stacks = {stack['name']: stack for stack in stacks}
+        self.order = [stack['name'] for stack in stacks]
+        self.deployer = deployer
+        self.environment = environment
+        self.max_workers = max_workers
+        self.fingerprint_cache = fingerprint_cache
+        self.output_resolver = output_resolver
+        self.telemetry = telemetry_from_env()
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+        # Validates the graph up front so a cycle fails before anything is deployed
+        self.levels = topological_sort(stacks)
+        self.fingerprints = compute_fingerprints(stacks, self.levels, tags)
+
+    def stack_name(self, name: str) -> str:
+        """CloudFormation stack name for a deployment-order entry"""
+        return f"{self.environment}-{name}"
+
+    def plan(self) -> List[Dict[str, Any]]:
+        """List which stacks would be deployed and why, in dependency order"""
+        plan = []
+        if self.fingerprint_cache:
+            self.output_resolver.prefetch(self.order)
+        for level in self.levels:
+            for name in level:
+                stack_name = self.stack_name(name)
+                if self.fingerprint_cache:
+                    decision = self.fingerprint_cache.plan(stack_name, self.fingerprints[name], self.output_resolver.status(name))
+                else:
+                    decision = {'action': 'deploy', 'reasons': ['no deployment state file']}
+                plan.append(dict(decision, name=name, stack_name=stack_name))
+        return plan
+
+    def _deploy_one(self, name: str, run_start: float) -> Dict[str, Any]:
+        """Deploy a single stack and record its timing"""
+        stack = self.stacks[name]
+        start = time.perf_counter() - run_start
+        wall_start = time.time()
+        result = {'name': name, 'stack_name': self.stack_name(name), 'start': start}
+
+        try:
+            self.deployer.deploy(stack, result['stack_name'])
+            result['status'] = 'deployed'
+        except StackSkipped as e:
+            print(f"WARNING: {e}, skipping...")
+            result['status'] = 'skipped'
+        except Exception as e:
+            result['status'] = 'failed'
+            result['error'] = str(e)
+
+        result['end'] = time.perf_counter() - run_start
+        self.telemetry.record('stack.deploy', wall_start, time.time(), result['stack_name'], name=name, status=result['status'])
+        return result
+
+    def run(self) -> Dict[str, Any]:
+        """Deploy all stacks, running independent stacks concurrently"""
+        waiting_on = {name: set(self.stacks[name].get('depends_on', [])) for name in self.order}
+        dependents: Dict[str, List[str]] = {name: [] for name in self.order}
+        for name in self.order:
+            for dep in self.stacks[name].get('depends_on', []):
+                dependents[dep].append(name)
+
+        self.results = {}
+        unchanged = {entry['name'] for entry in self.plan() if entry['action'] == 'skip'}
+        run_start = time.perf_counter()
+        wall_start = time.time()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+
+            def submit_ready() -> None:
+                # Level order lets an unchanged stack release its dependents within the same pass
+                for name in (name for level in self.levels for name in level):
+                    if name in self.results or name in running.values() or waiting_on[name]:
+                        continue
+                    if name in unchanged:
+                        print(f"⏭️ Stack {self.stack_name(name)} unchanged, skipping")
+                        self.results[name] = {'name': name, 'stack_name': self.stack_name(name), 'status': 'unchanged'}
+                        release_dependents(name)
+                    else:
+                        print(f"📦 Deploying stack: {self.stack_name(name)}")
+                        running[executor.submit(self._deploy_one, name, run_start)] = name
+
+            def release_dependents(name: str) -> None:
+                for dependent in dependents[name]:
+                    waiting_on[dependent].discard(name)
+
+            def block_dependents(name: str) -> None:
+                for dependent in dependents[name]:
+                    if dependent not in self.results:
+                        self.results[dependent] = {
+                            'name': dependent,
+                            'stack_name': self.stack_name(dependent),
+                            'status': 'blocked',
+                            'error': f"dependency {name} did not deploy"
+                        }
+                        block_dependents(dependent)
+
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    result = future.result()
+                    self.results[name] = result
+                    # A failed deploy may still have created or rolled back the stack
+                    if result['status'] in ('deployed', 'failed') and self.output_resolver:
+                        self.output_resolver.invalidate(name)
+
+                    if result['status'] == 'failed':
+                        print(f"❌ Stack {result['stack_name']} failed: {result['error']}")
+                        block_dependents(name)
+                    else:
+                        print(f"✅ Stack {result['stack_name']} {result['status']} ({result['end'] - result['start']:.1f}s)")
+                        if result['status'] == 'deployed' and self.fingerprint_cache:
+                            self.fingerprint_cache.record(result['stack_name'], self.fingerprints[name])
+                        release_dependents(name)
+
+                submit_ready()
+
+        if self.fingerprint_cache:
+            self.fingerprint_cache.save()
+        if self.output_resolver:
+            self.output_resolver.save()
+
+        report = self.report(time.perf_counter() - run_start)
+        self.telemetry.record('deploy.run', wall_start, time.time(), environment=self.environment,
+                              max_workers=self.max_workers, status='ok' if report['success'] else 'failed')
+        return report
+
+    def critical_path(self) -> List[str]:
+        """Longest chain of dependent stacks by measured duration"""
+        finish: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+
+        for level in self.levels:
+            for name in level:
+                result = self.results.get(name, {})
+                duration = result.get('end', 0.0) - result.get('start', 0.0)
+                deps = self.stacks[name].get('depends_on', [])
+                longest = max(deps, key=lambda dep: finish[dep], default=None)
+                previous[name] = longest
+                finish[name] = duration + (finish[longest] if longest else 0.0)
+
+        if not finish:
+            return []
+
+        path = []
+        name = max(self.order, key=lambda n: finish[n])
+        while name:
+            path.append(name)
+            name = previous[name]
+        return list(reversed(path))
+
+    def report(self, wall_clock: float) -> Dict[str, Any]:
+        """Summarize the run against a serial deployment"""
+        durations = {
+            name: result['end'] - result['start']
+            for name, result in self.results.items() if 'start' in result
+        }
+        path = self.critical_path()
+
+        return {
+            'environment': self.environment,
+            'max_workers': self.max_workers,
+            'levels': self.levels,
+            'stacks': [self.results[name] for name in self.order if name in self.results],
+            'wall_clock_seconds': wall_clock,
+            'serial_baseline_seconds': sum(durations.values()),
+            'critical_path': path,
+            'critical_path_seconds': sum(durations.get(name, 0.0) for name in path),
+            'success': all(result['status'] in ('deployed', 'skipped', 'unchanged') for result in self.results.values())
+        }
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print a human-readable deployment report"""
+    print("\n## Deployment Report")
+    for i, level in enumerate(report['levels'], 1):
+        print(f"Level {i}: {', '.join(level)}")
+
+    print()
+    for result in report['stacks']:
+        if 'start' in result:
+            print(f"  - {result['name']}: {result['status']} ({result['start']:.1f}s -> {result['end']:.1f}s)")
+        elif 'error' in result:
+            print(f"  - {result['name']}: {result['status']} ({result['error']})")
+        else:
+            print(f"  - {result['name']}: {result['status']}")
+
+    serial = report['serial_baseline_seconds']
+    wall = report['wall_clock_seconds']
+    print(f"\nWall clock: {wall:.1f}s (max workers: {report['max_workers']})")
+    print(f"Serial baseline: {serial:.1f}s")
+    if wall > 0:
+        print(f"Speedup vs serial: {serial / wall:.2f}x")
+    print(f"Critical path: {' -> '.join(report['critical_path'])} ({report['critical_path_seconds']:.1f}s)")
+
+def main():
+    parser = argparse.ArgumentParser(description='Deploy stacks from deployment-order.json in dependency order')
+    parser.add_argument('--environment', required=True, help='Environment (dev/prod)')
+    parser.add_argument('--order-file', default=DEFAULT_ORDER_FILE, help='Deployment order JSON file')
+    parser.add_argument('--max-workers', type=int, default=4, help='Maximum number of stacks deployed concurrently')
+    parser.add_argument('--region', default=os.environ.get('AWS_REGION', 'ap-south-1'), help='AWS region')
+    parser.add_argument('--tags', nargs='*', default=[], help='Stack tags as Key=Value')
+    parser.add_argument('--fake', action='store_true', help='Deploy into a fresh local fake CloudFormation region (scripts/fake_cloudformation.py)')
+    parser.add_argument('--fake-time-scale', type=float, default=0.001, help='Real seconds per simulated second of resource latency for --fake')
+    parser.add_argument('--report-file', help='Write the deployment report as JSON')
+    parser.add_argument('--state-file', help='Deployment fingerprint state file; unchanged stacks are skipped')
+    parser.add_argument('--plan', action='store_true', help='Only list which stacks would be deployed and why')
+    parser.add_argument('--outputs-cache', default=os.environ.get('STACK_OUTPUTS_CACHE'), help='Invalidate deployed stacks in this stack outputs cache (default: $STACK_OUTPUTS_CACHE)')
+
+    args = parser.parse_args()
+
+    try:
+        stacks = load_deployment_order(args.order_file)
+        if args.fake:
+            # Imported here: fake_cloudformation imports Deployer and StackSkipped from this module.
+            # Run as a script this module is __main__; register it under its name so the fake
+            # raises the StackSkipped caught above rather than a second copy's
+            sys.modules.setdefault('stack_orchestrator', sys.modules[__name__])
+            from fake_cloudformation import FakeCloudFormation, FakeOutputsBackend, FakeStackDeployer
+            fake = FakeCloudFormation(args.region, time_scale=args.fake_time_scale)
+            deployer = FakeStackDeployer(fake)
+            output_resolver = StackOutputResolver(args.environment, FakeOutputsBackend(fake))
+        else:
+            deployer = AwsCliDeployer(args.region, args.tags)
+            output_resolver = None
+            # The state file needs the resolver too, to confirm unchanged stacks still exist
+            if args.outputs_cache or args.state_file:
+                output_resolver = StackOutputResolver(args.environment, AwsCliOutputsBackend(args.region), args.outputs_cache)
+                output_resolver.load()
+        fingerprint_cache = None
+        if args.state_file:
+            fingerprint_cache = FingerprintCache(args.state_file)
+            fingerprint_cache.load()
+        orchestrator = DeploymentOrchestrator(stacks, deployer, args.environment, args.max_workers, fingerprint_cache,
+                                              output_resolver, args.tags)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"ERROR: Failed to load deployment order: {e}")
+        sys.exit(1)
+
+    try:
+        plan = orchestrator.plan()
+    except RuntimeError as e:
+        print(f"ERROR: Failed to check the deployed stacks: {e}")
+        sys.exit(1)
+
+    if args.plan:
+        print("## Deployment Plan")
+        for entry in plan:
+            print(f"  - {entry['stack_name']}: {entry['action']} ({', '.join(entry['reasons'])})")
+        return
+
+    report = orchestrator.run()
+    print_report(report)
+
+    if args.report_file:
+        with open(args.report_file, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if not report['success']:
+        print("ERROR: One or more stacks failed to deploy")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Stack Output Resolver - Fetches the outputs of all of an environment's stacks in one paginated
+describe-stacks batch and answers output lookups and existence checks from memory
+The resolved outputs are kept in a per-run cache file shared by the workflow steps; a stack that is
+deployed during the run is invalidated and re-fetched on its next lookup
+
+Usage: python scripts/stack_outputs.py --environment dev get VPC_ID=vpc.VPCId SG_ID=security-groups.WebSecurityGroupId
+"""
+
+import argparse
+import json
+import os
+import shlex
+import subprocess
+import sys
+import time
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+OUTPUTS_FORMAT = 1
+
+# describe-stacks returns at most this many stacks per page
+PAGE_SIZE = 100
+
+class OutputsBackend:
+    """Interface for the CloudFormation describe-stacks call"""
+
+    api_calls = 0
+
+    def describe_stacks(self, prefix: str, stack_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Stacks whose name starts with prefix, or just stack_name; [] if it does not exist"""
+        raise NotImplementedError
+
+class AwsCliOutputsBackend(OutputsBackend):
+    """Runs `aws cloudformation describe-stacks`; the CLI follows NextToken within one process"""
+
+    def __init__(self, region: str):
+        self.region = region
+        # One process per call; the CLI may fetch several pages within it
+        self.api_calls = 0
+
+    def describe_stacks(self, prefix: str, stack_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        command = [
+            'aws', 'cloudformation', 'describe-stacks',
+            '--region', self.region,
+            '--output', 'json',
+            # Only the fields the resolver keeps; the filter runs client side after each page
+            '--query', f"Stacks[?starts_with(StackName, '{prefix}')].{{StackName: StackName, StackStatus: StackStatus, Outputs: Outputs}}"
+        ]
+        if stack_name:
+            command += ['--stack-name', stack_name]
+
+        self.api_calls += 1
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            if stack_name and 'does not exist' in result.stderr:
+                return []
+            raise RuntimeError(f"aws cloudformation describe-stacks failed: {result.stderr.strip()}")
+        return json.loads(result.stdout or '[]') or []
+
+class StubOutputsBackend(OutputsBackend):
+    """Local stand-in for describe-stacks that pages like the API and counts every call"""
+
+    def __init__(self, stacks: Optional[Dict[str, Dict[str, str]]] = None, statuses: Optional[Dict[str, str]] = None,
+                 page_size: int = PAGE_SIZE, latency: float = 0.0):
+        self.stacks: Dict[str, Dict[str, str]] = dict(stacks or {})
+        self.statuses: Dict[str, str] = dict(statuses or {})
+        self.page_size = page_size
+        self.latency = latency
+        self.calls: List[Tuple[str, Optional[str]]] = []
+
+    @property
+    def api_calls(self) -> int:
+        return len(self.calls)
+
+    def update_stack(self, stack_name: str, outputs: Dict[str, str], status: str = 'UPDATE_COMPLETE') -> None:
+        """Simulate a deploy changing a stack's outputs"""
+        self.stacks[stack_name] = dict(outputs)
+        self.statuses[stack_name] = status
+
+    def delete_stack(self, stack_name: str) -> None:
+        self.stacks.pop(stack_name, None)
+        self.statuses.pop(stack_name, None)
+
+    def _stack(self, stack_name: str) -> Dict[str, Any]:
+        return {
+            'StackName': stack_name,
+            'StackStatus': self.statuses.get(stack_name, 'CREATE_COMPLETE'),
+            'Outputs': [{'OutputKey': key, 'OutputValue': value} for key, value in self.stacks[stack_name].items()]
+        }
+
+    def describe_page(self, stack_name: Optional[str] = None, next_token: Optional[str] = None) -> Dict[str, Any]:
+        """One DescribeStacks API call"""
+        self.calls.append(('describe-stacks', stack_name))
+        if self.latency:
+            time.sleep(self.latency)
+
+        if stack_name:
+            if stack_name not in self.stacks:
+                raise KeyError(f"Stack with id {stack_name} does not exist")
+            return {'Stacks': [self._stack(stack_name)]}
+
+        names = sorted(self.stacks)
+        start = int(next_token or 0)
+        page = {'Stacks': [self._stack(name) for name in names[start:start + self.page_size]]}
+        if start + self.page_size < len(names):
+            page['NextToken'] = str(start + self.page_size)
+        return page
+
+    def describe_stacks(self, prefix: str, stack_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        if stack_name:
+            try:
+                return self.describe_page(stack_name)['Stacks']
+            except KeyError:
+                return []
+
+        stacks = []
+        next_token = None
+        while True:
+            page = self.describe_page(next_token=next_token)
+            stacks.extend(stack for stack in page['Stacks'] if stack['StackName'].startswith(prefix))
+            next_token = page.get('NextToken')
+            if not next_token:
+                return stacks
+
+def load_stub(stub_file: str) -> StubOutputsBackend:
+    """Stub backend from a JSON file of {stack name: {output key: value}}"""
+    with open(stub_file, 'r', encoding='utf-8') as f:
+        return StubOutputsBackend(json.load(f))
+
+class StackOutputResolver:
+    def __init__(self, environment: str, backend: OutputsBackend, cache_file: Optional[str] = None):
+        self.environment = environment
+        self.backend = backend
+        self.cache_file = cache_file
+        self.prefix = f"{environment}-"
+        self.stacks: Dict[str, Dict[str, Any]] = {}
+        self.loaded = False
+        self.stale: Set[str] = set()
+        # per_value_calls: describe-stacks calls the lookups would have cost one call at a time
+        self.stats = {'api_calls': 0, 'batch_fetches': 0, 'stack_fetches': 0, 'lookups': 0, 'per_value_calls': 0}
+
+    def stack_name(self, name: str) -> str:
+        """CloudFormation stack name for a deployment-order entry"""
+        return f"{self.prefix}{name}"
+
+    def _store(self, stack: Dict[str, Any]) -> None:
+        outputs = stack.get('Outputs') or []
+        self.stacks[stack['StackName'][len(self.prefix):]] = {
+            'status': stack.get('StackStatus'),
+            'outputs': {output['OutputKey']: output['OutputValue'] for output in outputs}
+        }
+
+    def fetch_all(self) -> None:
+        """Replace the cache with one paginated describe-stacks of the environment's stacks"""
+        calls = self.backend.api_calls
+        stacks = self.backend.describe_stacks(self.prefix)
+        self.stats['api_calls'] += self.backend.api_calls - calls
+        self.stats['batch_fetches'] += 1
+
+        self.stacks = {}
+        for stack in stacks:
+            self._store(stack)
+        self.stale.clear()
+        self.loaded = True
+
+    def fetch_stack(self, name: str) -> None:
+        """Re-fetch a single invalidated stack"""
+        calls = self.backend.api_calls
+        stacks = self.backend.describe_stacks(self.prefix, self.stack_name(name))
+        self.stats['api_calls'] += self.backend.api_calls - calls
+        self.stats['stack_fetches'] += 1
+
+        self.stacks.pop(name, None)
+        for stack in stacks:
+            self._store(stack)
+        self.stale.discard(name)
+
+    def prefetch(self, names: List[str]) -> None:
+        """Make the named stacks current with as few calls as possible"""
+        stale = [name for name in dict.fromkeys(names) if name in self.stale]
+        if not self.loaded or len(stale) > 1:
+            self.fetch_all()
+        elif stale:
+            self.fetch_stack(stale[0])
+
+    def invalidate(self, name: str) -> None:
+        """Mark a stack changed by this run; its next lookup re-fetches it"""
+        if self.loaded:
+            self.stale.add(name)
+
+    def exists(self, name: str) -> bool:
+        self.stats['lookups'] += 1
+        self.stats['per_value_calls'] += 1
+        self.prefetch([name])
+        return name in self.stacks
+
+    def status(self, name: str) -> Optional[str]:
+        """Stack status, or None if the stack does not exist"""
+        self.stats['lookups'] += 1
+        self.stats['per_value_calls'] += 1
+        self.prefetch([name])
+        return self.stacks.get(name, {}).get('status')
+
+    def get(self, name: str, output_key: str, default: Optional[str] = None) -> Optional[str]:
+        """Value of one stack output, or default if the stack or output does not exist"""
+        self.stats['lookups'] += 1
+        self.stats['per_value_calls'] += 1
+        self.prefetch([name])
+        return self.stacks.get(name, {}).get('outputs', {}).get(output_key, default)
+
+    def get_many(self, lookups: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Optional[str]]:
+        """Values for several (stack, output key) pairs, refreshing their stacks together"""
+        self.prefetch([name for name, _ in lookups])
+        return {(name, output_key): self.get(name, output_key) for name, output_key in lookups}
+
+    def load(self) -> bool:
+        """Restore the run cache file; False if there is none for this environment"""
+        if not self.cache_file:
+            return False
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if cache.get('format') != OUTPUTS_FORMAT or cache.get('environment') != self.environment:
+            return False
+
+        self.stacks = cache['stacks']
+        self.stale = set(cache['stale'])
+        self.stats.update(cache['stats'])
+        self.loaded = True
+        return True
+
+    def save(self) -> None:
+        """Atomically write the run cache file"""
+        if not self.cache_file or not self.loaded:
+            return
+        os.makedirs(os.path.dirname(self.cache_file) or '.', exist_ok=True)
+        tmp_path = f"{self.cache_file}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'format': OUTPUTS_FORMAT,
+                'environment': self.environment,
+                'stacks': self.stacks,
+                'stale': sorted(self.stale),
+                'stats': self.stats
+            }, f, indent=2)
+        os.replace(tmp_path, self.cache_file)
+
+def parse_lookup(spec: str) -> Tuple[str, str, str]:
+    """'VAR=stack.OutputKey' -> (VAR, stack, OutputKey); stack names may not contain dots"""
+    variable, _, reference = spec.partition('=')
+    name, _, output_key = reference.partition('.')
+    if not variable.isidentifier() or not name or not output_key:
+        raise ValueError(f"expected VAR=stack.OutputKey, got '{spec}'")
+    return variable, name, output_key
+
+def print_stats(resolver: StackOutputResolver) -> None:
+    stats = resolver.stats
+    saved = stats['per_value_calls'] - stats['api_calls']
+    print(f"### Stack output lookups ({resolver.environment})")
+    print(f"- Lookups: {stats['lookups']} ({len(resolver.stacks)} stacks cached)")
+    print(f"- describe-stacks calls: {stats['api_calls']} "
+          f"({stats['batch_fetches']} batch, {stats['stack_fetches']} single-stack refresh)")
+    print(f"- Calls saved vs. one call per lookup: {saved}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Resolve CloudFormation stack outputs from a per-run cache')
+    parser.add_argument('--environment', required=True, help='Environment (dev/prod); stacks are named <environment>-<name>')
+    parser.add_argument('--region', default=os.environ.get('AWS_REGION', 'ap-south-1'), help='AWS region')
+    parser.add_argument('--cache-file', default=os.environ.get('STACK_OUTPUTS_CACHE'), help='Per-run outputs cache file (default: $STACK_OUTPUTS_CACHE)')
+    parser.add_argument('--stub', help='Resolve from a JSON file of {stack name: {output key: value}} instead of AWS')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    get = subparsers.add_parser('get', help='Print VAR=value shell assignments for stack outputs')
+    get.add_argument('lookups', nargs='+', metavar='VAR=stack.OutputKey')
+    get.add_argument('--require', action='store_true', help='Fail if any output is missing')
+
+    exists = subparsers.add_parser('exists', help='Exit 0 if all the stacks exist')
+    exists.add_argument('stacks', nargs='+')
+
+    invalidate = subparsers.add_parser('invalidate', help='Mark stacks deployed by this run as changed')
+    invalidate.add_argument('stacks', nargs='+')
+
+    subparsers.add_parser('stats', help='Print how many describe-stacks calls the cache saved')
+
+    args = parser.parse_args()
+
+    try:
+        backend = load_stub(args.stub) if args.stub else AwsCliOutputsBackend(args.region)
+        lookups = [parse_lookup(spec) for spec in args.lookups] if args.command == 'get' else []
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    resolver = StackOutputResolver(args.environment, backend, args.cache_file)
+    resolver.load()
+    exit_code = 0
+
+    try:
+        if args.command == 'get':
+            values = resolver.get_many([(name, output_key) for _, name, output_key in lookups])
+            for variable, name, output_key in lookups:
+                value = values[(name, output_key)]
+                if value is None:
+                    print(f"WARNING: {resolver.stack_name(name)} has no output {output_key}", file=sys.stderr)
+                    exit_code = 1 if args.require else exit_code
+                print(f"{variable}={shlex.quote(value or '')}")
+        elif args.command == 'exists':
+            resolver.prefetch(args.stacks)
+            missing = [name for name in args.stacks if not resolver.exists(name)]
+            for name in missing:
+                print(f"Stack {resolver.stack_name(name)} does not exist")
+            exit_code = 1 if missing else 0
+        elif args.command == 'invalidate':
+            for name in args.stacks:
+                resolver.invalidate(name)
+        else:
+            print_stats(resolver)
+    except RuntimeError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        if args.command == 'get':
+            for variable, _, _ in lookups:
+                print(f"{variable}=''")
+        sys.exit(1)
+
+    resolver.save()
+    sys.exit(exit_code)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Stack Watcher - Follows the events of one or more CloudFormation stacks from a single asyncio loop
+Polls describe-stack-events with adaptive backoff, prints each resource's progress as it happens and
+fails on the first resource failure that fails the stack operation instead of waiting for the rollback
+
+Usage: python scripts/stack_watcher.py --region eu-north-1 dev-vpc dev-subnets
+       python scripts/stack_watcher.py --region eu-north-1 dev-vpc -- aws cloudformation deploy ...
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+from deploy_telemetry import Telemetry, telemetry_from_env
+
+# Stack statuses that end an operation
+SUCCESS_STATUSES = {'CREATE_COMPLETE', 'UPDATE_COMPLETE', 'DELETE_COMPLETE', 'IMPORT_COMPLETE'}
+FAILURE_STATUSES = {
+    'CREATE_FAILED', 'DELETE_FAILED', 'ROLLBACK_COMPLETE', 'ROLLBACK_FAILED',
+    'UPDATE_FAILED', 'UPDATE_ROLLBACK_COMPLETE', 'UPDATE_ROLLBACK_FAILED',
+    'IMPORT_ROLLBACK_COMPLETE', 'IMPORT_ROLLBACK_FAILED'
+}
+
+STACK_RESOURCE_TYPE = 'AWS::CloudFormation::Stack'
+
+# Stack statuses that mark a change set starting to execute
+EXECUTION_STATUSES = {'CREATE_IN_PROGRESS', 'UPDATE_IN_PROGRESS', 'DELETE_IN_PROGRESS', 'IMPORT_IN_PROGRESS'}
+
+# Resource failures that fail the stack's operation, by the stack status they happen in. In any other
+# status (UPDATE_COMPLETE_CLEANUP_IN_PROGRESS, rollbacks) CloudFormation decides, e.g. a DELETE_FAILED
+# during update cleanup leaves the stack UPDATE_COMPLETE, so the watch waits for the stack status
+FATAL_RESOURCE_FAILURES = {
+    'CREATE_IN_PROGRESS': {'CREATE_FAILED'},
+    'UPDATE_IN_PROGRESS': {'CREATE_FAILED', 'UPDATE_FAILED'},
+    'DELETE_IN_PROGRESS': {'DELETE_FAILED'},
+    'IMPORT_IN_PROGRESS': {'IMPORT_FAILED'}
+}
+
+class StackGone(Exception):
+    """Raised by an event source when the stack does not exist (or no longer exists)"""
+
+def parse_timestamp(value: str) -> datetime:
+    """Event timestamp as an aware datetime ('2024-05-01T10:00:00.123000+00:00' or '...Z')"""
+    timestamp = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=timezone.utc)
+
+def is_stack_event(event: Dict[str, Any], stack_name: str) -> bool:
+    return event.get('ResourceType') == STACK_RESOURCE_TYPE and event.get('LogicalResourceId') == stack_name
+
+class EventSource:
+    """Interface for the CloudFormation describe-stack-events call"""
+
+    calls = 0
+
+    async def stack_events(self, stack_name: str) -> List[Dict[str, Any]]:
+        """The stack's most recent events, newest first, as the API returns them"""
+        raise NotImplementedError
+
+class AwsCliEventSource(EventSource):
+    """Runs `aws cloudformation describe-stack-events` as asyncio subprocesses"""
+
+    def __init__(self, region: str, max_concurrent: int = 8):
+        self.region = region
+        self.calls = 0
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def stack_events(self, stack_name: str) -> List[Dict[str, Any]]:
+        # The first page holds the newest events, which is all a poll needs
+        command = [
+            'aws', 'cloudformation', 'describe-stack-events',
+            '--stack-name', stack_name,
+            '--region', self.region,
+            '--no-paginate',
+            '--output', 'json'
+        ]
+        async with self._semaphore:
+            self.calls += 1
+            process = await asyncio.create_subprocess_exec(*command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+            stdout, stderr = await process.communicate()
+
+        if process.returncode != 0:
+            message = stderr.decode().strip()
+            if 'does not exist' in message:
+                raise StackGone(stack_name)
+            raise RuntimeError(f"aws cloudformation describe-stack-events failed for {stack_name}: {message}")
+        return json.loads(stdout)['StackEvents']
+
+class SimulatedEventSource(EventSource):
+    """Replays scripted event timelines against the event loop clock
+
+    timelines maps a stack name to (offset seconds, logical id, resource type, status, reason)
+    tuples; an event becomes visible offset * time_scale seconds after start(). Once the
+    stack's own DELETE_COMPLETE is visible the stack no longer exists.
+    """
+
+    def __init__(self, timelines: Dict[str, List[Tuple[float, str, str, str, str]]], latency: float = 0.0, time_scale: float = 1.0):
+        self.timelines = {name: sorted(events, key=lambda event: event[0]) for name, events in timelines.items()}
+        self.latency = latency
+        self.time_scale = time_scale
+        self.calls = 0
+        self.started: Optional[float] = None
+        self.started_at = datetime.now(timezone.utc)
+
+    def start(self) -> None:
+        self.started = asyncio.get_running_loop().time()
+        self.started_at = datetime.now(timezone.utc)
+
+    def elapsed(self) -> float:
+        """Simulated seconds since start()"""
+        return (asyncio.get_running_loop().time() - self.started) / self.time_scale
+
+    def timestamp(self, offset: float) -> str:
+        return (self.started_at + timedelta(seconds=offset)).isoformat()
+
+    async def stack_events(self, stack_name: str) -> List[Dict[str, Any]]:
+        if self.started is None:
+            self.start()
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        elapsed = self.elapsed()
+        visible = [event for event in self.timelines.get(stack_name, []) if event[0] <= elapsed]
+        if not visible or (visible[-1][1] == stack_name and visible[-1][3] == 'DELETE_COMPLETE'):
+            raise StackGone(stack_name)
+
+        return [
+            {
+                'EventId': f"{stack_name}-{index}",
+                'StackName': stack_name,
+                'LogicalResourceId': logical_id,
+                'ResourceType': resource_type,
+                'ResourceStatus': status,
+                'ResourceStatusReason': reason,
+                'Timestamp': self.timestamp(offset)
+            }
+            for index, (offset, logical_id, resource_type, status, reason) in reversed(list(enumerate(visible)))
+        ]
+
+def print_event(stack_name: str, event: Dict[str, Any]) -> None:
+    """Default progress line for one event"""
+    reason = event.get('ResourceStatusReason')
+    timestamp = parse_timestamp(event['Timestamp']).strftime('%H:%M:%S')
+    print(f"  {timestamp} {stack_name} {event['LogicalResourceId']} ({event['ResourceType']}) "
+          f"{event['ResourceStatus']}{': ' + reason if reason else ''}", flush=True)
+
+class StackWatcher:
+    def __init__(self, source: EventSource, min_interval: float = 2.0, max_interval: float = 15.0, backoff: float = 1.5,
+                 timeout: float = 3600.0, fail_fast: bool = True, on_event: Optional[Callable[[str, Dict[str, Any]], None]] = print_event):
+        self.source = source
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.timeout = timeout
+        self.fail_fast = fail_fast
+        self.on_event = on_event
+
+    def _result(self, stack_name: str, status: str, started: float, polls: int, resources: Dict[str, Dict[str, Any]],
+                reason: str = '') -> Dict[str, Any]:
+        if status in SUCCESS_STATUSES:
+            outcome = 'succeeded'
+        elif status == 'NO_CHANGES':
+            outcome = 'unchanged'
+        elif status in FAILURE_STATUSES or status.endswith('_FAILED') or status == 'NOT_FOUND':
+            outcome = 'failed'
+        else:
+            outcome = status
+        return {
+            'stack_name': stack_name,
+            'outcome': outcome,
+            'status': status,
+            'reason': reason,
+            'seconds': asyncio.get_running_loop().time() - started,
+            'polls': polls,
+            'resources': resources
+        }
+
+    def _record(self, resources: Dict[str, Dict[str, Any]], event: Dict[str, Any]) -> None:
+        """Track each resource's first and latest event to report how long it took"""
+        timestamp = parse_timestamp(event['Timestamp'])
+        resource = resources.setdefault(event['LogicalResourceId'], {
+            'type': event['ResourceType'],
+            'first_event': timestamp.isoformat()
+        })
+        resource['status'] = event['ResourceStatus']
+        resource['seconds'] = (timestamp - parse_timestamp(resource['first_event'])).total_seconds()
+        if event['ResourceType'] == STACK_RESOURCE_TYPE and event['ResourceStatus'] in EXECUTION_STATUSES:
+            resource.setdefault('execution_start', timestamp.isoformat())
+
+    async def watch(self, stack_name: str, since: Optional[datetime] = None, stop: Optional[asyncio.Event] = None) -> Dict[str, Any]:
+        """Follow one stack until its operation ends, a resource fails or stop is set
+
+        Without since, the stack's current state is taken from its latest events and an
+        operation that already ended returns at once, like the CLI waiters; a stack that does
+        not exist then fails as NOT_FOUND. With since (after delete-stack) a missing stack is
+        DELETE_COMPLETE. With stop, the stack may not exist yet (a change set is still being created).
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        seen = set()
+        resources: Dict[str, Dict[str, Any]] = {}
+        interval = self.min_interval
+        polls = 0
+        status = 'UNKNOWN'
+        final_poll = False
+
+        while True:
+            final_poll = final_poll or bool(stop and stop.is_set())
+            polls += 1
+            try:
+                events = await self.source.stack_events(stack_name)
+            except StackGone:
+                if since is None and stop is None and polls == 1:
+                    # Nothing was deleted while we watched: the stack was never there
+                    return self._result(stack_name, 'NOT_FOUND', started, polls, resources, 'stack does not exist')
+                if stop is None or final_poll:
+                    return self._result(stack_name, 'DELETE_COMPLETE', started, polls, resources, 'stack does not exist')
+                events = []
+
+            if since is None and polls == 1:
+                # Baseline: earlier events only tell us the current status
+                seen.update(event['EventId'] for event in events)
+                latest = next((event for event in events if is_stack_event(event, stack_name)), None)
+                if latest:
+                    status = latest['ResourceStatus']
+                    if status in SUCCESS_STATUSES or status in FAILURE_STATUSES:
+                        return self._result(stack_name, status, started, polls, resources, latest.get('ResourceStatusReason') or '')
+                new_events = []
+            else:
+                new_events = [
+                    event for event in reversed(events)
+                    if event['EventId'] not in seen and (since is None or parse_timestamp(event['Timestamp']) >= since)
+                ]
+
+            for event in new_events:
+                seen.add(event['EventId'])
+                self._record(resources, event)
+                if self.on_event:
+                    self.on_event(stack_name, event)
+
+                event_status = event['ResourceStatus']
+                if is_stack_event(event, stack_name):
+                    status = event_status
+                    if status in SUCCESS_STATUSES or status in FAILURE_STATUSES:
+                        return self._result(stack_name, status, started, polls, resources, event.get('ResourceStatusReason') or '')
+                elif self.fail_fast and event_status in FATAL_RESOURCE_FAILURES.get(status, ()):
+                    reason = f"{event['LogicalResourceId']}: {event.get('ResourceStatusReason') or event_status}"
+                    return self._result(stack_name, event_status, started, polls, resources, reason)
+
+            if final_poll:
+                if not resources:
+                    return self._result(stack_name, 'NO_CHANGES', started, polls, resources, 'no stack events while the command ran')
+                return self._result(stack_name, status, started, polls, resources)
+            if loop.time() - started > self.timeout:
+                return self._result(stack_name, 'TIMED_OUT', started, polls, resources, f"no result after {self.timeout:.0f}s")
+
+            # Poll quickly while events are flowing and back off while the stack is quiet
+            interval = self.min_interval if new_events else min(self.max_interval, interval * self.backoff)
+            if stop:
+                try:
+                    await asyncio.wait_for(stop.wait(), interval)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(interval)
+
+    async def watch_all(self, stack_names: List[str], since: Optional[datetime] = None,
+                        stop: Optional[asyncio.Event] = None) -> Dict[str, Dict[str, Any]]:
+        """Watch several stacks at once; with fail_fast the first failure cancels the others"""
+        tasks = {asyncio.ensure_future(self.watch(name, since, stop)): name for name in stack_names}
+        results: Dict[str, Dict[str, Any]] = {}
+
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                results[tasks[task]] = task.result()
+            if self.fail_fast and any(result['outcome'] == 'failed' for result in results.values()):
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                for task in pending:
+                    results[tasks[task]] = {'stack_name': tasks[task], 'outcome': 'cancelled', 'status': 'UNKNOWN', 'reason': 'another stack failed'}
+                break
+
+        return {name: results[name] for name in stack_names}
+
+    async def run_command(self, command: List[str], stack_names: List[str]) -> Tuple[int, Dict[str, Dict[str, Any]]]:
+        """Run a deploy command while streaming its stacks' events
+
+        Returns the command's exit code, or 1 as soon as a stack fails; the command is then
+        terminated rather than left waiting for the rollback.
+        """
+        since = datetime.now(timezone.utc)
+        stop = asyncio.Event()
+        process = await asyncio.create_subprocess_exec(*command)
+        watching = asyncio.ensure_future(self.watch_all(stack_names, since, stop))
+        exited = asyncio.ensure_future(process.wait())
+
+        await asyncio.wait({watching, exited}, return_when=asyncio.FIRST_COMPLETED)
+        if watching.done() and watching.exception():
+            # The command decides the outcome when its events cannot be read
+            print(f"WARNING: Stopped watching stack events: {watching.exception()}")
+            return await exited, {}
+        if not exited.done():
+            results = watching.result()
+            if any(result['outcome'] == 'failed' for result in results.values()):
+                process.terminate()
+                await exited
+                return 1, results
+            await exited
+
+        # One last poll so the final events are printed
+        stop.set()
+        try:
+            results = await watching
+        except (RuntimeError, OSError) as e:
+            print(f"WARNING: Stopped watching stack events: {e}")
+            return exited.result(), {}
+        failed = any(result['outcome'] == 'failed' for result in results.values())
+        return (1 if failed else exited.result()), results
+
+def record_spans(telemetry: Telemetry, results: Dict[str, Dict[str, Any]], command_start: Optional[float] = None,
+                 command_end: Optional[float] = None) -> None:
+    """Telemetry spans for the watched operation: the deploy command, change set creation and each resource"""
+    for name, result in results.items():
+        resources = result.get('resources', {})
+        stack = resources.get(name, {})
+        if command_start is not None:
+            telemetry.record('stack.deploy', command_start, command_end, name, status=result['outcome'])
+            if stack.get('execution_start'):
+                telemetry.record('changeset.create', command_start, parse_timestamp(stack['execution_start']).timestamp(), name)
+
+        for logical_id, resource in resources.items():
+            start = parse_timestamp(resource['first_event']).timestamp()
+            if logical_id == name:
+                start = parse_timestamp(resource.get('execution_start', resource['first_event'])).timestamp()
+                telemetry.record('stack.provision', start, parse_timestamp(resource['first_event']).timestamp() + resource['seconds'],
+                                 name, status=resource['status'])
+            else:
+                telemetry.record('resource.provision', start, start + resource['seconds'], name, logical_id,
+                                 type=resource['type'], status=resource['status'])
+
+def print_summary(results: Dict[str, Dict[str, Any]], slowest: int = 5) -> None:
+    """Outcome per stack and its slowest resources"""
+    for name, result in results.items():
+        icon = {'succeeded': '✅', 'failed': '❌', 'unchanged': '⏭️', 'cancelled': '⏭️'}.get(result['outcome'], '⚠️')
+        reason = f" - {result['reason']}" if result.get('reason') else ''
+        print(f"{icon} {name}: {result['status']}{reason}")
+        resources = [
+            (logical_id, resource) for logical_id, resource in result.get('resources', {}).items()
+            if resource['type'] != STACK_RESOURCE_TYPE
+        ]
+        for logical_id, resource in sorted(resources, key=lambda item: -item[1]['seconds'])[:slowest]:
+            print(f"    {resource['seconds']:>7.1f}s {logical_id} ({resource['type']})")
+
+def main():
+    argv = sys.argv[1:]
+    command: List[str] = []
+    if '--' in argv:
+        command = argv[argv.index('--') + 1:]
+        argv = argv[:argv.index('--')]
+
+    parser = argparse.ArgumentParser(
+        description='Follow CloudFormation stack events until the stacks finish, failing on the first failed resource',
+        usage='%(prog)s [options] STACK [STACK ...] [-- deploy command ...]'
+    )
+    parser.add_argument('stacks', nargs='+', help='Stack names to watch')
+    parser.add_argument('--region', default=os.environ.get('AWS_REGION', 'ap-south-1'), help='AWS region')
+    parser.add_argument('--since', help='Only consider events from this ISO 8601 time on (e.g. just before delete-stack)')
+    parser.add_argument('--min-interval', type=float, default=2.0, help='Seconds between polls while events arrive')
+    parser.add_argument('--max-interval', type=float, default=15.0, help='Longest interval while a stack is quiet')
+    parser.add_argument('--timeout', type=float, default=3600.0, help='Give up after this many seconds')
+    parser.add_argument('--no-fail-fast', action='store_true', help='Wait for the stack status instead of failing on the first failed resource')
+    parser.add_argument('--report-file', help='Write the results, including per-resource durations, as JSON')
+
+    args = parser.parse_args(argv)
+    since = parse_timestamp(args.since) if args.since else None
+
+    async def run() -> Tuple[int, Dict[str, Dict[str, Any]]]:
+        watcher = StackWatcher(AwsCliEventSource(args.region), args.min_interval, args.max_interval,
+                               timeout=args.timeout, fail_fast=not args.no_fail_fast)
+        if command:
+            return await watcher.run_command(command, args.stacks)
+        results = await watcher.watch_all(args.stacks, since)
+        return (0 if all(result['outcome'] == 'succeeded' for result in results.values()) else 1), results
+
+    start = time.perf_counter()
+    command_start = time.time()
+    try:
+        exit_code, results = asyncio.run(run())
+    except (RuntimeError, OSError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    telemetry = telemetry_from_env()
+    if telemetry.enabled:
+        record_spans(telemetry, results, command_start if command else None, time.time())
+
+    print_summary(results)
+    print(f"Watched {len(results)} stacks in {time.perf_counter() - start:.1f}s")
+
+    if args.report_file:
+        with open(args.report_file, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    sys.exit(exit_code)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Telemetry Report - Summarizes deploy telemetry spans across runs
+Shows p50/p95 per phase and per stack, the critical path through the deployment-order.json DAG
+and which stacks to parallelize or pre-provision to shorten it
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List, Any, Optional, Tuple
+
+from deploy_telemetry import load_spans
+from stack_orchestrator import DEFAULT_ORDER_FILE, load_deployment_order, topological_sort
+
+# A critical-path stack taking at least this share of the path is a pre-provisioning candidate
+PREPROVISION_SHARE = 0.25
+
+def percentile(values: List[float], pct: float) -> float:
+    """Linearly interpolated percentile of a non-empty list"""
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+def latest_runs(spans: List[Dict[str, Any]], max_runs: int) -> List[Dict[str, Any]]:
+    """Spans of the most recent max_runs runs, by each run's first span"""
+    run_start: Dict[str, float] = {}
+    for span in spans:
+        run_start[span['run_id']] = min(run_start.get(span['run_id'], span['start']), span['start'])
+    keep = set(sorted(run_start, key=run_start.get)[-max_runs:])
+    return [span for span in spans if span['run_id'] in keep]
+
+def distribution(values: List[float]) -> Dict[str, float]:
+    return {
+        'count': len(values),
+        'p50': percentile(values, 50),
+        'p95': percentile(values, 95),
+        'max': max(values)
+    }
+
+def phase_stats(spans: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Span durations per phase"""
+    durations: Dict[str, List[float]] = {}
+    for span in spans:
+        durations.setdefault(span['phase'], []).append(span['duration'])
+    return {phase: distribution(values) for phase, values in sorted(durations.items())}
+
+def stack_stats(spans: List[Dict[str, Any]], phase: str = 'stack.deploy') -> Dict[str, Dict[str, float]]:
+    """Durations per stack for one phase, with the latest run's value"""
+    durations: Dict[str, List[Tuple[float, float]]] = {}
+    for span in spans:
+        if span['phase'] == phase and span.get('stack'):
+            durations.setdefault(span['stack'], []).append((span['start'], span['duration']))
+
+    stats = {}
+    for stack, values in sorted(durations.items()):
+        stats[stack] = distribution([duration for _, duration in values])
+        stats[stack]['latest'] = max(values)[1]
+    return stats
+
+def slowest_resources(spans: List[Dict[str, Any]], stack: str, limit: int = 3) -> List[Tuple[str, float]]:
+    """A stack's resources by p50 provisioning time"""
+    durations: Dict[str, List[float]] = {}
+    for span in spans:
+        if span['phase'] == 'resource.provision' and span.get('stack') == stack and span.get('resource'):
+            durations.setdefault(span['resource'], []).append(span['duration'])
+    ranked = sorted(((resource, percentile(values, 50)) for resource, values in durations.items()), key=lambda item: -item[1])
+    return ranked[:limit]
+
+def critical_path(stacks: List[Dict[str, Any]], durations: Dict[str, float]) -> Dict[str, Any]:
+    """Longest duration-weighted chain through the DAG, with each stack's slack"""
+    levels = topological_sort(stacks)
+    depends_on = {stack['name']: stack.get('depends_on', []) for stack in stacks}
+    dependents: Dict[str, List[str]] = {name: [] for name in depends_on}
+    for name, deps in depends_on.items():
+        for dep in deps:
+            dependents[dep].append(name)
+
+    earliest_finish: Dict[str, float] = {}
+    previous: Dict[str, Optional[str]] = {}
+    for level in levels:
+        for name in level:
+            longest = max(depends_on[name], key=lambda dep: earliest_finish[dep], default=None)
+            previous[name] = longest
+            earliest_finish[name] = durations.get(name, 0.0) + (earliest_finish[longest] if longest else 0.0)
+
+    makespan = max(earliest_finish.values(), default=0.0)
+    latest_finish: Dict[str, float] = {}
+    for level in reversed(levels):
+        for name in level:
+            latest_finish[name] = min((latest_finish[dependent] - durations.get(dependent, 0.0) for dependent in dependents[name]), default=makespan)
+
+    path = []
+    name = max(earliest_finish, key=earliest_finish.get, default=None)
+    while name:
+        path.append(name)
+        name = previous[name]
+
+    return {
+        'path': list(reversed(path)),
+        'seconds': makespan,
+        'serial_seconds': sum(durations.get(name, 0.0) for name in depends_on),
+        'slack': {name: latest_finish[name] - earliest_finish[name] for name in depends_on}
+    }
+
+def unneeded_dependencies(order_file: str, environment: str) -> Dict[str, List[str]]:
+    """Declared depends_on with no Export/ImportValue behind them; {} with a warning when the templates cannot be read"""
+    try:
+        import yaml
+    except ImportError:
+        print("WARNING: PyYAML is not installed, skipping the unneeded depends_on check", file=sys.stderr)
+        return {}
+
+    from cfn_templates import TemplateCache, default_cache_dir
+    from export_graph import ExportGraph, load_order_stacks
+
+    try:
+        order_stacks = load_order_stacks(order_file)
+        graph = ExportGraph(environment, TemplateCache(default_cache_dir()))
+        for stack in order_stacks:
+            graph.add_template(stack['name'], stack['template'], stack.get('parameters'))
+        graph.build()
+    except (OSError, yaml.YAMLError, KeyError) as e:
+        print(f"WARNING: Skipping the unneeded depends_on check, templates could not be read: {e}", file=sys.stderr)
+        return {}
+    return {entry['name']: entry['unneeded'] for entry in graph.diff_order(order_stacks) if entry['unneeded']}
+
+def recommendations(path: Dict[str, Any], order_stacks: List[Dict[str, Any]], environment: str,
+                    spans: List[Dict[str, Any]], unneeded: Dict[str, List[str]]) -> List[str]:
+    """Stacks to pre-provision (they dominate the path) or parallelize (they wait on a stack they do not use)"""
+    advice = []
+    on_path = path['path']
+    depends_on = {stack['name']: stack.get('depends_on', []) for stack in order_stacks}
+    durations = path['durations']
+
+    for name in on_path:
+        share = durations.get(name, 0.0) / path['seconds'] if path['seconds'] else 0.0
+        if share >= PREPROVISION_SHARE:
+            resources = ', '.join(f"{resource} {seconds:.0f}s" for resource, seconds in slowest_resources(spans, f"{environment}-{name}"))
+            advice.append(f"Pre-provision {name}: {share:.0%} of the critical path"
+                          + (f" (slowest resources: {resources})" if resources else ''))
+
+    for position, name in enumerate(on_path[1:], 1):
+        upstream = on_path[position - 1]
+        if upstream in unneeded.get(name, []):
+            advice.append(f"Parallelize {name}: it waits on {upstream} without importing any of its exports; unless the order "
+                          f"itself matters (a NAT gateway needs the IGW attached), dropping that depends_on saves up to {durations.get(upstream, 0.0):.0f}s")
+
+    missing = [name for name in depends_on if name not in durations]
+    if missing:
+        advice.append(f"No timing data for {', '.join(missing)}; unchanged or not deployed in these runs")
+    return advice
+
+def build_report(spans: List[Dict[str, Any]], order_file: Optional[str], environment: str, statistic: str = 'p50') -> Dict[str, Any]:
+    stacks = stack_stats(spans)
+    report = {
+        'runs': len({span['run_id'] for span in spans}),
+        'spans': len(spans),
+        'phases': phase_stats(spans),
+        'stacks': stacks
+    }
+
+    if order_file and os.path.isfile(order_file):
+        order_stacks = load_deployment_order(order_file)
+        durations = {
+            stack['name']: stacks[f"{environment}-{stack['name']}"][statistic]
+            for stack in order_stacks if f"{environment}-{stack['name']}" in stacks
+        }
+        path = critical_path(order_stacks, durations)
+        path['durations'] = durations
+        path['statistic'] = statistic
+        report['critical_path'] = path
+        report['recommendations'] = recommendations(path, order_stacks, environment, spans, unneeded_dependencies(order_file, environment))
+
+    return report
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"## Deployment timings ({report['runs']} runs, {report['spans']} spans)")
+
+    print("\n| Phase | Spans | p50 (s) | p95 (s) | Max (s) |")
+    print("|---|---:|---:|---:|---:|")
+    for phase, stats in report['phases'].items():
+        print(f"| {phase} | {stats['count']} | {stats['p50']:.2f} | {stats['p95']:.2f} | {stats['max']:.2f} |")
+
+    if report['stacks']:
+        print("\n| Stack | Deploys | p50 (s) | p95 (s) | Latest (s) |")
+        print("|---|---:|---:|---:|---:|")
+        for stack, stats in sorted(report['stacks'].items(), key=lambda item: -item[1]['p50']):
+            print(f"| {stack} | {stats['count']} | {stats['p50']:.1f} | {stats['p95']:.1f} | {stats['latest']:.1f} |")
+
+    path = report.get('critical_path')
+    if path:
+        print(f"\n### Critical path ({path['statistic']}): {' -> '.join(path['path']) or 'no data'}")
+        print(f"- Critical path: {path['seconds']:.1f}s, all stacks serially: {path['serial_seconds']:.1f}s")
+        slack = [f"{name} {seconds:.0f}s" for name, seconds in sorted(path['slack'].items()) if name not in path['path']]
+        if slack:
+            print(f"- Slack off the path: {', '.join(slack)}")
+
+        print("\n### Recommendations")
+        for advice in report['recommendations'] or ['Nothing stands out']:
+            print(f"- {advice}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Report deploy telemetry: per-phase percentiles and the critical path')
+    parser.add_argument('paths', nargs='+', help='Span files (.jsonl) or directories of them')
+    parser.add_argument('--order-file', default=DEFAULT_ORDER_FILE, help='Deployment order JSON file for the critical path (empty to skip)')
+    parser.add_argument('--environment', default='dev', help='Environment prefix of the stack names (default: dev)')
+    parser.add_argument('--statistic', choices=['p50', 'p95', 'latest'], default='p50', help='Stack duration used for the critical path')
+    parser.add_argument('--max-runs', type=int, default=30, help='Only use the most recent runs')
+    parser.add_argument('--report-file', help='Write the report as JSON')
+
+    args = parser.parse_args()
+
+    try:
+        spans = latest_runs(load_spans(args.paths), args.max_runs)
+        report = build_report(spans, args.order_file, args.environment, args.statistic)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"ERROR: Failed to build telemetry report: {e}")
+        sys.exit(1)
+
+    if not spans:
+        print("No telemetry spans found")
+        return
+
+    print_report(report)
+
+    if args.report_file:
+        with open(args.report_file, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == '__main__':
+    main()